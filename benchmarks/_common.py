@@ -0,0 +1,50 @@
+"""
+MÓDULO: _common.py
+PROPÓSITO: Utilidades compartidas por los scripts de benchmarks/
+
+FUNCIONES:
+- time_calls: Mediana y p95 de una función
+- current_rss_mb: Memoria residente del proceso actual
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+MODEL_PATH = os.path.join(ROOT, "models", "mnist_cnn_model.keras")
+
+
+def time_calls(fn, runs):
+    """Devuelve la mediana y el p95 (ms) de `runs` llamadas a fn()"""
+    timings = np.empty(runs)
+    for i in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings[i] = time.perf_counter() - start
+    return np.median(timings) * 1000, np.percentile(timings, 95) * 1000
+
+
+def current_rss_mb():
+    """
+    RETORNA: RSS actual del proceso en MB (None si no se puede medir)
+
+    NOTA: En Linux se lee /proc/self/status; en otros sistemas se usa psutil si está instalado
+    """
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        return None
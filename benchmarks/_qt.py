@@ -0,0 +1,58 @@
+"""
+MÓDULO: _qt.py
+PROPÓSITO: Utilidades Qt sin pantalla (plataforma offscreen) para los benchmarks
+
+FUNCIONES:
+- offscreen_app: Crea (o reutiliza) una QApplication con QT_QPA_PLATFORM=offscreen
+- replay_strokes: Reproduce trazos en un DrawingCanvas como eventos de ratón reales
+"""
+
+import os
+
+import _common  # noqa: F401  (añade la raíz del repositorio a sys.path)
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QEvent, QPointF, Qt
+from PyQt6.QtGui import QMouseEvent
+from PyQt6.QtWidgets import QApplication
+
+
+def offscreen_app():
+    """RETORNA: La QApplication del proceso (la crea si no existe)"""
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication(["benchmark"])
+    return app
+
+
+def mouse_event(kind, x, y, button, buttons):
+    """Crea un QMouseEvent en coordenadas del widget"""
+    point = QPointF(float(x), float(y))
+    return QMouseEvent(kind, point, point, button, buttons, Qt.KeyboardModifier.NoModifier)
+
+
+def replay_stroke(canvas, points, on_move=None):
+    """
+    Reproduce un trazo (array (K, 2)) como press -> moves -> release
+
+    PARÁMETROS:
+    - canvas: DrawingCanvas
+    - points: Coordenadas del ratón
+    - on_move: Callback opcional llamado tras cada mouseMoveEvent
+    """
+    left = Qt.MouseButton.LeftButton
+    none = Qt.MouseButton.NoButton
+    x, y = points[0]
+    canvas.mousePressEvent(mouse_event(QEvent.Type.MouseButtonPress, x, y, left, left))
+    for x, y in points[1:]:
+        canvas.mouseMoveEvent(mouse_event(QEvent.Type.MouseMove, x, y, none, left))
+        if on_move is not None:
+            on_move()
+    canvas.mouseReleaseEvent(mouse_event(QEvent.Type.MouseButtonRelease, x, y, left, none))
+
+
+def replay_strokes(canvas, strokes, on_move=None):
+    """Reproduce una lista de trazos en orden"""
+    for points in strokes:
+        replay_stroke(canvas, points, on_move)
@@ -0,0 +1,77 @@
+"""
+BENCHMARK: bench_artifact_cache.py
+PROPÓSITO: Mide cuánto acelera la caché de artefactos la carga del modelo
+
+MIDE (cada caso en un proceso nuevo):
+- Carga sin caché (keras.models.load_model / lectura del .keras)
+- Carga con la caché vacía (lee el .keras y escribe la entrada)
+- Carga con la caché caliente (pesos mapeados con np.memmap)
+
+NOTA: En el backend TensorFlow el import de TensorFlow se hace antes de medir; aquí sólo
+      cuenta la carga del modelo (sin trazado: compiled=False)
+
+USO:
+    python benchmarks/bench_artifact_cache.py [--repeats 3]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from _common import MODEL_PATH
+
+
+def run_child(backend, cache_dir):
+    """Se ejecuta en el proceso hijo: mide una carga del modelo"""
+    if backend == "tensorflow":
+        import tensorflow  # noqa: F401  (fuera de la medición)
+    from src.model.predictor import Predictor
+    start = time.perf_counter()
+    predictor = Predictor(MODEL_PATH, backend=backend, compiled=False,
+                          artifact_cache_dir=cache_dir or None)
+    load_s = time.perf_counter() - start
+    if not predictor.is_loaded:
+        raise SystemExit(f"{backend}: {predictor.error_message}")
+    print("RESULT " + json.dumps({"load_s": load_s}))
+
+
+def measure(backend, cache_dir):
+    completed = subprocess.run(
+        [sys.executable, __file__, "--child", backend, "--cache-dir", cache_dir],
+        capture_output=True, text=True, check=True,
+    )
+    line = next(l for l in completed.stdout.splitlines() if l.startswith("RESULT "))
+    return json.loads(line[len("RESULT "):])["load_s"] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--cache-dir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.cache_dir)
+        return 0
+
+    print(f"{'backend':<12}{'sin caché (ms)':>16}{'caché vacía (ms)':>18}{'caché caliente (ms)':>21}")
+    for backend in ("numpy", "tensorflow"):
+        disabled, cold, warm = [], [], []
+        for _ in range(args.repeats):
+            disabled.append(measure(backend, ""))
+            with tempfile.TemporaryDirectory() as cache_dir:
+                cold.append(measure(backend, cache_dir))
+                warm.append(measure(backend, cache_dir))
+        print(f"{backend:<12}{np.median(disabled):>16.1f}{np.median(cold):>18.1f}"
+              f"{np.median(warm):>21.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
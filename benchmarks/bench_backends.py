@@ -0,0 +1,112 @@
+"""
+BENCHMARK: bench_backends.py
+PROPÓSITO: Compara el backend TensorFlow con el motor NumPy puro
+
+MIDE (cada backend en un proceso nuevo, para que el arranque y la RSS sean reales):
+- Tiempo de arranque (import + carga del modelo)
+- RSS después de cargar el modelo
+- Latencia por imagen (mediana y p95)
+- Coincidencia del top-1 y diferencia máxima de probabilidades frente a Keras
+
+USO:
+    python benchmarks/bench_backends.py [--runs 200] [--tolerance 1e-4]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from _common import MODEL_PATH, current_rss_mb, time_calls
+
+# Número de imágenes usadas para comparar las salidas
+SAMPLES = 256
+
+
+def sample_images():
+    """Imágenes deterministas tipo canvas (fondo blanco, trazos negros)"""
+    rng = np.random.default_rng(0)
+    images = np.full((SAMPLES, 28, 28), 255, dtype=np.uint8)
+    strokes = rng.random((SAMPLES, 28, 28)) < 0.15
+    images[strokes] = 0
+    return images
+
+
+def run_child(backend, runs, output_path):
+    """Se ejecuta en el proceso hijo: mide un único backend"""
+    start = time.perf_counter()
+    from src.model.predictor import Predictor
+    predictor = Predictor(MODEL_PATH, backend=backend)
+    startup_s = time.perf_counter() - start
+    if not predictor.is_loaded:
+        raise SystemExit(f"{backend}: {predictor.error_message}")
+
+    images = sample_images()
+    probabilities = np.stack([predictor.predict(image)[1] for image in images])
+    median_ms, p95_ms = time_calls(lambda: predictor.predict(images[0]), runs)
+
+    np.save(output_path, probabilities)
+    result = {
+        "backend": backend,
+        "startup_s": startup_s,
+        "rss_mb": current_rss_mb(),
+        "median_ms": median_ms,
+        "p95_ms": p95_ms,
+        "tensorflow_imported": "tensorflow" in sys.modules,
+    }
+    print("RESULT " + json.dumps(result))
+
+
+def measure(backend, runs, workdir):
+    """Lanza un proceso hijo para el backend y devuelve (resultado, probabilidades)"""
+    output_path = os.path.join(workdir, f"{backend}.npy")
+    completed = subprocess.run(
+        [sys.executable, __file__, "--child", backend, "--runs", str(runs), "--output", output_path],
+        capture_output=True, text=True, check=True,
+    )
+    line = next(l for l in completed.stdout.splitlines() if l.startswith("RESULT "))
+    return json.loads(line[len("RESULT "):]), np.load(output_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--tolerance", type=float, default=1e-4,
+                        help="Diferencia máxima permitida entre probabilidades")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--output", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.runs, args.output)
+        return 0
+
+    with tempfile.TemporaryDirectory() as workdir:
+        results = [measure(backend, args.runs, workdir) for backend in ("tensorflow", "numpy")]
+
+    print(f"{'backend':<12}{'arranque (s)':>14}{'RSS (MB)':>10}{'mediana (ms)':>14}"
+          f"{'p95 (ms)':>10}{'TF importado':>14}")
+    for result, _ in results:
+        rss = f"{result['rss_mb']:.0f}" if result["rss_mb"] is not None else "n/a"
+        print(f"{result['backend']:<12}{result['startup_s']:>14.2f}{rss:>10}"
+              f"{result['median_ms']:>14.3f}{result['p95_ms']:>10.3f}"
+              f"{str(result['tensorflow_imported']):>14}")
+
+    reference, candidate = results[0][1], results[1][1]
+    max_diff = float(np.abs(reference - candidate).max())
+    agreement = float((reference.argmax(axis=1) == candidate.argmax(axis=1)).mean())
+    print(f"\nTop-1 coincidente: {agreement:.2%}  |  diferencia máx. de probabilidad: {max_diff:.2e}")
+    if agreement < 1.0 or max_diff > args.tolerance:
+        print(f"✗ El motor NumPy se desvía de Keras (tolerancia {args.tolerance:g})")
+        return 1
+    print("✓ El motor NumPy coincide con Keras")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
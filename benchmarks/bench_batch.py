@@ -0,0 +1,68 @@
+"""
+BENCHMARK: bench_batch.py
+PROPÓSITO: Throughput (imágenes/s) de Predictor.predict_batch según el tamaño de lote, en CPU
+
+COMPARA:
+- Bucle de predict() imagen a imagen (referencia)
+- predict_batch con distintos tamaños de lote, para cada backend
+
+USO:
+    python benchmarks/bench_batch.py [--images 2048] [--backends tensorflow numpy]
+"""
+
+import argparse
+import sys
+import time
+
+from _common import MODEL_PATH
+from src.model.predictor import BACKENDS, Predictor
+from src.utils.synthetic_digits import render_digits
+
+BATCH_SIZES = (1, 8, 32, 128, 512)
+
+
+def throughput(fn, count):
+    """RETORNA: Imágenes por segundo de fn() (mejor de 3 repeticiones)"""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return count / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--images", type=int, default=2048)
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    args = parser.parse_args()
+
+    # Dígitos sintéticos repetidos hasta el tamaño pedido (el contenido no afecta al coste)
+    base, _ = render_digits(256, seed=0)
+    images = base[[i % len(base) for i in range(args.images)]]
+
+    for backend in args.backends:
+        predictor = Predictor(MODEL_PATH, backend=backend, cache_size=0)
+        if not predictor.is_loaded:
+            print(f"{backend}: modelo no disponible ({predictor.error_message})")
+            continue
+
+        # Calentar todas las trazas antes de medir
+        for batch_size in BATCH_SIZES:
+            predictor.predict_batch(images[:batch_size * 2], batch_size=batch_size)
+
+        loop_count = min(args.images, 256)
+        loop = throughput(lambda: [predictor.predict(image) for image in images[:loop_count]],
+                          loop_count)
+        print(f"\n[{backend}]")
+        print(f"{'modo':<24}{'imágenes/s':>12}")
+        print(f"{'predict() en bucle':<24}{loop:>12.0f}")
+        for batch_size in BATCH_SIZES:
+            rate = throughput(lambda: predictor.predict_batch(images, batch_size=batch_size),
+                              len(images))
+            print(f"{f'predict_batch({batch_size})':<24}{rate:>12.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
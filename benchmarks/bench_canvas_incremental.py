@@ -0,0 +1,110 @@
+"""
+BENCHMARK: bench_canvas_incremental.py
+PROPÓSITO: Verifica y mide la reducción incremental por celdas sucias del canvas
+
+PRUEBA ALEATORIA:
+- Trazos aleatorios (incluidos saltos largos y puntos fuera del canvas), capturando
+  tras cada movimiento; el buffer incremental debe ser idéntico bit a bit a la
+  reducción completa de la imagen; si no lo es, se informa del primer trazo distinto
+  y el script termina con código 1 (comparación explícita, no un assert que -O quitaría)
+
+MEDICIÓN:
+- Coste por captura (tras un movimiento) de la reducción incremental frente a la completa
+
+USO:
+    python benchmarks/bench_canvas_incremental.py [--strokes 200] [--seed 0]
+    python benchmarks/bench_canvas_incremental.py --check-only   # sólo la prueba aleatoria
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from _qt import offscreen_app, replay_stroke, replay_strokes
+from src.ui.canvas import DrawingCanvas
+from src.utils.synthetic_digits import random_strokes
+
+
+def random_stroke(rng, size):
+    """Trazo aleatorio: pasos cortos y algún salto largo, a veces fuera del canvas"""
+    count = rng.integers(2, 40)
+    steps = rng.normal(0, 12, size=(count, 2))
+    jumps = rng.random(count) < 0.1
+    steps[jumps] = rng.uniform(-size / 2, size / 2, size=(jumps.sum(), 2))
+    start = rng.uniform(-20, size + 20, size=2)
+    return np.cumsum(np.vstack([start, steps]), axis=0)
+
+
+def check_random_strokes(canvas, strokes, seed):
+    """
+    RETORNA: (capturas comprobadas, índice del primer trazo con diferencias o None)
+    """
+    rng = np.random.default_rng(seed)
+    size = canvas.canvas_size * canvas.scale_factor
+    checks = 0
+    mismatches = []
+    for i in range(strokes):
+        if i % 25 == 0:
+            canvas.reset()
+
+        def compare():
+            nonlocal checks
+            incremental = canvas.get_image_array()
+            full = canvas.compute_full_image_array()
+            if not np.array_equal(incremental, full):
+                mismatches.append(i)
+            checks += 1
+
+        # Capturar a veces tras cada movimiento y a veces sólo al final del trazo
+        replay_stroke(canvas, random_stroke(rng, size), compare if rng.random() < 0.5 else None)
+        compare()
+        if mismatches:
+            return checks, mismatches[0]
+    return checks, None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--strokes", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--check-only", action="store_true", help="Sólo la prueba aleatoria")
+    args = parser.parse_args()
+
+    app = offscreen_app()  # Debe seguir viva durante el benchmark
+    canvas = DrawingCanvas()
+
+    checks, mismatch = check_random_strokes(canvas, args.strokes, args.seed)
+    if mismatch is not None:
+        print(f"✗ El buffer incremental difiere de la reducción completa en el trazo {mismatch} "
+              f"(semilla {args.seed}, {checks} capturas)")
+        return 1
+    print(f"✓ Buffer incremental idéntico a la reducción completa ({checks} capturas)")
+    if args.check_only:
+        return 0
+
+    # Coste por captura tras cada movimiento de un dígito sintético
+    timings = {"incremental": [], "completa": []}
+
+    def measure():
+        start = time.perf_counter()
+        canvas.compute_full_image_array()
+        timings["completa"].append(time.perf_counter() - start)
+        start = time.perf_counter()
+        canvas.get_image_array()
+        timings["incremental"].append(time.perf_counter() - start)
+
+    for _, strokes in random_strokes(20, seed=args.seed):
+        canvas.reset()
+        replay_strokes(canvas, strokes, measure)
+
+    print(f"{'reducción':<14}{'mediana (µs)':>14}{'p95 (µs)':>12}")
+    for name, values in timings.items():
+        values = np.asarray(values) * 1e6
+        print(f"{name:<14}{np.median(values):>14.1f}{np.percentile(values, 95):>12.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""
+BENCHMARK: bench_canvas_render.py
+PROPÓSITO: Mide el coste de renderizado por evento de ratón del DrawingCanvas (sin pantalla)
+
+COMPARA:
+- Anterior: nuevo QPainter por evento + scene.clear() + addPixmap() de la imagen completa
+- Retenido: un único item persistente, QPainter de larga duración y repintado sólo del
+  rectángulo sucio del segmento
+
+Cada evento incluye el repintado real de la vista (processEvents con la plataforma
+offscreen de Qt).
+
+USO:
+    python benchmarks/bench_canvas_render.py [--digits 10]
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from _qt import offscreen_app, replay_strokes
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QPainter, QPixmap
+from src.ui.canvas import DrawingCanvas
+from src.utils.synthetic_digits import random_strokes
+
+
+class LegacyCanvas(DrawingCanvas):
+    """DrawingCanvas con el renderizado anterior (escena reconstruida en cada evento)"""
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton:
+            self.drawing = True
+            self.last_point = event.pos()
+
+    def mouseMoveEvent(self, event):
+        if event.buttons() & Qt.MouseButton.LeftButton and self.drawing:
+            painter = QPainter(self.image)
+            painter.setPen(self.pen)
+            painter.drawLine(self.last_point, event.pos())
+            painter.end()
+            self.last_point = event.pos()
+            self.generation += 1
+            self.scene.clear()
+            self.scene.addPixmap(QPixmap.fromImage(self.image))
+            self.canvas_updated.emit()
+
+    def reset(self):
+        self.image.fill(Qt.GlobalColor.white)
+        self.scene.clear()
+        self.scene.addPixmap(QPixmap.fromImage(self.image))
+
+
+def run(app, canvas_class, recording):
+    """RETORNA: Array con los segundos por evento (incluido el repintado)"""
+    canvas = canvas_class()
+    canvas.show()
+    app.processEvents()
+    timings = []
+    last = [time.perf_counter()]
+
+    def on_move():
+        app.processEvents()
+        now = time.perf_counter()
+        timings.append(now - last[0])
+        last[0] = now
+
+    for strokes in recording:
+        canvas.reset()
+        app.processEvents()
+        for points in strokes:
+            last[0] = time.perf_counter()
+            replay_strokes(canvas, [points], on_move)
+    canvas.close()
+    return np.asarray(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--digits", type=int, default=10)
+    args = parser.parse_args()
+
+    app = offscreen_app()
+    recording = [strokes for _, strokes in random_strokes(args.digits, seed=3)]
+
+    print(f"{'renderizado':<12}{'eventos':>9}{'eventos/s':>12}{'mediana (µs)':>14}{'p95 (µs)':>12}")
+    for name, canvas_class in (("anterior", LegacyCanvas), ("retenido", DrawingCanvas)):
+        timings = run(app, canvas_class, recording)
+        micro = timings * 1e6
+        print(f"{name:<12}{timings.size:>9}{timings.size / timings.sum():>12.0f}"
+              f"{np.median(micro):>14.1f}{np.percentile(micro, 95):>12.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
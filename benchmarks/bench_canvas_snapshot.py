@@ -0,0 +1,75 @@
+"""
+BENCHMARK: bench_canvas_snapshot.py
+PROPÓSITO: Mide el coste por captura de DrawingCanvas.get_image_array
+
+COMPARA:
+- Implementación anterior: copia del buffer ARGB + doble bucle Python 28x28 con np.mean
+- Implementación actual: vista sin copia del QImage Grayscale8 + reshape/suma entera
+  (reducción completa; la incremental se mide en bench_canvas_incremental.py)
+
+Además comprueba que ambas producen exactamente el mismo array.
+
+USO:
+    python benchmarks/bench_canvas_snapshot.py [--runs 500]
+"""
+
+import argparse
+import sys
+
+import numpy as np
+
+from _common import time_calls
+from _qt import offscreen_app, replay_strokes
+from src.ui.canvas import DrawingCanvas
+from src.utils.synthetic_digits import random_strokes
+
+
+def legacy_image_array(canvas):
+    """Versión anterior de get_image_array (pixmap ARGB + bucle por bloques)"""
+    from PyQt6.QtGui import QPixmap
+    image = QPixmap.fromImage(canvas.image).toImage()
+    width = image.width()
+    height = image.height()
+    ptr = image.bits()
+    ptr.setsize(image.sizeInBytes())
+    arr = np.array(ptr).reshape(height, width, 4)
+    gray = arr[:, :, 0]
+    scaled = np.zeros((canvas.canvas_size, canvas.canvas_size), dtype=np.uint8)
+    f = canvas.scale_factor
+    for i in range(canvas.canvas_size):
+        for j in range(canvas.canvas_size):
+            block = gray[i * f:(i + 1) * f, j * f:(j + 1) * f]
+            scaled[i, j] = int(np.mean(block))
+    return scaled
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=500)
+    parser.add_argument("--digits", type=int, default=20)
+    args = parser.parse_args()
+
+    app = offscreen_app()  # Debe seguir viva durante el benchmark
+    canvas = DrawingCanvas()
+
+    # Exactitud: comparar ambas versiones tras cada dígito sintético
+    for _, strokes in random_strokes(args.digits, seed=1):
+        canvas.reset()
+        replay_strokes(canvas, strokes)
+        if not np.array_equal(canvas.get_image_array(), legacy_image_array(canvas)):
+            print("✗ get_image_array no coincide con la implementación anterior")
+            return 1
+    print(f"✓ Resultados idénticos en {args.digits} dígitos")
+
+    legacy_med, legacy_p95 = time_calls(lambda: legacy_image_array(canvas), max(args.runs // 10, 20))
+    fast_med, fast_p95 = time_calls(canvas.compute_full_image_array, args.runs)
+
+    print(f"{'implementación':<22}{'mediana (ms)':>14}{'p95 (ms)':>12}")
+    print(f"{'anterior (bucle)':<22}{legacy_med:>14.3f}{legacy_p95:>12.3f}")
+    print(f"{'vectorizada':<22}{fast_med:>14.3f}{fast_p95:>12.3f}")
+    print(f"Aceleración por captura: x{legacy_med / fast_med:.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""
+BENCHMARK: bench_cascade.py
+PROPÓSITO: Cascada (primera etapa lineal + CNN) frente a la CNN sola en datos no vistos
+
+MIDE sobre dígitos sintéticos NO usados en la destilación:
+- Fracción de entradas que responde la primera etapa (aciertos de la cascada)
+- Precisión de la CNN sola y de la cascada, y su diferencia
+- Latencia de Predictor.predict por imagen (p50 / p95 / p99): CNN sola, cascada y,
+  dentro de la cascada, las entradas resueltas por la primera etapa y las que siguen
+  a la CNN
+- Barrido del umbral de margen: aciertos, desacuerdo con la CNN y diferencia de precisión
+
+USO:
+    python benchmarks/bench_cascade.py [--samples 1000] [--backend numpy] [--threshold 0.4]
+
+NOTA: Si no existe models/mnist_cnn_model.cascade.npz se genera con src.cli.distill
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+from _common import MODEL_PATH
+from src.model.cascade import THRESHOLD_GRID, cascade_model_path, cascade_predictions
+from src.model.predictor import BACKENDS, BACKEND_NUMPY, Predictor
+from src.utils.synthetic_digits import render_digits
+
+# Semilla distinta de la de destilación (src.cli.distill.DISTILL_SEED)
+EVALUATION_SEED = 7
+SWEEP = THRESHOLD_GRID[::10]
+
+
+def timed_predictions(predictor, images):
+    """RETORNA: (dígitos predichos (N,), milisegundos por imagen (N,))"""
+    digits = np.empty(len(images), dtype=np.int64)
+    timings = np.empty(len(images))
+    for i, image in enumerate(images):
+        start = time.perf_counter()
+        digits[i], _ = predictor.predict(image)
+        timings[i] = (time.perf_counter() - start) * 1000
+    return digits, timings
+
+
+def percentiles(timings):
+    if len(timings) == 0:
+        return "n/a"
+    p50, p95, p99 = np.percentile(timings, (50, 95, 99))
+    return f"{p50:.3f} / {p95:.3f} / {p99:.3f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--samples", type=int, default=1000)
+    parser.add_argument("--backend", choices=BACKENDS, default=BACKEND_NUMPY)
+    parser.add_argument("--threshold", type=float, help="Umbral de margen (por defecto, el ajustado)")
+    args = parser.parse_args()
+
+    if not os.path.exists(cascade_model_path(MODEL_PATH)):
+        from src.cli.distill import main as distill
+        if distill(["--model", MODEL_PATH]) != 0:
+            return 1
+
+    cnn = Predictor(MODEL_PATH, backend=args.backend, cache_size=0)
+    cascade = Predictor(MODEL_PATH, backend=args.backend, cache_size=0, cascade=True,
+                        cascade_threshold=args.threshold)
+    if not cnn.is_loaded or cascade.cascade is None:
+        print(f"Modelo no disponible: {cnn.error_message or 'falta la primera etapa'}")
+        return 1
+    stage = cascade.cascade
+
+    images, labels = render_digits(args.samples, seed=EVALUATION_SEED)
+    batch = cnn.prepare_batch(images)
+    cnn_probabilities = cnn.run_model(batch)
+    stage_probabilities = stage(batch)
+    _, hits = cascade_predictions(stage_probabilities, cnn_probabilities, stage.threshold)
+
+    timed_predictions(cnn, images[:50])  # calentamiento
+    timed_predictions(cascade, images[:50])
+    cnn_digits, cnn_ms = timed_predictions(cnn, images)
+    cascade_digits, cascade_ms = timed_predictions(cascade, images)
+    cnn_accuracy = (cnn_digits == labels).mean()
+    cascade_accuracy = (cascade_digits == labels).mean()
+
+    print()
+    print(f"Backend: {args.backend}  |  {args.samples} dígitos no vistos  |  "
+          f"umbral de margen {stage.threshold:.2f}")
+    print(f"Responde la primera etapa: {hits.mean():.1%}")
+    print(f"Precisión CNN sola: {cnn_accuracy:.2%}  |  cascada: {cascade_accuracy:.2%}  "
+          f"(diferencia {cascade_accuracy - cnn_accuracy:+.2%})")
+    print(f"Contradice a la CNN: {(cascade_digits != cnn_digits).mean():.2%}")
+    print()
+    print(f"{'latencia predict (ms)':<28}{'p50 / p95 / p99':>24}{'media':>9}")
+    rows = (
+        ("CNN sola", cnn_ms),
+        ("cascada", cascade_ms),
+        ("  resueltas en 1ª etapa", cascade_ms[hits]),
+        ("  derivadas a la CNN", cascade_ms[~hits]),
+    )
+    for name, timings in rows:
+        mean = f"{timings.mean():.3f}" if len(timings) else "n/a"
+        print(f"{name:<28}{percentiles(timings):>24}{mean:>9}")
+
+    print()
+    print(f"{'umbral':>7}{'1ª etapa':>10}{'desacuerdo':>12}{'Δ precisión':>13}")
+    expected = cnn_probabilities.argmax(axis=1)
+    for threshold in SWEEP:
+        predicted, swept_hits = cascade_predictions(stage_probabilities, cnn_probabilities, threshold)
+        print(f"{threshold:>7.2f}{swept_hits.mean():>10.1%}{(predicted != expected).mean():>12.2%}"
+              f"{(predicted == labels).mean() - (expected == labels).mean():>+13.2%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+"""
+BENCHMARK: bench_confidence_bars.py
+PROPÓSITO: Coste de actualizar las barras de confianza a 60 actualizaciones por segundo
+
+COMPARA:
+- Anterior: 10 QProgressBar + 20 QLabel con hoja de estilo; setValue/setText en los 20
+  widgets en cada actualización
+- Ligero: un único widget que pinta las 10 filas y sólo invalida las filas cuyo
+  porcentaje entero cambió (con y sin animación)
+
+Las confianzas siguen un paseo aleatorio de logits (parecido a una predicción en vivo:
+un dígito domina y los demás apenas se mueven). Un QTimer de 16 ms entrega una
+actualización por fotograma durante --seconds segundos (plataforma offscreen).
+
+MIDE:
+- update_confidences: tiempo de la llamada (mediana y p95)
+- repintado: processEvents justo después de la actualización (pinta lo invalidado)
+- Filas que cambian por actualización y CPU del proceso durante la prueba (incluye
+  los fotogramas de la animación)
+
+USO:
+    python benchmarks/bench_confidence_bars.py [--seconds 5]
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from _qt import offscreen_app
+from PyQt6.QtCore import QEventLoop, QTimer
+from PyQt6.QtWidgets import QHBoxLayout, QLabel, QProgressBar, QVBoxLayout, QWidget
+from src.ui.confidence_bar import ConfidenceBar
+
+UPDATE_MS = 16
+
+
+class LegacyConfidenceBar(QWidget):
+    """ConfidenceBar anterior (un QProgressBar y dos QLabel por fila)"""
+
+    def __init__(self):
+        super().__init__()
+        main_layout = QVBoxLayout()
+        main_layout.setSpacing(10)
+        self.confidence_bars = []
+        self.confidence_labels = []
+        for digit in range(10):
+            row_layout = QHBoxLayout()
+            digit_label = QLabel(f"{digit}:")
+            digit_label.setFixedWidth(30)
+            progress_bar = QProgressBar()
+            progress_bar.setMaximum(100)
+            progress_bar.setStyleSheet("""
+                QProgressBar { border: 1px solid #cfcfcf; border-radius: 4px; text-align: center; }
+                QProgressBar::chunk { background-color: #4CAF50; }
+            """)
+            percent_label = QLabel("0%")
+            percent_label.setFixedWidth(40)
+            row_layout.addWidget(digit_label)
+            row_layout.addWidget(progress_bar)
+            row_layout.addWidget(percent_label)
+            self.confidence_bars.append(progress_bar)
+            self.confidence_labels.append(percent_label)
+            main_layout.addLayout(row_layout)
+        self.setLayout(main_layout)
+
+    def update_confidences(self, confidences):
+        for digit in range(10):
+            percentage = int(confidences[digit] * 100)
+            self.confidence_bars[digit].setValue(percentage)
+            self.confidence_labels[digit].setText(f"{percentage}%")
+
+
+def live_confidences(count, seed=0):
+    """RETORNA: Array (count, 10) de softmax de un paseo aleatorio de logits"""
+    rng = np.random.default_rng(seed)
+    logits = rng.normal(0, 1, 10)
+    frames = np.empty((count, 10))
+    for i in range(count):
+        if i % 90 == 0:
+            # Cada ~1.5 s el usuario empieza otro dígito: cambia el dominante
+            logits = rng.normal(0, 1, 10)
+            logits[rng.integers(10)] += 5
+        logits += rng.normal(0, 0.08, 10)
+        exp = np.exp(logits - logits.max())
+        frames[i] = exp / exp.sum()
+    return frames
+
+
+def run(app, widget, frames):
+    widget.show()
+    app.processEvents()
+    calls, renders, changed = [], [], []
+    state = {"frame": 0, "last": None}
+    loop = QEventLoop()
+
+    def tick():
+        i = state["frame"]
+        if i >= len(frames):
+            timer.stop()
+            # Dejar terminar la última animación
+            QTimer.singleShot(200, loop.quit)
+            return
+        percentages = (frames[i] * 100).astype(int)
+        if state["last"] is not None:
+            changed.append(int(np.count_nonzero(percentages != state["last"])))
+        state["last"] = percentages
+        start = time.perf_counter()
+        widget.update_confidences(frames[i])
+        updated = time.perf_counter()
+        app.processEvents()  # Repintado provocado por esta actualización
+        renders.append(time.perf_counter() - updated)
+        calls.append(updated - start)
+        state["frame"] += 1
+
+    timer = QTimer()
+    timer.setInterval(UPDATE_MS)
+    timer.timeout.connect(tick)
+    cpu = time.process_time()
+    wall = time.perf_counter()
+    timer.start()
+    loop.exec()
+    wall = time.perf_counter() - wall
+    cpu = time.process_time() - cpu
+    widget.close()
+
+    calls = np.asarray(calls) * 1e6
+    renders = np.asarray(renders) * 1e6
+    return {
+        "update_median_us": float(np.median(calls)),
+        "update_p95_us": float(np.percentile(calls, 95)),
+        "render_median_us": float(np.median(renders)),
+        "render_p95_us": float(np.percentile(renders, 95)),
+        "rows_changed": float(np.mean(changed)),
+        "cpu_pct": 100 * cpu / wall,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    app = offscreen_app()  # Debe seguir viva durante el benchmark
+    frames = live_confidences(int(args.seconds * 1000 / UPDATE_MS))
+
+    print(f"{'widget':<16}{'update p50':>12}{'update p95':>12}{'repintado p50':>15}"
+          f"{'repintado p95':>15}{'filas/act.':>12}{'CPU':>7}")
+    variants = (
+        ("anterior", LegacyConfidenceBar),
+        ("ligero", lambda: ConfidenceBar(animated=False)),
+        ("ligero animado", ConfidenceBar),
+    )
+    for name, factory in variants:
+        r = run(app, factory(), frames)
+        print(f"{name:<16}{r['update_median_us']:>10.1f}µs{r['update_p95_us']:>10.1f}µs"
+              f"{r['render_median_us']:>13.1f}µs{r['render_p95_us']:>13.1f}µs"
+              f"{r['rows_changed']:>12.2f}{r['cpu_pct']:>6.1f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
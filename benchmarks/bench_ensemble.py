@@ -0,0 +1,158 @@
+"""
+BENCHMARK: bench_ensemble.py
+PROPÓSITO: Conjunto de modelos en paralelo (EnsemblePredictor) con presupuestos de latencia
+
+Por defecto los miembros son el modelo del repositorio en tres configuraciones
+(numpy/basic, numpy/mnist, int8); con --models se usan variantes reentrenadas.
+
+MIDE:
+- Precisión de cada miembro solo y del conjunto en dígitos sintéticos no vistos
+- Latencia de predict (p50 / p95 / p99): miembros en secuencia, conjunto con hilos y
+  conjunto con un proceso por miembro (--processes)
+- Rezagado: un miembro con retrasos aleatorios de hasta 3x el presupuesto; el conjunto
+  debe seguir respondiendo dentro del presupuesto con los demás
+- Memoria: RSS con 1 miembro y con todos (los pesos mapeados del mismo archivo no se
+  duplican)
+- Estadísticas por miembro del conjunto (a tiempo, tarde, saltadas, acuerdo)
+
+USO:
+    python benchmarks/bench_ensemble.py [--samples 500] [--budget-ms 10] [--processes]
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from _common import MODEL_PATH, current_rss_mb
+from src.model.ensemble import EnsemblePredictor
+from src.model.predictor import BACKEND_INT8, BACKEND_NUMPY, PREPROCESSING_MNIST
+from src.utils.synthetic_digits import render_digits
+
+EVALUATION_SEED = 7
+DEFAULT_MEMBERS = [{}, {"preprocessing": PREPROCESSING_MNIST}, {"backend": BACKEND_INT8}]
+
+
+class DelayedMember:
+    """Miembro lento simulado: retrasa aleatoriamente las respuestas del miembro real"""
+
+    def __init__(self, member, max_delay_ms, seed=0):
+        self.member = member
+        self.max_delay_ms = max_delay_ms
+        self.rng = np.random.default_rng(seed)
+
+    def predict(self, image_array):
+        time.sleep(self.rng.uniform(0, self.max_delay_ms) / 1000)
+        return self.member.predict(image_array)
+
+
+def timed(predict, images):
+    """RETORNA: (dígitos predichos (N,), milisegundos por imagen (N,))"""
+    digits = np.empty(len(images), dtype=np.int64)
+    timings = np.empty(len(images))
+    for i, image in enumerate(images):
+        start = time.perf_counter()
+        digits[i] = predict(image)
+        timings[i] = (time.perf_counter() - start) * 1000
+    return digits, timings
+
+
+def sequential(ensemble):
+    """RETORNA: predict() que ejecuta los miembros uno detrás de otro y los combina"""
+    def predict(image):
+        results = [(i, member.predict(image)[1]) for i, member in enumerate(ensemble.members)]
+        return ensemble._combine(results).argmax()
+    return predict
+
+
+def percentiles(timings):
+    p50, p95, p99 = np.percentile(timings, (50, 95, 99))
+    return f"{p50:.3f} / {p95:.3f} / {p99:.3f}"
+
+
+def print_stats(ensemble):
+    print(f"{'miembro':<34}{'a tiempo':>9}{'tarde':>7}{'saltadas':>9}{'acuerdo':>9}{'p50 (ms)':>10}")
+    for name, s in ensemble.stats().items():
+        agreement = f"{s['agreement']:.1%}" if s["agreement"] is not None else "n/a"
+        p50 = f"{s['p50_ms']:.3f}" if s["p50_ms"] is not None else "n/a"
+        print(f"{name:<34}{s['on_time']:>9}{s['late']:>7}{s['skipped']:>9}{agreement:>9}{p50:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--samples", type=int, default=500)
+    parser.add_argument("--models", nargs="+", help="Archivos .keras de los miembros")
+    parser.add_argument("--budget-ms", type=float, default=10.0)
+    parser.add_argument("--processes", action="store_true", help="Medir también un proceso por miembro")
+    args = parser.parse_args()
+
+    if args.models:
+        paths, member_kwargs = args.models, None
+    else:
+        paths, member_kwargs = [MODEL_PATH] * len(DEFAULT_MEMBERS), DEFAULT_MEMBERS
+    images, labels = render_digits(args.samples, seed=EVALUATION_SEED)
+
+    rss_start = current_rss_mb()
+    single = EnsemblePredictor(paths[:1], budgets_ms=args.budget_ms, backend=BACKEND_NUMPY,
+                               member_kwargs=member_kwargs and member_kwargs[:1])
+    rss_single = current_rss_mb()
+    ensemble = EnsemblePredictor(paths, budgets_ms=args.budget_ms, backend=BACKEND_NUMPY,
+                                 member_kwargs=member_kwargs)
+    rss_all = current_rss_mb()
+    if not ensemble.is_loaded:
+        print(f"Modelos no disponibles: {ensemble.error_message}")
+        return 1
+    single.close()
+
+    accuracy = []
+    for member_stats, member in zip(ensemble.member_stats, ensemble.members):
+        digits = np.array([member.predict(image)[0] for image in images])
+        accuracy.append((member_stats.name, (digits == labels).mean()))
+
+    runs = [("miembros en secuencia", sequential(ensemble)),
+            ("conjunto (hilos)", lambda image: ensemble.predict(image)[0])]
+    processes = None
+    if args.processes:
+        processes = EnsemblePredictor(paths, budgets_ms=args.budget_ms, backend=BACKEND_NUMPY,
+                                      member_kwargs=member_kwargs, processes=True)
+        runs.append(("conjunto (procesos)", lambda image: processes.predict(image)[0]))
+
+    rows = []
+    for name, predict in runs:
+        timed(predict, images[:50])  # calentamiento
+        digits, timings = timed(predict, images)
+        rows.append((name, (digits == labels).mean(), timings))
+    ensemble_accuracy = rows[1][1]
+
+    # Rezagado: el último miembro se retrasa hasta 3x el presupuesto
+    straggling = EnsemblePredictor(paths, budgets_ms=args.budget_ms, backend=BACKEND_NUMPY,
+                                   member_kwargs=member_kwargs)
+    straggling.members[-1] = DelayedMember(straggling.members[-1], 3 * args.budget_ms)
+    digits, timings = timed(lambda image: straggling.predict(image)[0], images)
+    rows.append((f"con rezagado (≤{3 * args.budget_ms:.0f} ms)", (digits == labels).mean(), timings))
+
+    print()
+    print(f"{len(paths)} miembros  |  {args.samples} dígitos no vistos  |  presupuesto {args.budget_ms:.0f} ms")
+    for name, value in accuracy:
+        print(f"Precisión {name:<34}{value:>8.2%}")
+    print(f"Precisión {'conjunto':<34}{ensemble_accuracy:>8.2%}")
+    if rss_start is not None:
+        print(f"RSS: +{rss_single - rss_start:.1f} MB con 1 miembro, +{rss_all - rss_single:.1f} MB "
+              f"con {len(paths)} miembros más")
+    print()
+    print(f"{'predict':<30}{'p50 / p95 / p99 (ms)':>24}{'precisión':>11}")
+    for name, value, timings in rows:
+        print(f"{name:<30}{percentiles(timings):>24}{value:>11.2%}")
+    print()
+    print("Conjunto con rezagado:")
+    print_stats(straggling)
+
+    for predictor in (ensemble, straggling, processes):
+        if predictor is not None:
+            predictor.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+BENCHMARK: bench_incremental.py
+PROPÓSITO: Inferencia incremental (IncrementalCNN) frente al forward completo en vivo
+
+Reproduce trazos sintéticos como lo vería el modo en vivo: cada --tick-events eventos
+de ratón se rasteriza el dibujo hasta ese punto (28x28) y se predice. Para cada
+captura se ejecutan el forward completo del motor NumPy y el incremental.
+
+MIDE por preprocesado y separación entre capturas:
+- Fracción del trabajo de las Conv2D ahorrada (multiplicaciones-acumulaciones)
+- Capturas que necesitaron forward completo
+- Latencia por captura (mediana y p95) de ambos caminos
+- Diferencia máxima absoluta entre ambas salidas (debe ser ~0)
+
+USO:
+    python benchmarks/bench_incremental.py [--digits 20] [--tick-events 3,9]
+
+NOTA: Con el preprocesado "mnist" el dígito se recorta y recentra en cada captura, así
+      que casi toda la imagen cambia y no hay nada que reutilizar
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from _common import MODEL_PATH
+from src.model.predictor import BACKEND_NUMPY, PREPROCESSINGS, Predictor
+from src.utils.synthetic_digits import random_strokes, rasterize
+
+
+def live_frames(recording, tick_events):
+    """RETORNA: Lista de capturas (una lista por dígito) cada `tick_events` eventos"""
+    digits = []
+    for _, strokes in recording:
+        frames = []
+        for index, points in enumerate(strokes):
+            ends = list(range(1 + tick_events, len(points), tick_events)) + [len(points)]
+            for end in ends:
+                frames.append(rasterize(strokes[:index] + [points[:end]]))
+        digits.append(frames)
+    return digits
+
+
+def run(predictor, digits):
+    incremental = predictor.incremental
+    incremental.reset_stats()
+    full_times, incremental_times, errors = [], [], []
+    for frames in digits:
+        incremental.reset()  # RESET entre dígitos
+        for image in frames:
+            batch = predictor.prepare_batch(image)
+            start = time.perf_counter()
+            expected = predictor.model(batch)
+            full_times.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            result = incremental(batch)
+            incremental_times.append(time.perf_counter() - start)
+            errors.append(float(np.abs(result - expected).max()))
+    full_ms = np.asarray(full_times) * 1000
+    incremental_ms = np.asarray(incremental_times) * 1000
+    return {
+        "frames": incremental.frames,
+        "full_passes": incremental.full_passes,
+        "saved": incremental.saved_fraction,
+        "full_median_ms": float(np.median(full_ms)),
+        "full_p95_ms": float(np.percentile(full_ms, 95)),
+        "incremental_median_ms": float(np.median(incremental_ms)),
+        "incremental_p95_ms": float(np.percentile(incremental_ms, 95)),
+        "max_error": max(errors),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--digits", type=int, default=20)
+    parser.add_argument("--tick-events", default="3,9",
+                        help="Eventos de ratón entre capturas (lista separada por comas)")
+    args = parser.parse_args()
+
+    recording = random_strokes(args.digits, seed=3)
+    ticks = [int(t) for t in args.tick_events.split(",")]
+    rows = []
+    for preprocessing in PREPROCESSINGS:
+        predictor = Predictor(MODEL_PATH, backend=BACKEND_NUMPY, cache_size=0,
+                              preprocessing=preprocessing, incremental=True)
+        if not predictor.is_loaded:
+            print(f"Modelo no disponible: {predictor.error_message}")
+            return 1
+        for tick in ticks:
+            rows.append((preprocessing, tick, run(predictor, live_frames(recording, tick))))
+
+    print()
+    print(f"{'preproc.':<9}{'eventos':>8}{'capturas':>10}{'completos':>10}{'conv ahorrado':>15}"
+          f"{'completo p50/p95 (ms)':>23}{'incremental p50/p95 (ms)':>26}{'error máx':>11}")
+    for preprocessing, tick, r in rows:
+        print(f"{preprocessing:<9}{tick:>8}{r['frames']:>10}{r['full_passes']:>10}{r['saved']:>15.1%}"
+              f"{r['full_median_ms']:>15.3f} / {r['full_p95_ms']:.3f}"
+              f"{r['incremental_median_ms']:>18.3f} / {r['incremental_p95_ms']:.3f}"
+              f"{r['max_error']:>11.1e}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+"""
+BENCHMARK: bench_inference.py
+PROPÓSITO: Compara la latencia por llamada de model.predict frente a la ruta compilada
+          (tf.function con formas fijas) del Predictor
+
+USO:
+    python benchmarks/bench_inference.py [--runs 200]
+"""
+
+import argparse
+import sys
+
+import numpy as np
+
+from _common import MODEL_PATH, time_calls
+from src.model.predictor import Predictor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, size=(28, 28), dtype=np.uint8)
+
+    predictor = Predictor(MODEL_PATH, compiled=True)
+    if not predictor.is_loaded:
+        print(f"Modelo no disponible: {predictor.error_message}")
+        return 1
+
+    batch = ((255 - image) / 255.0).reshape(1, 28, 28, 1).astype("float32")
+    legacy = lambda: predictor.model.predict(batch, verbose=0)
+    legacy()  # primera llamada fuera de la medición
+    legacy_med, legacy_p95 = time_calls(legacy, max(args.runs // 10, 10))
+    compiled_med, compiled_p95 = time_calls(lambda: predictor.predict(image), args.runs)
+
+    print()
+    print(f"{'ruta':<22}{'mediana (ms)':>14}{'p95 (ms)':>12}")
+    print(f"{'model.predict':<22}{legacy_med:>14.2f}{legacy_p95:>12.2f}")
+    print(f"{'compilada (frío)':<22}{predictor.cold_latency_ms:>14.2f}{'':>12}")
+    print(f"{'compilada (caliente)':<22}{compiled_med:>14.2f}{compiled_p95:>12.2f}")
+    print(f"Aceleración por llamada: x{legacy_med / compiled_med:.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""
+BENCHMARK: bench_multi_digit.py
+PROPÓSITO: Modo varios dígitos (segmentación + clasificación en un lote) de 1 a 20 dígitos
+
+Escribe números sintéticos en un canvas de tamaño fijo (alto --cell, ancho para 20
+dígitos, como un canvas ancho de la aplicación) y mide Predictor.predict_number.
+
+MIDE por número de dígitos N:
+- Latencia de segmentación y de clasificación en lote (p50)
+- Latencia total (p50) y su crecimiento frente a N=1 (sublineal si crece menos que N)
+- Alternativa ingenua: la misma segmentación + N llamadas al modelo de un dígito cada una
+- Dígitos encontrados == escritos, precisión por dígito y números completos correctos
+
+USO:
+    python benchmarks/bench_multi_digit.py [--counts 1,2,5,10,15,20] [--repeats 10]
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from _common import MODEL_PATH
+from src.model.predictor import BACKENDS, BACKEND_NUMPY, INPUT_SHAPE, Predictor
+from src.utils.segmentation import segment_digits
+from src.utils.synthetic_digits import NUMBER_CELL, render_number
+
+MAX_DIGITS = 20
+
+
+def measure(predictor, canvases):
+    """RETORNA: Dict con los p50 (ms) de cada etapa y las predicciones"""
+    segment_ms, batch_ms, separate_ms, total_ms, numbers, found = [], [], [], [], [], []
+    for canvas in canvases:
+        start = time.perf_counter()
+        number, _ = predictor.predict_number(canvas)
+        total_ms.append((time.perf_counter() - start) * 1000)
+        numbers.append(number)
+
+        start = time.perf_counter()
+        digits, _ = segment_digits(canvas)
+        segmented = time.perf_counter()
+        batch = digits.reshape((-1,) + INPUT_SHAPE)
+        predictor.run_model(batch)
+        classified = time.perf_counter()
+        for image in batch:
+            predictor.run_model(image[None])
+        separate = time.perf_counter()
+        segment_ms.append((segmented - start) * 1000)
+        batch_ms.append((classified - segmented) * 1000)
+        separate_ms.append((separate - classified + segmented - start) * 1000)
+        found.append(len(digits))
+    return {
+        "segment": float(np.median(segment_ms)),
+        "batch": float(np.median(batch_ms)),
+        "total": float(np.median(total_ms)),
+        "separate": float(np.median(separate_ms)),
+        "numbers": numbers,
+        "found": found,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--counts", default="1,2,5,10,15,20", help="Dígitos por número (máx. 20)")
+    parser.add_argument("--repeats", type=int, default=10, help="Números distintos por N")
+    parser.add_argument("--backend", choices=BACKENDS, default=BACKEND_NUMPY)
+    parser.add_argument("--cell", type=int, default=NUMBER_CELL, help="Alto del canvas en píxeles")
+    args = parser.parse_args()
+
+    predictor = Predictor(MODEL_PATH, backend=args.backend, cache_size=0)
+    if not predictor.is_loaded:
+        print(f"Modelo no disponible: {predictor.error_message}")
+        return 1
+
+    width = MAX_DIGITS * args.cell
+    warmup, _ = render_number(3, seed=0, cell=args.cell, columns=width)
+    for _ in range(5):
+        predictor.predict_number(warmup)
+
+    rows = []
+    for count in (int(n) for n in args.counts.split(",")):
+        samples = [render_number(count, seed=1000 * count + i, cell=args.cell, columns=width)
+                   for i in range(args.repeats)]
+        result = measure(predictor, [canvas for canvas, _ in samples])
+        written = ["".join(str(d) for d in digits) for _, digits in samples]
+        segmented = np.mean([found == count for found in result["found"]])
+        matched = [(p, w) for p, w in zip(result["numbers"], written) if len(p) == len(w)]
+        digit_accuracy = (np.mean([a == b for p, w in matched for a, b in zip(p, w)])
+                          if matched else float("nan"))
+        exact = np.mean([p == w for p, w in zip(result["numbers"], written)])
+        rows.append((count, result, segmented, digit_accuracy, exact))
+
+    base = rows[0][1]["total"] / rows[0][0]
+    print()
+    print(f"Backend: {args.backend}  |  canvas {args.cell}x{width}  |  {args.repeats} números por N")
+    print(f"{'N':>3}{'segm. p50':>11}{'lote p50':>10}{'total p50':>11}{'ms/dígito':>11}"
+          f"{'crec. vs N':>12}{'N llamadas':>12}{'segm. ok':>10}{'dígitos':>9}{'números':>9}")
+    for count, r, segmented, digit_accuracy, exact in rows:
+        print(f"{count:>3}{r['segment']:>11.2f}{r['batch']:>10.2f}{r['total']:>11.2f}"
+              f"{r['total'] / count:>11.3f}{r['total'] / base:>7.1f} / {count:<3}"
+              f"{r['separate']:>12.2f}{segmented:>10.0%}{digit_accuracy:>9.1%}{exact:>9.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+"""
+BENCHMARK: bench_pipeline.py
+PROPÓSITO: Latencia de extremo a extremo del camino "dibujar -> barras" con regresiones
+
+Reproduce trazos en el DrawingCanvas de una MainWindow real (plataforma offscreen) y
+recorre el camino de predicción en vivo de la ventana. Cada etapa se cronometra por
+separado:
+- event:            mouseMoveEvent del canvas (incluye canvas_updated -> on_canvas_updated)
+- render:           repintado del canvas tras cada evento (processEvents)
+- get_image_array:  captura 28x28 del canvas
+- preprocessing:    Predictor.prepare_batch
+- inference:        Predictor.run_model
+- confidence_bars:  ConfidenceBar.update_confidences
+- bars_render:      repintado del panel tras actualizar las barras
+- end_to_end:       desde emit_live_prediction hasta las barras actualizadas
+
+La predicción se dispara cada TICK_EVENTS eventos (el planificador de la ventana se
+desactiva para que las ejecuciones sean deterministas) y la inferencia es síncrona,
+para medir cada etapa sin ruido de hilos.
+
+BASELINES:
+- Los resultados se guardan en JSON (benchmarks/baselines/pipeline.json)
+- Sin --save-baseline se comparan las medianas con la baseline: si alguna etapa supera
+  baseline * (1 + threshold) y además baseline + floor, el script falla (código 1)
+- Las baselines dependen de la máquina: regenerarlas en la máquina de referencia con
+  --save-baseline después de un cambio de rendimiento intencionado
+
+USO:
+    python benchmarks/bench_pipeline.py                  # comparar con la baseline
+    python benchmarks/bench_pipeline.py --save-baseline  # guardar una baseline nueva
+    python benchmarks/bench_pipeline.py --strokes trazos.json
+
+FORMATO DE --strokes: JSON [[dígito, [[[x, y], ...], ...]], ...] en píxeles del canvas
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+from _common import MODEL_PATH, ROOT
+from _qt import offscreen_app, replay_strokes
+from src.model.predictor import BACKENDS, BACKEND_NUMPY, Predictor
+from src.ui.main_window import MainWindow
+from src.utils.synthetic_digits import random_strokes
+
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "baselines", "pipeline.json")
+# Eventos de ratón entre predicciones (~150 ms de trazo a 60 eventos/s)
+TICK_EVENTS = 9
+# Regresión: más de un 25 % y más de 20 µs por encima de la baseline
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_FLOOR_US = 20.0
+
+
+class Stopwatch:
+    """Acumula duraciones por etapa"""
+
+    def __init__(self):
+        self.samples = {}
+
+    def add(self, stage, seconds):
+        self.samples.setdefault(stage, []).append(seconds)
+
+    def wrap(self, stage, fn):
+        """RETORNA: fn envuelta para cronometrar cada llamada en `stage`"""
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.add(stage, time.perf_counter() - start)
+        return timed
+
+    def summary(self):
+        """RETORNA: Dict etapa -> {"median_us", "p95_us", "count"}"""
+        return {
+            stage: {
+                "median_us": float(np.median(values) * 1e6),
+                "p95_us": float(np.percentile(values, 95) * 1e6),
+                "count": len(values),
+            }
+            for stage, values in self.samples.items()
+        }
+
+
+def load_strokes(path, digits):
+    """RETORNA: Lista de (dígito, trazos) desde un JSON grabado o sintética"""
+    if path is None:
+        return random_strokes(digits, seed=3)
+    with open(path, encoding="utf-8") as f:
+        recording = json.load(f)
+    return [(digit, [np.asarray(points, dtype=float) for points in strokes])
+            for digit, strokes in recording]
+
+
+def run(app, predictor, recording, watch):
+    """Reproduce la grabación en una MainWindow y cronometra cada etapa"""
+    window = MainWindow()
+    window.scheduler.activity = window.scheduler.flush = lambda: None
+    window.show()
+    window.set_model_ready(True)
+    app.processEvents()
+
+    canvas = window.drawing_canvas
+    bars = window.confidence_display
+    canvas.mouseMoveEvent = watch.wrap("event", canvas.mouseMoveEvent)
+    canvas.get_image_array = watch.wrap("get_image_array", canvas.get_image_array)
+    bars.update_confidences = watch.wrap("confidence_bars", bars.update_confidences)
+    prepare = watch.wrap("preprocessing", predictor.prepare_batch)
+    infer = watch.wrap("inference", predictor.run_model)
+    render = watch.wrap("render", app.processEvents)
+    bars_render = watch.wrap("bars_render", app.processEvents)
+
+    def handle_prediction(image, seq):
+        confidences = infer(prepare(image))[0]
+        window.update_prediction_results(confidences, seq)
+
+    window.predict_signal.connect(handle_prediction)
+    state = {"events": 0}
+
+    def on_move():
+        render()
+        state["events"] += 1
+        if state["events"] % TICK_EVENTS == 0:
+            start = time.perf_counter()
+            window.emit_live_prediction()
+            watch.add("end_to_end", time.perf_counter() - start)
+            bars_render()
+
+    for _, strokes in recording:
+        window.on_reset_clicked()
+        app.processEvents()
+        replay_strokes(canvas, strokes, on_move)
+    window.close()
+
+
+def compare(current, baseline, threshold, floor_us):
+    """RETORNA: Lista de textos con las etapas que empeoraron"""
+    regressions = []
+    for stage, reference in baseline["stages"].items():
+        if stage not in current:
+            continue
+        base, now = reference["median_us"], current[stage]["median_us"]
+        limit = max(base * (1 + threshold), base + floor_us)
+        if now > limit:
+            regressions.append(f"{stage}: {now:.1f} µs > {limit:.1f} µs (baseline {base:.1f} µs)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latencia por etapa del camino dibujar -> barras")
+    parser.add_argument("--backend", choices=BACKENDS, default=BACKEND_NUMPY)
+    parser.add_argument("--digits", type=int, default=20)
+    parser.add_argument("--strokes", help="JSON con trazos grabados (por defecto, sintéticos)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Empeoramiento relativo permitido de la mediana")
+    parser.add_argument("--floor-us", type=float, default=DEFAULT_FLOOR_US,
+                        help="Empeoramiento absoluto mínimo para contar como regresión")
+    parser.add_argument("--json", help="Guardar también los resultados de esta ejecución")
+    args = parser.parse_args()
+
+    app = offscreen_app()  # Debe seguir viva durante el benchmark
+    predictor = Predictor(MODEL_PATH, backend=args.backend, cache_size=0)
+    if not predictor.is_loaded:
+        print(f"Modelo no disponible: {predictor.error_message}")
+        return 1
+
+    recording = load_strokes(args.strokes, args.digits)
+    run(app, predictor, recording[:1], Stopwatch())  # calentamiento
+    watch = Stopwatch()
+    run(app, predictor, recording, watch)
+    stages = watch.summary()
+    result = {
+        "backend": args.backend,
+        "digits": len(recording),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "stages": stages,
+    }
+
+    print()
+    print(f"{'etapa':<18}{'mediana (µs)':>14}{'p95 (µs)':>12}{'n':>7}")
+    for stage, values in stages.items():
+        print(f"{stage:<18}{values['median_us']:>14.1f}{values['p95_us']:>12.1f}{values['count']:>7}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        print(f"\n✓ Baseline guardada en {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\n⚠ No hay baseline en {args.baseline} (créala con --save-baseline)")
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("backend") != args.backend:
+        print(f"\n⚠ La baseline es del backend {baseline.get('backend')!r}; no se compara")
+        return 0
+    regressions = compare(stages, baseline, args.threshold, args.floor_us)
+    if regressions:
+        print("\n✗ REGRESIÓN DE RENDIMIENTO:")
+        for line in regressions:
+            print(f"  ✗ {line}")
+        return 1
+    print(f"\n✓ Sin regresiones frente a la baseline (umbral +{args.threshold:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
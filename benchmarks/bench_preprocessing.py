@@ -0,0 +1,60 @@
+"""
+BENCHMARK: bench_preprocessing.py
+PROPÓSITO: Mide el coste del pipeline de preprocesado estilo MNIST frente a la inferencia
+
+MIDE:
+- Coste por imagen de preprocess_image con una sola imagen y con lotes
+- Coste por imagen de la inferencia (backend NumPy) para comparar
+- Precisión con preprocesado "basic" y "mnist" sobre dígitos sintéticos
+  desplazados/escalados
+
+USO:
+    python benchmarks/bench_preprocessing.py [--samples 500] [--runs 300]
+"""
+
+import argparse
+import sys
+
+from _common import MODEL_PATH, time_calls
+from src.model.predictor import BACKEND_NUMPY, Predictor
+from src.utils.image_processing import preprocess_image
+from src.utils.synthetic_digits import render_digits
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--samples", type=int, default=500)
+    parser.add_argument("--runs", type=int, default=300)
+    args = parser.parse_args()
+
+    images, labels = render_digits(args.samples, seed=11)
+    predictors = {
+        name: Predictor(MODEL_PATH, backend=BACKEND_NUMPY, cache_size=0, preprocessing=name)
+        for name in ("basic", "mnist")
+    }
+    predictor = predictors["mnist"]
+    if not predictor.is_loaded:
+        print(f"Modelo no disponible: {predictor.error_message}")
+        return 1
+
+    single_med, _ = time_calls(lambda: preprocess_image(images[0]), args.runs)
+    batch_med, _ = time_calls(lambda: preprocess_image(images), max(args.runs // 20, 5))
+    prepared = predictor.prepare_batch(images[:1])
+    infer_med, _ = time_calls(lambda: predictor.run_model(prepared), args.runs)
+
+    print()
+    print(f"{'etapa':<32}{'por imagen (µs)':>16}")
+    print(f"{'preprocesado (1 imagen)':<32}{single_med * 1000:>16.1f}")
+    print(f"{f'preprocesado (lote de {len(images)})':<32}{batch_med * 1000 / len(images):>16.1f}")
+    print(f"{'inferencia NumPy (1 imagen)':<32}{infer_med * 1000:>16.1f}")
+    print(f"Preprocesado / inferencia: {single_med / infer_med:.1%}")
+
+    print()
+    for name, model in predictors.items():
+        predicted = model.run_model(model.prepare_batch(images)).argmax(axis=1)
+        print(f"Precisión con preprocesado {name!r}: {(predicted == labels).mean():.2%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""
+BENCHMARK: bench_process_predictor.py
+PROPÓSITO: Compara la latencia de ida y vuelta del Predictor en el mismo proceso frente
+          al ProcessPredictor (proceso hijo + anillo en memoria compartida)
+
+MIDE:
+- Mediana y p95 por predicción en cada ruta (caché desactivada, imágenes distintas)
+- Sobrecoste del cambio de proceso (diferencia de medianas)
+- Tiempo de recuperación tras matar el proceso hijo (reinicio automático)
+
+USO:
+    python benchmarks/bench_process_predictor.py [--backend numpy] [--runs 500]
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from _common import MODEL_PATH, time_calls
+from src.model.predictor import Predictor, BACKENDS, BACKEND_NUMPY
+from src.model.process_predictor import ProcessPredictor
+
+
+def cycling(predictor, images):
+    """Función sin argumentos que predice la siguiente imagen del conjunto en cada llamada"""
+    state = {"i": 0}
+
+    def call():
+        state["i"] = (state["i"] + 1) % len(images)
+        return predictor.predict(images[state["i"]])
+    return call
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--backend", choices=BACKENDS, default=BACKEND_NUMPY)
+    parser.add_argument("--runs", type=int, default=500)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    images = rng.integers(0, 256, size=(64, 28, 28), dtype=np.uint8)
+
+    local = Predictor(MODEL_PATH, backend=args.backend, cache_size=0)
+    remote = ProcessPredictor(MODEL_PATH, backend=args.backend, cache_size=0)
+    if not (local.is_loaded and remote.is_loaded):
+        print(f"Modelo no disponible: {local.error_message or remote.error_message}")
+        remote.close()
+        return 1
+
+    try:
+        # Las dos rutas deben dar el mismo resultado
+        for image in images[:8]:
+            expected, received = local.predict(image)[1], remote.predict(image)[1]
+            if not np.allclose(expected, received, atol=1e-6):
+                print("✗ El proceso hijo devuelve confianzas distintas")
+                return 1
+
+        cycling(local, images)()
+        cycling(remote, images)()
+        local_med, local_p95 = time_calls(cycling(local, images), args.runs)
+        remote_med, remote_p95 = time_calls(cycling(remote, images), args.runs)
+
+        # Reinicio automático: se mata el hijo y se mide hasta la siguiente predicción válida
+        remote._process.kill()
+        remote._process.join()
+        start = time.perf_counter()
+        digit, _ = remote.predict(images[0])
+        recovery_s = time.perf_counter() - start
+        recovered = digit is not None
+    finally:
+        remote.close()
+
+    print()
+    print(f"backend: {args.backend}")
+    print(f"{'ruta':<22}{'mediana (ms)':>14}{'p95 (ms)':>12}")
+    print(f"{'mismo proceso':<22}{local_med:>14.3f}{local_p95:>12.3f}")
+    print(f"{'proceso hijo':<22}{remote_med:>14.3f}{remote_p95:>12.3f}")
+    print(f"Sobrecoste de ida y vuelta: {remote_med - local_med:+.3f} ms")
+    print(f"Recuperación tras matar el hijo: {recovery_s:.2f} s "
+          f"({'✓' if recovered else '✗'}, {remote.restarts} reinicios)")
+    return 0 if recovered else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""
+BENCHMARK: bench_quantization.py
+PROPÓSITO: Compara el modelo int8 cuantizado con el modelo float32
+
+MIDE (cada backend en un proceso nuevo, para que el arranque y la RSS sean reales):
+- Tamaño en disco y bytes de pesos guardados (en ejecución el int8 usa pesos float32)
+- Tiempo de arranque y RSS después de cargar el modelo
+- Latencia por imagen (mediana y p95)
+- Precisión sobre dígitos sintéticos NO usados en la calibración y su diferencia
+  frente a float32
+
+USO:
+    python benchmarks/bench_quantization.py [--runs 300] [--samples 500]
+
+NOTA: Si no existe models/mnist_cnn_model.int8.npz se genera con src.cli.quantize
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from _common import MODEL_PATH, current_rss_mb, time_calls
+from src.model.quantization import quantized_model_path
+
+# Semilla distinta de la de calibración (src.cli.quantize.CALIBRATION_SEED)
+EVALUATION_SEED = 7
+
+
+def run_child(backend, runs, data_path):
+    """Se ejecuta en el proceso hijo: mide un único backend"""
+    start = time.perf_counter()
+    from src.model.predictor import Predictor
+    predictor = Predictor(MODEL_PATH, backend=backend, cache_size=0)
+    startup_s = time.perf_counter() - start
+    if not predictor.is_loaded:
+        raise SystemExit(f"{backend}: {predictor.error_message}")
+
+    data = np.load(data_path)
+    images, labels = data["images"], data["labels"]
+    predicted = predictor.run_model(predictor.prepare_batch(images)).argmax(axis=1)
+    median_ms, p95_ms = time_calls(lambda: predictor.predict(images[0]), runs)
+    result = {
+        "backend": backend,
+        "startup_s": startup_s,
+        "rss_mb": current_rss_mb(),
+        "median_ms": median_ms,
+        "p95_ms": p95_ms,
+        "accuracy": float((predicted == labels).mean()),
+    }
+    print("RESULT " + json.dumps(result))
+
+
+def measure(backend, runs, data_path):
+    completed = subprocess.run(
+        [sys.executable, __file__, "--child", backend, "--runs", str(runs), "--data", data_path],
+        capture_output=True, text=True, check=True,
+    )
+    line = next(l for l in completed.stdout.splitlines() if l.startswith("RESULT "))
+    return json.loads(line[len("RESULT "):])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=300)
+    parser.add_argument("--samples", type=int, default=500)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--data", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.runs, args.data)
+        return 0
+
+    int8_path = quantized_model_path(MODEL_PATH)
+    if not os.path.exists(int8_path):
+        from src.cli.quantize import main as quantize
+        if quantize(["--model", MODEL_PATH]) != 0:
+            return 1
+
+    from src.model.numpy_engine import NumpyCNN
+    from src.model.quantization import QuantizedCNN, float_weight_bytes
+    from src.utils.synthetic_digits import render_digits
+
+    images, labels = render_digits(args.samples, seed=EVALUATION_SEED)
+    with tempfile.TemporaryDirectory() as workdir:
+        data_path = os.path.join(workdir, "digits.npz")
+        np.savez(data_path, images=images, labels=labels)
+        results = [measure(backend, args.runs, data_path) for backend in ("tensorflow", "numpy", "int8")]
+
+    sizes = {
+        "float32": (os.path.getsize(MODEL_PATH), float_weight_bytes(NumpyCNN.from_keras(MODEL_PATH))),
+        "int8": (os.path.getsize(int8_path), QuantizedCNN.load(int8_path).weight_bytes),
+    }
+    print()
+    print(f"{'modelo':<10}{'archivo (KiB)':>15}{'pesos guardados (KiB)':>23}")
+    for name, (file_bytes, weight_bytes) in sizes.items():
+        print(f"{name:<10}{file_bytes / 1024:>15.0f}{weight_bytes / 1024:>23.0f}")
+
+    print()
+    print(f"{'backend':<12}{'arranque (s)':>14}{'RSS (MB)':>10}{'mediana (ms)':>14}"
+          f"{'p95 (ms)':>10}{'precisión':>11}")
+    for result in results:
+        rss = f"{result['rss_mb']:.0f}" if result["rss_mb"] is not None else "n/a"
+        print(f"{result['backend']:<12}{result['startup_s']:>14.2f}{rss:>10}"
+              f"{result['median_ms']:>14.3f}{result['p95_ms']:>10.3f}{result['accuracy']:>11.2%}")
+
+    by_backend = {result["backend"]: result for result in results}
+    delta = by_backend["int8"]["accuracy"] - by_backend["numpy"]["accuracy"]
+    print(f"\nDiferencia de precisión int8 - float32 ({args.samples} dígitos no calibrados): {delta:+.2%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""
+BENCHMARK: bench_scheduler.py
+PROPÓSITO: Compara el QTimer fijo de 150 ms con el PredictionScheduler adaptativo
+
+Reproduce dígitos EN TIEMPO REAL (un evento de ratón cada 16 ms, pausas entre trazos y
+entre dígitos) sobre una MainWindow con el InferenceWorker real, y luego deja la
+ventana inactiva.
+
+MIDE para cada planificador:
+- Predicciones enviadas, descartadas por el worker y mostradas
+- Actualizaciones de las barras por segundo mientras se dibuja
+- Latencia al soltar: desde mouseRelease hasta que se muestra una predicción que ya
+  incluye el trazo completo (mediana y máximo)
+- CPU del proceso (todos los hilos) dibujando y en reposo
+
+USO:
+    python benchmarks/bench_scheduler.py [--digits 6] [--delays 0,80,250]
+
+NOTA: --delays añade un retardo artificial por predicción para simular un backend lento
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from _common import MODEL_PATH
+from _qt import mouse_event, offscreen_app
+from PyQt6.QtCore import QEvent, QEventLoop, Qt, QTimer
+from src.model.predictor import BACKEND_NUMPY, Predictor
+from src.ui.inference_worker import InferenceWorker
+from src.ui.main_window import MainWindow
+from src.utils.synthetic_digits import random_strokes
+
+EVENT_MS = 16
+STROKE_PAUSE_MS = 150
+DIGIT_PAUSE_MS = 600
+IDLE_S = 2.0
+
+
+class LegacyWindow(MainWindow):
+    """MainWindow con el temporizador fijo anterior (150 ms, sin fin de trazo)"""
+
+    def __init__(self):
+        super().__init__()
+        self.drawing_canvas.stroke_finished.disconnect(self.on_stroke_finished)
+        self.prediction_timer = QTimer(self)
+        self.prediction_timer.setInterval(150)
+        self.prediction_timer.timeout.connect(self.legacy_tick)
+
+    def on_canvas_updated(self):
+        if self.resetting or not self.live_mode:
+            return
+        if self.awaiting_first_draw:
+            if np.any(self.drawing_canvas.get_image_array() < 255):
+                self.awaiting_first_draw = False
+                self.prediction_timer.start()
+        elif not self.prediction_timer.isActive():
+            self.prediction_timer.start()
+
+    def legacy_tick(self):
+        if self.drawing_canvas.generation == self.predicted_generation:
+            self.prediction_timer.stop()
+            return
+        self.emit_live_prediction()
+
+    def stop_live_prediction(self):
+        self.prediction_timer.stop()
+
+
+def script(recording):
+    """Genera las acciones (tipo, x, y, espera_ms) de la reproducción"""
+    for _, strokes in recording:
+        yield ("reset", 0, 0, 0)
+        for points in strokes:
+            x, y = points[0]
+            yield (QEvent.Type.MouseButtonPress, x, y, EVENT_MS)
+            for x, y in points[1:]:
+                yield (QEvent.Type.MouseMove, x, y, EVENT_MS)
+            yield (QEvent.Type.MouseButtonRelease, x, y, STROKE_PAUSE_MS)
+        yield ("pause", 0, 0, DIGIT_PAUSE_MS)
+
+
+def wait(ms):
+    """Ejecuta el bucle de eventos durante `ms` milisegundos"""
+    loop = QEventLoop()
+    QTimer.singleShot(int(ms), loop.quit)
+    loop.exec()
+
+
+def run(app, window_class, predictor, recording, delay_ms):
+    window = window_class()
+    window.show()
+    worker = InferenceWorker(predictor, delay_ms=delay_ms)
+    generation_of = {}
+    shown = []  # (instante, generación mostrada)
+
+    def handle_prediction(image, seq):
+        generation_of[seq] = window.drawing_canvas.generation
+        worker.submit(image, seq)
+
+    def handle_result(seq, digit, confidences):
+        if window.update_prediction_results(confidences, seq):
+            shown.append((time.perf_counter(), generation_of[seq]))
+
+    window.predict_signal.connect(handle_prediction)
+    worker.result_ready.connect(handle_result)
+    worker.start()
+    window.set_model_ready(True)
+    app.processEvents()
+
+    canvas = window.drawing_canvas
+    releases = []  # (instante, generación al soltar)
+    left, none = Qt.MouseButton.LeftButton, Qt.MouseButton.NoButton
+    draw_cpu = time.process_time()
+    draw_start = time.perf_counter()
+    for kind, x, y, pause in script(recording):
+        if kind == "reset":
+            window.on_reset_clicked()
+        elif kind == QEvent.Type.MouseButtonPress:
+            canvas.mousePressEvent(mouse_event(kind, x, y, left, left))
+        elif kind == QEvent.Type.MouseMove:
+            canvas.mouseMoveEvent(mouse_event(kind, x, y, none, left))
+        elif kind == QEvent.Type.MouseButtonRelease:
+            canvas.mouseReleaseEvent(mouse_event(kind, x, y, left, none))
+            releases.append((time.perf_counter(), canvas.generation))
+        if pause:
+            wait(pause)
+    draw_s = time.perf_counter() - draw_start
+    draw_cpu = time.process_time() - draw_cpu
+
+    idle_cpu = time.process_time()
+    wait(IDLE_S * 1000)
+    idle_cpu = time.process_time() - idle_cpu
+
+    worker.stop()
+    window.close()
+
+    latencies = []
+    for released_at, generation in releases:
+        # Si el estado final ya se había mostrado antes de soltar, la latencia es 0
+        covering = [t for t, g in shown if g >= generation]
+        if covering:
+            latencies.append(max(covering[0] - released_at, 0.0) * 1000)
+    return {
+        "submitted": worker.submitted,
+        "dropped": worker.dropped,
+        "shown": len(shown),
+        "updates_per_s": len(shown) / draw_s,
+        "release_median_ms": float(np.median(latencies)) if latencies else float("nan"),
+        "release_max_ms": float(np.max(latencies)) if latencies else float("nan"),
+        "releases_covered": f"{len(latencies)}/{len(releases)}",
+        "draw_cpu_pct": 100 * draw_cpu / draw_s,
+        "idle_cpu_pct": 100 * idle_cpu / IDLE_S,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--digits", type=int, default=6)
+    parser.add_argument("--delays", default="0,80,250", help="Retardos artificiales (ms) a probar")
+    args = parser.parse_args()
+
+    app = offscreen_app()  # Debe seguir viva durante el benchmark
+    predictor = Predictor(MODEL_PATH, backend=BACKEND_NUMPY, cache_size=0)
+    if not predictor.is_loaded:
+        print(f"Modelo no disponible: {predictor.error_message}")
+        return 1
+    recording = random_strokes(args.digits, seed=5)
+
+    header = (f"{'retardo':>8} {'planificador':<12}{'enviadas':>9}{'descart.':>9}{'mostradas':>10}"
+              f"{'act./s':>8}{'soltar p50':>11}{'soltar máx':>11}{'cubiertos':>10}"
+              f"{'CPU dib.':>9}{'CPU rep.':>9}")
+    rows = []
+    for delay in (int(d) for d in args.delays.split(",")):
+        for name, window_class in (("fijo 150ms", LegacyWindow), ("adaptativo", MainWindow)):
+            r = run(app, window_class, predictor, recording, delay)
+            rows.append(f"{delay:>6}ms {name:<12}{r['submitted']:>9}{r['dropped']:>9}{r['shown']:>10}"
+                        f"{r['updates_per_s']:>8.1f}{r['release_median_ms']:>9.0f}ms"
+                        f"{r['release_max_ms']:>9.0f}ms{r['releases_covered']:>10}"
+                        f"{r['draw_cpu_pct']:>8.0f}%{r['idle_cpu_pct']:>8.1f}%")
+    print()
+    print(header)
+    print("\n".join(rows))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""
+BENCHMARK: bench_tta.py
+PROPÓSITO: Aumentación en inferencia (TTA) por lotes: coste frente a K y ganancia en
+           precisión y estabilidad
+
+MIDE para cada número de vistas K:
+- Latencia de Predictor.predict por imagen (p50 / p95), incluida la generación de las
+  vistas, y sobrecoste frente a K=1
+- Latencia (p50) de la alternativa ingenua: K llamadas al modelo de una imagen cada una
+- Precisión en dígitos sintéticos no vistos
+- Consistencia ante desplazamientos: fracción de dígitos cuya predicción no cambia al
+  mover el dibujo hasta --jitter píxeles del canvas 28x28
+- Parpadeo en vivo: cambios de top-1 por dígito entre capturas consecutivas mientras se
+  dibuja (como bench_incremental.py), contando sólo la segunda mitad del trazo
+
+USO:
+    python benchmarks/bench_tta.py [--samples 500] [--backend numpy] [--views 1,3,5,9]
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from _common import MODEL_PATH
+from bench_incremental import live_frames
+from src.model.predictor import BACKENDS, BACKEND_NUMPY, Predictor
+from src.utils.synthetic_digits import random_strokes, render_digits
+
+EVALUATION_SEED = 7
+JITTER_COPIES = 4
+
+
+def shifted(images, dy, dx):
+    """RETORNA: Las imágenes del canvas desplazadas (dy, dx) con fondo blanco"""
+    out = np.full_like(images, 255)
+    h, w = images.shape[1:]
+    out[:, max(dy, 0):h + min(dy, 0), max(dx, 0):w + min(dx, 0)] = \
+        images[:, max(-dy, 0):h + min(-dy, 0), max(-dx, 0):w + min(-dx, 0)]
+    return out
+
+
+def time_separate_calls(predictor, images):
+    """RETORNA: p50 (ms) de ejecutar las K vistas de cada imagen con K llamadas al modelo"""
+    timings = np.empty(len(images))
+    for i, image in enumerate(images):
+        views = predictor.tta(predictor.prepare_batch(image)) if predictor.tta else None
+        start = time.perf_counter()
+        if views is None:
+            predictor.run_model(predictor.prepare_batch(image))
+        else:
+            for view in views:
+                predictor.run_model(view[None])
+        timings[i] = (time.perf_counter() - start) * 1000
+    return float(np.median(timings))
+
+
+def predict_digits(predictor, images):
+    """RETORNA: Dígitos predichos (N,) con la misma ruta que predict() (TTA incluida)"""
+    batch = predictor.prepare_batch(images)
+    tta = predictor.tta
+    if tta is None:
+        return predictor.run_model(batch).argmax(axis=1)
+    return tta.average(predictor.run_model(tta(batch))).argmax(axis=1)
+
+
+def live_flicker(predictor, digits):
+    """RETORNA: Cambios medios de top-1 por dígito en la segunda mitad de sus capturas"""
+    changes = []
+    for frames in digits:
+        predicted = predict_digits(predictor, np.stack(frames[len(frames) // 2:]))
+        changes.append(np.count_nonzero(np.diff(predicted)))
+    return float(np.mean(changes))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--samples", type=int, default=500)
+    parser.add_argument("--backend", choices=BACKENDS, default=BACKEND_NUMPY)
+    parser.add_argument("--views", default="1,3,5,9", help="Valores de K (lista separada por comas)")
+    parser.add_argument("--jitter", type=int, default=2, help="Desplazamiento máximo en píxeles")
+    parser.add_argument("--live-digits", type=int, default=40)
+    args = parser.parse_args()
+
+    images, labels = render_digits(args.samples, seed=EVALUATION_SEED)
+    rng = np.random.default_rng(EVALUATION_SEED)
+    offsets = rng.integers(-args.jitter, args.jitter + 1, size=(JITTER_COPIES, 2))
+    jittered = [shifted(images, int(dy), int(dx)) for dy, dx in offsets]
+    digits = live_frames(random_strokes(args.live_digits, seed=3), 3)
+
+    rows = []
+    for views in (int(k) for k in args.views.split(",")):
+        predictor = Predictor(MODEL_PATH, backend=args.backend, cache_size=0, tta=views)
+        if not predictor.is_loaded:
+            print(f"Modelo no disponible: {predictor.error_message}")
+            return 1
+
+        for image in images[:50]:  # calentamiento
+            predictor.predict(image)
+        timings = np.empty(len(images))
+        for i, image in enumerate(images):
+            start = time.perf_counter()
+            predictor.predict(image)
+            timings[i] = (time.perf_counter() - start) * 1000
+
+        separate_p50 = time_separate_calls(predictor, images[:200])
+        predicted = predict_digits(predictor, images)
+        stable = np.ones(len(images), dtype=bool)
+        for copy in jittered:
+            stable &= predict_digits(predictor, copy) == predicted
+        rows.append((views, np.percentile(timings, 50), np.percentile(timings, 95), separate_p50,
+                     (predicted == labels).mean(), stable.mean(), live_flicker(predictor, digits)))
+
+    base_p50 = rows[0][1]
+    print()
+    print(f"Backend: {args.backend}  |  {args.samples} dígitos no vistos  |  "
+          f"desplazamientos de hasta {args.jitter} px ({JITTER_COPIES} copias)")
+    print(f"{'K':>3}{'p50 / p95 (ms)':>18}{'sobrecoste':>12}{'K llamadas p50':>16}{'precisión':>11}"
+          f"{'estable':>10}{'cambios/dígito':>16}")
+    for views, p50, p95, separate_p50, accuracy, stable, flicker in rows:
+        print(f"{views:>3}{p50:>10.3f} / {p95:.3f}{p50 / base_p50:>11.2f}x{separate_p50:>16.3f}"
+              f"{accuracy:>11.2%}{stable:>10.1%}{flicker:>16.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
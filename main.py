@@ -26,15 +26,93 @@ MINST-Project/
 ═══════════════════════════════════════════════════════════════════════════════
 """
 
+import time
+
+# Referencia del arranque: se toma antes de cualquier import pesado
+_PROCESS_START = time.perf_counter()
+
 import sys
 import os
-import tensorflow as tf
+import argparse
 from PyQt6.QtWidgets import QApplication
 
 # Importar interfaz gráfica
 from src.ui.main_window import MainWindow
+from src.ui.model_loader import ModelLoader
+from src.ui.inference_worker import InferenceWorker
+from src.utils.startup_report import StartupReport
+from src.utils.metrics import METRICS, PrometheusFileExporter, StatsServer
 # Importar el predictor
-from src.model.predictor import Predictor
+# (TensorFlow NO se importa aquí: el Predictor lo importa en el hilo de carga)
+from src.model.predictor import (
+    Predictor, BACKENDS, BACKEND_TENSORFLOW, PREPROCESSINGS, PREPROCESSING_BASIC
+)
+from src.model.process_predictor import ProcessPredictor
+from src.model.tta import MAX_VIEWS as TTA_MAX_VIEWS
+from src.model.ensemble import DEFAULT_BUDGET_MS, EnsemblePredictor
+
+# Hitos del arranque (time-to-window, time-to-first-prediction)
+startup = StartupReport(_PROCESS_START)
+
+
+def parse_args(argv):
+    """
+    Lee las opciones de línea de comandos
+    
+    OPCIONES:
+    - --backend: Motor de inferencia ("tensorflow", "numpy" sin TensorFlow, o "int8")
+    - --inference-delay-ms: Retardo artificial por predicción (pruebas de fluidez)
+    - --preprocessing: "basic" o "mnist" (recorte, escala y centrado del dígito)
+    - --inference-process: Ejecuta el modelo en un proceso hijo (memoria compartida)
+    - --incremental: Sólo recalcula las activaciones afectadas por los píxeles que
+      cambiaron desde la captura anterior (backend numpy)
+    - --cascade: Un clasificador lineal destilado responde las entradas claras y la CNN
+      sólo las dudosas (--cascade-threshold cambia el margen mínimo)
+    - --tta: Promedia K variantes desplazadas/giradas/escaladas del dibujo (un solo lote)
+    - --multi-digit: Canvas ancho para números de varios dígitos (segmentación + un lote)
+    - --ensemble: Varios modelos en paralelo combinados con pesos (--ensemble-weights) y
+      un presupuesto de latencia por miembro (--ensemble-budget-ms)
+    - --metrics-file: Archivo de texto de Prometheus que se reescribe periódicamente
+    - --stats-port: Puerto local con /metrics y /stats (HTTP en 127.0.0.1)
+    """
+    parser = argparse.ArgumentParser(description="MNIST Digit Classifier")
+    parser.add_argument("--backend", choices=BACKENDS, default=BACKEND_TENSORFLOW,
+                        help="Motor de inferencia del modelo")
+    parser.add_argument("--inference-delay-ms", type=int, default=0,
+                        help="Retardo artificial por predicción, en ms")
+    parser.add_argument("--preprocessing", choices=PREPROCESSINGS, default=PREPROCESSING_BASIC,
+                        help="Preprocesado de la imagen antes del modelo")
+    parser.add_argument("--inference-process", action="store_true",
+                        help="Ejecuta el modelo en un proceso separado")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Inferencia incremental entre capturas (backend numpy)")
+    parser.add_argument("--cascade", action="store_true",
+                        help="Primera etapa lineal y CNN sólo para las entradas dudosas")
+    parser.add_argument("--cascade-threshold", type=float,
+                        help="Margen top-1 - top-2 mínimo para responder sin la CNN")
+    parser.add_argument("--tta", type=int, default=1, choices=range(1, TTA_MAX_VIEWS + 1),
+                        metavar="K", help="Vistas de la aumentación en inferencia (1 = desactivada)")
+    parser.add_argument("--multi-digit", action="store_true",
+                        help="Canvas ancho para escribir números de varios dígitos")
+    parser.add_argument("--ensemble", nargs="+", metavar="MODEL",
+                        help="Archivos .keras del conjunto de modelos (en lugar del modelo por defecto)")
+    parser.add_argument("--ensemble-weights", nargs="+", type=float, metavar="W",
+                        help="Peso de cada modelo del conjunto (por defecto iguales)")
+    parser.add_argument("--ensemble-budget-ms", nargs="+", type=float, default=[DEFAULT_BUDGET_MS],
+                        metavar="MS", help="Presupuesto de latencia, común o uno por modelo")
+    parser.add_argument("--metrics-file", help="Archivo Prometheus (colector textfile) con las métricas")
+    parser.add_argument("--metrics-interval", type=float, default=10.0,
+                        help="Segundos entre escrituras de --metrics-file")
+    parser.add_argument("--stats-port", type=int, help="Puerto local para /metrics y /stats")
+    # parse_known_args: deja pasar las opciones propias de Qt
+    args, _ = parser.parse_known_args(argv[1:])
+    if args.ensemble:
+        count = len(args.ensemble)
+        if args.ensemble_weights and len(args.ensemble_weights) != count:
+            parser.error(f"--ensemble-weights necesita {count} valores")
+        if len(args.ensemble_budget_ms) not in (1, count):
+            parser.error(f"--ensemble-budget-ms necesita 1 o {count} valores")
+    return args
 
 
 def main():
@@ -43,13 +121,14 @@ def main():
     
     PASOS:
     1. Crear aplicación PyQt6
-    2. Cargar el modelo
-    3. Crear la interfaz gráfica
-    4. Conectar modelo con interfaz
-    5. Mostrar ventana
-    6. Ejecutar loop de eventos
+    2. Crear y mostrar la interfaz gráfica (estado "cargando modelo")
+    3. Cargar el modelo en un hilo de trabajo (TensorFlow se importa ahí)
+    4. Arrancar el hilo de inferencia cuando el modelo esté listo
+    5. Ejecutar loop de eventos
     """
     
+    args = parse_args(sys.argv)
+    
     print("═" * 70)
     print("MNIST DIGIT CLASSIFIER - Aplicación iniciada")
     print("═" * 70)
@@ -57,36 +136,104 @@ def main():
     # PASO 1: Crear aplicación PyQt6
     app = QApplication(sys.argv)
     
-    # PASO 2: Cargar el modelo
+    # Exportación de métricas (opcional)
+    exporters = []
+    if args.metrics_file:
+        exporters.append(PrometheusFileExporter(args.metrics_file, interval_s=args.metrics_interval))
+    if args.stats_port is not None:
+        exporters.append(StatsServer(args.stats_port))
+    for exporter in exporters:
+        exporter.start()
+    
+    # PASO 2: Crear y mostrar la interfaz gráfica antes de cargar el modelo
+    print("[MAIN] Creando interfaz gráfica...")
+    window = MainWindow(multi_digit=args.multi_digit)
+    window.show()
+    startup.mark("window_shown")
+    print("[MAIN] ✓ Interfaz gráfica mostrada")
+    
+    # PASO 3: Cargar el modelo en segundo plano
     model_path = os.path.join("models", "mnist_cnn_model.keras")
-    print("[MAIN] Cargando modelo...")
-    predictor = Predictor(model_path)
+    print("[MAIN] Cargando modelo en segundo plano...")
+    state = {"worker": None}
     
-    if not predictor.is_loaded:
-        print("[MAIN] ⚠ Advertencia: La aplicación se ejecutará sin modelo")
+    def handle_prediction(image_array, seq):
+        """Envía la captura al hilo de inferencia (no bloquea la GUI)"""
+        worker = state["worker"]
+        if worker is not None:
+            worker.submit(image_array, seq)
     
-    # PASO 3: Crear interfaz gráfica
-    print("[MAIN] Creando interfaz gráfica...")
-    window = MainWindow()
+    def handle_result(seq, predicted_digit, confidences):
+        """Recibe el resultado en el hilo de la GUI (conexión en cola)"""
+        if window.update_prediction_results(confidences, seq):
+            if "first_prediction" not in startup.marks:
+                startup.mark("first_prediction")
+                print(startup.summary())
     
-    # PASO 4: Conectar la predicción con la interfaz
-    def handle_prediction(image_array):
-        """Función que maneja la predicción cuando el usuario dibuja"""
-        predicted_digit, confidences = predictor.predict(image_array)
-        if confidences is not None:
-            window.update_prediction_results(confidences)
+    def on_model_loaded(predictor):
+        """PASO 4: Conectar el modelo con la interfaz cuando termina de cargarse"""
+        startup.mark("model_ready")
+        if not predictor.is_loaded:
+            print("[MAIN] ⚠ Advertencia: La aplicación se ejecutará sin modelo")
+            window.set_model_ready(False)
+            return
+        worker = InferenceWorker(predictor, delay_ms=args.inference_delay_ms,
+                                 multi_digit=args.multi_digit)
+        worker.result_ready.connect(handle_result)
+        worker.start()
+        state["worker"] = worker
+        print("[MAIN] Aplicación lista. Dibuja un dígito...")
+        print("═" * 70)
+        window.set_model_ready(True)
     
-    # Conectar la señal del botón PREDICT con el predictor
+    # Conectar la señal de predicción en vivo con el hilo de inferencia
     window.predict_signal.connect(handle_prediction)
     
-    # PASO 5: Mostrar ventana
-    window.show()
-    print("[MAIN] ✓ Interfaz gráfica mostrada")
-    print("[MAIN] Aplicación lista. Dibuja algo y presiona PREDICT...")
-    print("═" * 70)
+    if args.inference_process and args.multi_digit:
+        # El buffer compartido del proceso hijo sólo admite capturas de 28x28
+        print("[MAIN] ⚠ --inference-process no admite --multi-digit; se predice en este proceso")
+        args.inference_process = False
+    predictor_kwargs = dict(backend=args.backend, preprocessing=args.preprocessing,
+                            incremental=args.incremental, cascade=args.cascade,
+                            cascade_threshold=args.cascade_threshold, tta=args.tta)
+    
+    def load_predictor():
+        """Se ejecuta en el hilo de carga: un modelo o el conjunto de --ensemble"""
+        if args.ensemble:
+            budgets = args.ensemble_budget_ms
+            return EnsemblePredictor(args.ensemble, weights=args.ensemble_weights,
+                                     budgets_ms=budgets[0] if len(budgets) == 1 else budgets,
+                                     processes=args.inference_process, **predictor_kwargs)
+        predictor_class = ProcessPredictor if args.inference_process else Predictor
+        return predictor_class(model_path, **predictor_kwargs)
+    
+    loader = ModelLoader(load_predictor, parent=window)
+    loader.model_loaded.connect(on_model_loaded)
+    loader.start()
     
-    # PASO 6: Ejecutar loop de eventos
-    return app.exec()
+    # PASO 5: Ejecutar loop de eventos
+    exit_code = app.exec()
+    loader.wait()
+    worker = state["worker"]
+    if worker is not None:
+        worker.stop()
+        print(f"[MAIN] Inferencia: {worker.submitted} enviadas, {worker.completed} completadas, "
+              f"{worker.dropped} descartadas")
+        if worker.predictor.cache is not None:
+            print(f"[MAIN] Caché de predicciones: {worker.predictor.cache.stats()}")
+    predictor = loader.predictor
+    if isinstance(predictor, EnsemblePredictor):
+        for name, stats in predictor.stats().items():
+            print(f"[MAIN] Conjunto {name}: {stats['on_time']} a tiempo, {stats['late']} tarde, "
+                  f"{stats['skipped']} saltadas")
+        predictor.close()
+    if isinstance(predictor, ProcessPredictor):
+        print(f"[MAIN] Proceso de inferencia: {predictor.restarts} reinicios")
+        predictor.close()
+    for exporter in exporters:
+        exporter.stop()
+    print(METRICS.summary())
+    return exit_code
 
 
 # ============ PUNTO DE ENTRADA ============
@@ -94,6 +241,8 @@ if __name__ == "__main__":
     """
     Cómo ejecutar:
     - Terminal: python main.py
+    - Sin TensorFlow: python main.py --backend numpy
+    - Modelo en otro proceso: python main.py --inference-process
     """
     exit_code = main()
     sys.exit(exit_code)
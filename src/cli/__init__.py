@@ -0,0 +1 @@
+# Herramientas de línea de comandos (sin interfaz gráfica)
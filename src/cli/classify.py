@@ -0,0 +1,275 @@
+"""
+MÓDULO: classify.py
+PROPÓSITO: Clasifica directorios completos de imágenes de dígitos SIN interfaz gráfica
+
+USO:
+    python -m src.cli.classify CARPETA -o resultados.csv [--backend numpy] [--workers 8]
+    python -m src.cli.classify CARPETA -o probabilidades.npy
+
+PIPELINE (memoria constante, independiente del tamaño del directorio):
+1. Recorrer el directorio de forma perezosa (os.scandir)
+2. Decodificar en un pool de hilos: escala de grises, relleno a cuadrado y 28x28 (Pillow)
+3. Preprocesar (pipeline estilo MNIST) e inferir con Predictor.predict_batch por bloques
+4. Escribir cada bloque en cuanto termina (CSV o .npy mapeado en disco)
+
+Mientras el modelo procesa un bloque, el pool ya decodifica el siguiente; como mucho
+hay dos bloques en memoria.
+
+NOTA: Este módulo nunca importa PyQt6 (funciona en servidores sin pantalla).
+"""
+
+import argparse
+import csv
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from ..model.predictor import BACKENDS, BACKEND_NUMPY, PREPROCESSINGS, PREPROCESSING_MNIST, Predictor
+
+
+# Extensiones de imagen reconocidas
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".gif", ".tif", ".tiff")
+DEFAULT_MODEL = os.path.join("models", "mnist_cnn_model.keras")
+DEFAULT_CHUNK_SIZE = 256
+
+
+def iter_image_paths(root):
+    """
+    Recorre `root` recursivamente y devuelve las rutas de imagen
+
+    NOTA: Es un generador sobre os.scandir sin ordenar (orden del sistema de archivos):
+          nunca guarda la lista de entradas, ni siquiera la de un único directorio.
+          Las rutas se escriben junto a cada resultado, así que el orden no importa
+    """
+    try:
+        entries = os.scandir(root)
+    except OSError as e:
+        print(f"[CLASSIFY] ⚠ No se puede leer {root}: {e}")
+        return
+    with entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_image_paths(entry.path)
+            elif entry.name.lower().endswith(IMAGE_EXTENSIONS):
+                yield entry.path
+
+
+def decode_image(path, dark_background=False, size=28):
+    """
+    Lee una imagen y la convierte al formato del canvas
+
+    PARÁMETROS:
+    - path: Ruta de la imagen
+    - dark_background: True si la imagen es trazo claro sobre fondo oscuro (estilo MNIST)
+    - size: Lado de salida
+
+    RETORNA: Array uint8 (size, size) con fondo blanco y trazo negro, o None si falla
+    """
+    from PIL import Image, ImageOps
+
+    try:
+        with Image.open(path) as image:
+            # draft() permite a JPEG decodificar directamente a menor resolución
+            image.draft("L", (size * 4, size * 4))
+            gray = image.convert("L")
+        if dark_background:
+            gray = ImageOps.invert(gray)
+        # Rellenar a cuadrado con fondo blanco para no deformar el dígito
+        side = max(gray.size)
+        square = Image.new("L", (side, side), 255)
+        square.paste(gray, ((side - gray.width) // 2, (side - gray.height) // 2))
+        resized = square.resize((size, size), Image.Resampling.BOX)
+        return np.asarray(resized, dtype=np.uint8)
+    except Exception as e:
+        print(f"[CLASSIFY] ⚠ No se pudo leer {path}: {e}")
+        return None
+
+
+def iter_chunks(iterable, size):
+    """Divide un iterable en listas de como mucho `size` elementos"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def decode_chunks(paths, pool, chunk_size, dark_background):
+    """
+    Decodifica bloques en el pool con un bloque de adelanto
+
+    RETORNA (generador): (rutas, imágenes (n, 28, 28), máscara de imágenes válidas)
+    """
+    def submit(chunk):
+        return chunk, [pool.submit(decode_image, path, dark_background) for path in chunk]
+
+    chunks = iter_chunks(paths, chunk_size)
+    pending = None
+    for chunk in chunks:
+        current = submit(chunk)
+        if pending is not None:
+            yield collect(*pending)
+        pending = current
+    if pending is not None:
+        yield collect(*pending)
+
+
+def collect(chunk, futures):
+    """Espera las decodificaciones de un bloque y las apila"""
+    decoded = [future.result() for future in futures]
+    valid = np.array([image is not None for image in decoded], dtype=bool)
+    blank = np.full((28, 28), 255, dtype=np.uint8)
+    images = np.stack([image if image is not None else blank for image in decoded])
+    return chunk, images, valid
+
+
+class CsvWriter:
+    """Escribe una fila por imagen: ruta, dígito, confianza y las 10 probabilidades"""
+
+    def __init__(self, output_path):
+        self.file = open(output_path, "w", newline="", encoding="utf-8")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(["path", "label", "confidence"] + [f"p{d}" for d in range(10)])
+
+    def write(self, paths, labels, probabilities, valid):
+        for path, label, probs, ok in zip(paths, labels, probabilities, valid):
+            if ok:
+                self.writer.writerow([path, int(label), f"{probs[label]:.6f}"]
+                                     + [f"{p:.6f}" for p in probs])
+            else:
+                self.writer.writerow([path, -1, ""] + [""] * 10)
+
+    def close(self):
+        self.file.close()
+
+
+class NpyWriter:
+    """
+    Escribe las probabilidades en un .npy (N, 10) float32 mapeado en disco
+
+    NOTAS:
+    - Las rutas se guardan en <salida>.paths.txt, una por línea, en el mismo orden
+    - Las imágenes que no se pudieron leer quedan con NaN
+    - N se cuenta antes de clasificar; si el directorio cambia entre el recuento y la
+      clasificación, las imágenes que sobran se descartan (dropped) y las filas que
+      faltan quedan con NaN
+    """
+
+    def __init__(self, output_path, total):
+        self.array = np.lib.format.open_memmap(output_path, mode="w+", dtype=np.float32,
+                                               shape=(total, 10))
+        self.paths = open(os.path.splitext(output_path)[0] + ".paths.txt", "w", encoding="utf-8")
+        self.position = 0
+        self.dropped = 0
+
+    def write(self, paths, labels, probabilities, valid):
+        # Nunca escribir más allá de las N filas reservadas
+        count = min(len(paths), len(self.array) - self.position)
+        self.dropped += len(paths) - count
+        end = self.position + count
+        block = self.array[self.position:end]
+        block[:] = probabilities[:count]
+        block[~valid[:count]] = np.nan
+        self.paths.writelines(path + "\n" for path in paths[:count])
+        self.position = end
+
+    def close(self):
+        self.array[self.position:] = np.nan
+        if self.dropped or self.position < len(self.array):
+            print(f"[CLASSIFY] ⚠ El directorio cambió durante la clasificación: "
+                  f"{self.dropped} imágenes descartadas, {len(self.array) - self.position} "
+                  f"filas sin rellenar (NaN)")
+        self.array.flush()
+        del self.array
+        self.paths.close()
+
+
+def classify_directory(predictor, root, output_path, workers=8, chunk_size=DEFAULT_CHUNK_SIZE,
+                       dark_background=False):
+    """
+    Clasifica todas las imágenes de `root` y escribe los resultados
+
+    RETORNA: Dict con imágenes procesadas, fallidas, segundos e imágenes/s
+    """
+    total = None
+    if output_path.endswith(".npy"):
+        # El .npy necesita conocer N de antemano: primer recorrido sólo contando
+        # (NpyWriter nunca escribe más allá de esas N filas si el directorio crece)
+        total = sum(1 for _ in iter_image_paths(root))
+        writer = NpyWriter(output_path, total)
+    else:
+        writer = CsvWriter(output_path)
+
+    processed = failed = 0
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for paths, images, valid in decode_chunks(iter_image_paths(root), pool,
+                                                      chunk_size, dark_background):
+                labels, probabilities = predictor.predict_batch(images, batch_size=chunk_size)
+                if labels is None:
+                    raise RuntimeError("La predicción del bloque falló")
+                writer.write(paths, labels, probabilities, valid)
+
+                processed += len(paths)
+                failed += int((~valid).sum())
+                elapsed = time.perf_counter() - start
+                progress = f"{processed}/{total}" if total is not None else f"{processed}"
+                print(f"[CLASSIFY] {progress} imágenes  |  {processed / elapsed:.0f} img/s",
+                      flush=True)
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    return {
+        "processed": processed,
+        "failed": failed,
+        "seconds": elapsed,
+        "images_per_second": processed / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        description="Clasifica un directorio de imágenes de dígitos sin interfaz gráfica")
+    parser.add_argument("directory", help="Carpeta con imágenes PNG/JPG (se recorre recursivamente)")
+    parser.add_argument("-o", "--output", default="predictions.csv",
+                        help="Archivo de salida: .csv (una fila por imagen) o .npy (probabilidades)")
+    parser.add_argument("--model", default=DEFAULT_MODEL, help="Ruta del modelo .keras")
+    parser.add_argument("--backend", choices=BACKENDS, default=BACKEND_NUMPY)
+    parser.add_argument("--preprocessing", choices=PREPROCESSINGS, default=PREPROCESSING_MNIST)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4,
+                        help="Hilos de decodificación")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="Imágenes por bloque de inferencia")
+    parser.add_argument("--dark-background", action="store_true",
+                        help="Las imágenes tienen trazo claro sobre fondo oscuro")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    if not os.path.isdir(args.directory):
+        print(f"[CLASSIFY] ✗ No existe el directorio: {args.directory}")
+        return 2
+
+    predictor = Predictor(args.model, backend=args.backend, preprocessing=args.preprocessing,
+                          cache_size=0)
+    if not predictor.is_loaded:
+        print(f"[CLASSIFY] ✗ {predictor.error_message}")
+        return 1
+
+    stats = classify_directory(predictor, args.directory, args.output, workers=args.workers,
+                               chunk_size=args.chunk_size, dark_background=args.dark_background)
+    print(f"[CLASSIFY] ✓ {stats['processed']} imágenes ({stats['failed']} con error) en "
+          f"{stats['seconds']:.1f} s  |  {stats['images_per_second']:.0f} img/s  ->  {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""
+MÓDULO: distill.py
+PROPÓSITO: Genera la primera etapa de la cascada (clasificador lineal destilado de la CNN)
+
+USO:
+    python -m src.cli.distill [--model models/mnist_cnn_model.keras] [--samples 3000]
+    python -m src.cli.distill --mnist-dir archive/   # destilar con MNIST (partición train)
+
+FUNCIÓN PRINCIPAL:
+- Preparar las entradas igual que el Predictor (mismo preprocesado)
+  * Con --mnist-dir: las primeras N imágenes de entrenamiento (memmap IDX)
+  * Sin él: dígitos sintéticos tipo canvas (utils/synthetic_digits.py)
+- Obtener las probabilidades de la CNN (motor NumPy) como objetivo de la destilación
+- Entrenar la regresión softmax y ajustar el umbral de margen en la partición de ajuste
+  (el menor con el que la cascada contradice a la CNN en como mucho --max-disagreement)
+- Guardar models/<modelo>.cascade.npz con el informe
+"""
+
+import argparse
+import os
+import sys
+
+from ..model.cascade import (
+    DEFAULT_MAX_DISAGREEMENT, DEFAULT_POOL, cascade_model_path, distill_stage
+)
+from ..model.predictor import BACKEND_NUMPY, PREPROCESSINGS, PREPROCESSING_BASIC, Predictor
+from .quantize import calibration_set
+
+
+DEFAULT_MODEL = os.path.join("models", "mnist_cnn_model.keras")
+DEFAULT_SAMPLES = 3000
+# Semilla de los dígitos sintéticos de destilación (distinta de la de calibración int8)
+DISTILL_SEED = 202
+
+
+def format_report(stage):
+    """RETORNA: Texto con el informe de destilación"""
+    report = stage.report
+    return "\n".join([
+        f"Muestras: {report['train_samples']} de entrenamiento, {report['tune_samples']} de ajuste",
+        f"Primera etapa: {stage.weights.size + stage.bias.size} parámetros "
+        f"(entrada {stage.weights.shape[0]} valores)",
+        f"Precisión primera etapa sola: {report['stage_accuracy']:.2%}  |  "
+        f"top-1 coincidente con la CNN: {report['top1_agreement']:.2%}",
+        f"Umbral de margen: {stage.threshold:.2f}  |  responde la primera etapa: {report['hit_rate']:.1%}  "
+        f"|  contradice a la CNN: {report['disagreement']:.2%}",
+        f"Precisión CNN: {report['cnn_accuracy']:.2%}  |  cascada: {report['cascade_accuracy']:.2%}  "
+        f"(caída {report['accuracy_drop']:+.2%})",
+    ])
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Destila la primera etapa de la cascada")
+    parser.add_argument("--model", default=DEFAULT_MODEL, help="Ruta del modelo .keras")
+    parser.add_argument("--output", help="Archivo de salida (por defecto <modelo>.cascade.npz)")
+    parser.add_argument("--mnist-dir", help="Carpeta con los IDX de MNIST para destilar")
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES)
+    parser.add_argument("--preprocessing", choices=PREPROCESSINGS, default=PREPROCESSING_BASIC)
+    parser.add_argument("--pool", type=int, default=DEFAULT_POOL,
+                        help="Reducción de la entrada (2 = 14x14, 1 = 28x28)")
+    parser.add_argument("--max-disagreement", type=float, default=DEFAULT_MAX_DISAGREEMENT,
+                        help="Fracción de entradas en las que la cascada puede contradecir a la CNN")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    predictor = Predictor(args.model, backend=BACKEND_NUMPY, preprocessing=args.preprocessing,
+                          cache_size=0)
+    if not predictor.is_loaded:
+        print(f"[DISTILL] ✗ {predictor.error_message}")
+        return 2
+
+    try:
+        images, labels, invert = calibration_set(args.samples, args.mnist_dir, seed=DISTILL_SEED)
+    except FileNotFoundError as e:
+        print(f"[DISTILL] ✗ {e}")
+        return 2
+    print(f"[DISTILL] Destilando con {len(labels)} imágenes...")
+    inputs = predictor.prepare_batch(images, invert=invert)
+    stage = distill_stage(args.model, inputs, predictor.run_model(inputs), labels,
+                          pool=args.pool, max_disagreement=args.max_disagreement)
+    stage.report["preprocessing"] = args.preprocessing
+
+    output = args.output or cascade_model_path(args.model)
+    stage.save(output)
+    print(format_report(stage))
+    print(f"[DISTILL] ✓ Primera etapa guardada en {output} ({os.path.getsize(output) / 1024:.0f} KiB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
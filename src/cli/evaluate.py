@@ -0,0 +1,182 @@
+"""
+MÓDULO: evaluate.py
+PROPÓSITO: Mide la precisión y el throughput del modelo sobre el dataset MNIST original
+
+USO:
+    python -m src.cli.evaluate archive/ [--split test] [--workers 4] [--backend numpy]
+
+FUNCIÓN PRINCIPAL:
+- Mapear en memoria los archivos IDX (np.memmap): nada se carga completo en RAM
+- Pasar cortes sin copia del memmap, por lotes, a Predictor.predict_batch
+- Repartir el dataset en fragmentos contiguos entre un pool de procesos; cada proceso
+  abre su propio memmap y su propio Predictor (sólo viajan índices y matrices 10x10)
+- Informar: precisión, matriz de confusión, error por clase e imágenes/s
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from ..model.predictor import BACKENDS, BACKEND_NUMPY, PREPROCESSINGS, PREPROCESSING_BASIC, Predictor
+from ..utils.idx_dataset import find_mnist_files, open_idx
+
+
+DEFAULT_MODEL = os.path.join("models", "mnist_cnn_model.keras")
+DEFAULT_BATCH_SIZE = 256
+
+
+def evaluate_shard(task):
+    """
+    Evalúa el fragmento [start, stop) del dataset (se ejecuta en un proceso del pool)
+
+    PARÁMETRO:
+    - task: Dict con rutas, rango, modelo, backend, preprocesado, cascada y tamaño de lote
+
+    RETORNA: Dict con la matriz de confusión (10x10) y los segundos de inferencia
+    """
+    images = open_idx(task["images_path"])
+    labels = open_idx(task["labels_path"])
+    predictor = Predictor(task["model"], backend=task["backend"],
+                          preprocessing=task["preprocessing"], cache_size=0,
+                          cascade=task["cascade"], cascade_threshold=task["cascade_threshold"])
+    if not predictor.is_loaded:
+        raise RuntimeError(predictor.error_message)
+
+    start, stop = task["start"], task["stop"]
+    began = time.perf_counter()
+    # images[start:stop] es una vista del memmap; predict_batch la recorre por lotes.
+    # Las imágenes MNIST ya tienen fondo negro: no se invierten
+    predicted, _ = predictor.predict_batch(images[start:stop], batch_size=task["batch_size"],
+                                           invert=False)
+    seconds = time.perf_counter() - began
+    if predicted is None:
+        raise RuntimeError("La predicción del fragmento falló")
+
+    truth = np.asarray(labels[start:stop], dtype=np.int64)
+    confusion = np.bincount(truth * 10 + predicted, minlength=100).reshape(10, 10)
+    return {"confusion": confusion, "seconds": seconds, "count": stop - start}
+
+
+def shard_ranges(total, shards):
+    """RETORNA: Lista de rangos (start, stop) contiguos que cubren [0, total)"""
+    bounds = np.linspace(0, total, shards + 1).astype(int)
+    return [(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+
+def evaluate(images_path, labels_path, model=DEFAULT_MODEL, backend=BACKEND_NUMPY,
+             preprocessing=PREPROCESSING_BASIC, batch_size=DEFAULT_BATCH_SIZE, workers=1,
+             limit=None, cascade=False, cascade_threshold=None):
+    """
+    Evalúa el modelo sobre un par de archivos IDX
+
+    RETORNA: Dict con total, precisión, matriz de confusión, error por clase e imágenes/s
+    """
+    total = open_idx(images_path).shape[0]
+    if open_idx(labels_path).shape[0] != total:
+        raise ValueError("El número de imágenes y de etiquetas no coincide")
+    if limit is not None:
+        total = min(total, limit)
+
+    tasks = [
+        {"images_path": images_path, "labels_path": labels_path, "start": start, "stop": stop,
+         "model": model, "backend": backend, "preprocessing": preprocessing,
+         "batch_size": batch_size, "cascade": cascade, "cascade_threshold": cascade_threshold}
+        for start, stop in shard_ranges(total, max(workers, 1))
+    ]
+
+    began = time.perf_counter()
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(evaluate_shard, tasks))
+    else:
+        results = [evaluate_shard(task) for task in tasks]
+    wall_seconds = time.perf_counter() - began
+
+    # Con 0 imágenes no hay resultados: la matriz queda a cero
+    confusion = sum((result["confusion"] for result in results), np.zeros((10, 10), dtype=np.int64))
+    per_class_total = confusion.sum(axis=1)
+    per_class_error = 1.0 - np.diag(confusion) / np.maximum(per_class_total, 1)
+    inference_seconds = max((result["seconds"] for result in results), default=0.0)
+    return {
+        "total": int(total),
+        "accuracy": float(np.trace(confusion) / max(total, 1)),
+        "confusion": confusion,
+        "per_class_error": per_class_error,
+        "wall_seconds": wall_seconds,
+        # Wall time incluye arrancar los procesos y cargar el modelo en cada uno
+        "images_per_second": total / wall_seconds if total else 0.0,
+        "inference_images_per_second": total / inference_seconds if total else 0.0,
+    }
+
+
+def format_report(report):
+    """RETORNA: Texto con el informe de evaluación"""
+    lines = [
+        f"Imágenes: {report['total']}",
+        f"Precisión: {report['accuracy']:.4%}",
+        f"Throughput: {report['images_per_second']:.0f} img/s (total)  |  "
+        f"{report['inference_images_per_second']:.0f} img/s (sólo inferencia)",
+        "",
+        "Matriz de confusión (filas = real, columnas = predicho):",
+        "      " + "".join(f"{d:>6}" for d in range(10)) + "   error",
+    ]
+    for digit in range(10):
+        row = "".join(f"{v:>6}" for v in report["confusion"][digit])
+        lines.append(f"{digit:>6}{row}   {report['per_class_error'][digit]:.2%}")
+    return "\n".join(lines)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Evalúa el modelo sobre el dataset MNIST (IDX)")
+    parser.add_argument("archive", help="Carpeta con los archivos IDX de MNIST (p. ej. archive/)")
+    parser.add_argument("--split", choices=("test", "train"), default="test")
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--backend", choices=BACKENDS, default=BACKEND_NUMPY)
+    parser.add_argument("--preprocessing", choices=PREPROCESSINGS, default=PREPROCESSING_BASIC)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=1, help="Procesos entre los que repartir el dataset")
+    parser.add_argument("--limit", type=int, help="Evaluar sólo las primeras N imágenes")
+    parser.add_argument("--cascade", action="store_true",
+                        help="Usar la cascada (primera etapa lineal + CNN para las dudosas)")
+    parser.add_argument("--cascade-threshold", type=float, help="Margen mínimo de la primera etapa")
+    parser.add_argument("--json", help="Guardar también el informe en JSON")
+    args = parser.parse_args(argv)
+    if args.limit is not None and args.limit < 0:
+        parser.error("--limit no puede ser negativo")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    try:
+        images_path, labels_path = find_mnist_files(args.archive, args.split)
+    except FileNotFoundError as e:
+        print(f"[EVALUATE] ✗ {e}")
+        return 2
+
+    print(f"[EVALUATE] Imágenes: {images_path}")
+    print(f"[EVALUATE] Etiquetas: {labels_path}")
+    report = evaluate(images_path, labels_path, model=args.model, backend=args.backend,
+                      preprocessing=args.preprocessing, batch_size=args.batch_size,
+                      workers=args.workers, limit=args.limit, cascade=args.cascade,
+                      cascade_threshold=args.cascade_threshold)
+    if report["total"] == 0:
+        print("[EVALUATE] ✗ No hay imágenes que evaluar (archivo IDX vacío o --limit 0)")
+        return 1
+    print(format_report(report))
+
+    if args.json:
+        serializable = dict(report, confusion=report["confusion"].tolist(),
+                            per_class_error=report["per_class_error"].tolist())
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(serializable, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""
+MÓDULO: quantize.py
+PROPÓSITO: Genera la variante int8 del modelo (cuantización post-entrenamiento)
+
+USO:
+    python -m src.cli.quantize [--model models/mnist_cnn_model.keras] [--samples 512]
+    python -m src.cli.quantize --mnist-dir archive/   # calibrar con MNIST (partición train)
+
+FUNCIÓN PRINCIPAL:
+- Preparar las entradas de calibración igual que el Predictor (mismo preprocesado)
+  * Con --mnist-dir: las primeras N imágenes de entrenamiento (memmap IDX)
+  * Sin él: dígitos sintéticos tipo canvas (utils/synthetic_digits.py)
+- Cuantizar pesos por canal y calibrar las escalas de activación
+- Guardar models/<modelo>.int8.npz con el informe de calibración (y el preprocesado
+  usado, que el Predictor exige que coincida con el suyo)
+- Avisar (código de salida 1) si la caída de precisión supera el umbral; el
+  backend "int8" del Predictor se niega a cargar ese archivo
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+
+from ..model.predictor import BACKEND_NUMPY, PREPROCESSINGS, PREPROCESSING_BASIC, Predictor
+from ..model.quantization import DEFAULT_MAX_ACCURACY_DROP, quantize_model, quantized_model_path
+
+
+DEFAULT_MODEL = os.path.join("models", "mnist_cnn_model.keras")
+DEFAULT_SAMPLES = 512
+# Semilla de los dígitos sintéticos de calibración
+CALIBRATION_SEED = 101
+
+
+def calibration_set(samples, mnist_dir=None, seed=CALIBRATION_SEED):
+    """
+    RETORNA: (imágenes uint8 (N, 28, 28), etiquetas (N,), invert)
+
+    PARÁMETROS:
+    - seed: Semilla de los dígitos sintéticos (sin mnist_dir)
+
+    NOTA: invert es False para MNIST (fondo negro) y True para el canvas sintético
+    """
+    if mnist_dir:
+        from ..utils.idx_dataset import find_mnist_files, open_idx
+        images_path, labels_path = find_mnist_files(mnist_dir, "train")
+        images, labels = open_idx(images_path), open_idx(labels_path)
+        return np.asarray(images[:samples]), np.asarray(labels[:samples]), False
+
+    from ..utils.synthetic_digits import render_digits
+    images, labels = render_digits(samples, seed=seed)
+    return images, labels, True
+
+
+def format_report(report):
+    """RETORNA: Texto con el informe de calibración"""
+    return "\n".join([
+        f"Muestras de calibración: {report['calibration_samples']}",
+        f"Pesos float32: {report['float_weight_bytes'] / 1024:.0f} KiB  |  "
+        f"int8: {report['int8_weight_bytes'] / 1024:.0f} KiB",
+        f"Precisión float32: {report['float_accuracy']:.2%}  |  int8: {report['int8_accuracy']:.2%}  "
+        f"(caída {report['accuracy_drop']:+.2%})",
+        f"Top-1 coincidente float32/int8: {report['top1_agreement']:.2%}",
+    ])
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Cuantiza el modelo a int8 (pesos por canal)")
+    parser.add_argument("--model", default=DEFAULT_MODEL, help="Ruta del modelo .keras")
+    parser.add_argument("--output", help="Archivo de salida (por defecto <modelo>.int8.npz)")
+    parser.add_argument("--mnist-dir", help="Carpeta con los IDX de MNIST para calibrar")
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES)
+    parser.add_argument("--preprocessing", choices=PREPROCESSINGS, default=PREPROCESSING_BASIC)
+    parser.add_argument("--max-accuracy-drop", type=float, default=DEFAULT_MAX_ACCURACY_DROP)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    # El Predictor float32 sólo se usa para preparar las entradas como en la aplicación
+    predictor = Predictor(args.model, backend=BACKEND_NUMPY, preprocessing=args.preprocessing,
+                          cache_size=0)
+    if not predictor.is_loaded:
+        print(f"[QUANTIZE] ✗ {predictor.error_message}")
+        return 2
+
+    try:
+        images, labels, invert = calibration_set(args.samples, args.mnist_dir)
+    except FileNotFoundError as e:
+        print(f"[QUANTIZE] ✗ {e}")
+        return 2
+    print(f"[QUANTIZE] Calibrando con {len(labels)} imágenes...")
+    quantized = quantize_model(args.model, predictor.prepare_batch(images, invert=invert), labels)
+    quantized.report["preprocessing"] = args.preprocessing
+
+    output = args.output or quantized_model_path(args.model)
+    quantized.save(output)
+    print(format_report(quantized.report))
+    print(f"[QUANTIZE] ✓ Modelo int8 guardado en {output} ({os.path.getsize(output) / 1024:.0f} KiB)")
+
+    if quantized.report["accuracy_drop"] > args.max_accuracy_drop:
+        print(f"[QUANTIZE] ⚠ La caída de precisión supera {args.max_accuracy_drop:.2%}: "
+              f"el backend int8 no cargará este modelo")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
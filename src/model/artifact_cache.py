@@ -0,0 +1,259 @@
+"""
+MÓDULO: artifact_cache.py
+PROPÓSITO: Caché en disco del modelo ya "desempaquetado" para acelerar el arranque
+
+MOTIVACIÓN:
+- keras.models.load_model descomprime el .keras, lee el HDF5 de pesos, reconstruye el
+  modelo desde el JSON y restaura el estado del optimizador (que en inferencia sobra)
+- La primera vez que se ve un archivo .keras se guarda una entrada con:
+  * weights.bin: todos los pesos float32 concatenados (alineados a 64 bytes), listos
+    para np.memmap: cargar es mapear el archivo, sin copiar ni decodificar nada
+  * meta.json: la arquitectura compacta (capas y configuración Keras sin optimizador)
+    y la posición/forma de cada array dentro de weights.bin
+
+CLAVE E INVALIDACIÓN:
+- Cada entrada es una carpeta cuyo nombre es el hash blake2b del .keras: si el archivo
+  cambia, su hash cambia y la entrada vieja deja de usarse (y se borra al guardar la nueva)
+- El tamaño total está acotado (max_bytes); al superarlo se borran las entradas usadas
+  hace más tiempo (la fecha de uso es el mtime de meta.json, que se actualiza en cada acierto)
+
+ESCRITURA ATÓMICA: La entrada se escribe en una carpeta temporal y se renombra al final;
+un proceso que lea a la vez nunca ve una entrada a medio escribir. Si en su lugar hay una
+entrada dañada (p. ej. de una versión anterior o de un disco lleno), se aparta con un
+renombrado y se sustituye por la nueva; sólo se respeta la existente si es válida.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+
+import numpy as np
+
+from .numpy_engine import read_keras_archive
+
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "digit-prediction", "models")
+# Tamaño máximo de la caché en disco
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Alineación de cada array dentro de weights.bin
+ALIGNMENT = 64
+WEIGHTS_FILE = "weights.bin"
+META_FILE = "meta.json"
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """RETORNA: Hash blake2b (hex) del contenido de un archivo"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_keras_config(model_path):
+    """
+    RETORNA: Configuración Keras del modelo sin la parte de compilación (optimizador)
+    """
+    with zipfile.ZipFile(model_path) as archive:
+        config = json.loads(archive.read("config.json"))
+    config.pop("compile_config", None)
+    return config
+
+
+class ModelArtifact:
+    """
+    Modelo leído de la caché
+
+    ATRIBUTOS:
+    - layers / weights: Igual que read_keras_archive() (los arrays son vistas del memmap)
+    - keras_config: Configuración para keras.models.model_from_json
+    - digest: Hash del .keras de origen
+    - from_cache: True si se leyó de una entrada existente
+    """
+
+    def __init__(self, layers, weights, keras_config, digest, from_cache):
+        self.layers = layers
+        self.weights = weights
+        self.keras_config = keras_config
+        self.digest = digest
+        self.from_cache = from_cache
+
+    def weight_list(self):
+        """RETORNA: Pesos en el orden de model.get_weights() de Keras"""
+        return [array for layer in self.layers for array in self.weights.get(layer["config"]["name"], [])]
+
+
+class ArtifactCache:
+    """
+    Caché de modelos en disco indexada por el hash del archivo .keras
+
+    ATRIBUTOS:
+    - directory: Carpeta de la caché
+    - max_bytes: Tamaño máximo total
+    - hits / misses / evictions: Contadores
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def entry_path(self, digest):
+        return os.path.join(self.directory, digest)
+
+    def load(self, model_path):
+        """
+        Lee el modelo desde la caché o, si no está, desde el .keras (y lo guarda)
+
+        RETORNA: ModelArtifact
+        LANZA: FileNotFoundError si no existe model_path
+        """
+        digest = file_digest(model_path)
+        entry = self.entry_path(digest)
+        try:
+            artifact = self._read_entry(entry, digest)
+            os.utime(os.path.join(entry, META_FILE))
+            self.hits += 1
+            return artifact
+        except (OSError, ValueError, KeyError):
+            # Entrada inexistente o dañada: se regenera
+            pass
+
+        self.misses += 1
+        layers, weights = read_keras_archive(model_path)
+        keras_config = read_keras_config(model_path)
+        try:
+            self._write_entry(entry, digest, model_path, layers, weights, keras_config)
+            self._remove_stale(model_path, digest)
+            self._evict()
+        except OSError as e:
+            # Sin caché (p. ej. disco de sólo lectura) el modelo sigue funcionando
+            print(f"[ARTIFACT_CACHE] ⚠ No se pudo guardar la entrada: {e}")
+        return ModelArtifact(layers, weights, keras_config, digest, from_cache=False)
+
+    def _read_entry(self, entry, digest):
+        with open(os.path.join(entry, META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+        blob = np.memmap(os.path.join(entry, WEIGHTS_FILE), dtype=np.uint8, mode="r")
+        weights = {}
+        for name, arrays in meta["arrays"].items():
+            weights[name] = [
+                blob[a["offset"]:a["offset"] + a["nbytes"]].view(np.float32).reshape(a["shape"])
+                for a in arrays
+            ]
+        return ModelArtifact(meta["layers"], weights, meta["keras_config"], digest, from_cache=True)
+
+    def _is_valid(self, entry, digest):
+        """RETORNA: True si la entrada existe y se puede leer completa"""
+        try:
+            self._read_entry(entry, digest)
+            return True
+        except (OSError, ValueError, KeyError):
+            return False
+
+    def _write_entry(self, entry, digest, model_path, layers, weights, keras_config):
+        os.makedirs(self.directory, exist_ok=True)
+        temp = tempfile.mkdtemp(prefix=".tmp-", dir=self.directory)
+        try:
+            arrays, offset = {}, 0
+            with open(os.path.join(temp, WEIGHTS_FILE), "wb") as f:
+                for name, values in weights.items():
+                    arrays[name] = []
+                    for array in values:
+                        data = np.ascontiguousarray(array, dtype=np.float32)
+                        padding = -offset % ALIGNMENT
+                        f.write(b"\0" * padding)
+                        offset += padding
+                        f.write(data.tobytes())
+                        arrays[name].append({"offset": offset, "nbytes": data.nbytes,
+                                             "shape": list(data.shape)})
+                        offset += data.nbytes
+            meta = {"source": os.path.abspath(model_path), "layers": layers,
+                    "keras_config": keras_config, "arrays": arrays}
+            with open(os.path.join(temp, META_FILE), "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+        except OSError:
+            shutil.rmtree(temp, ignore_errors=True)
+            raise
+
+        try:
+            os.replace(temp, entry)
+            return
+        except OSError:
+            # La carpeta de la entrada ya existe (no se puede reemplazar si no está vacía)
+            pass
+        if self._is_valid(entry, digest):
+            # Otro proceso acaba de escribir la misma entrada
+            shutil.rmtree(temp, ignore_errors=True)
+            return
+        # Entrada dañada: apartarla con un renombrado y poner la nueva en su lugar
+        aside = os.path.join(self.directory, f".damaged-{digest}-{os.getpid()}")
+        try:
+            os.replace(entry, aside)
+            os.replace(temp, entry)
+        except OSError:
+            shutil.rmtree(temp, ignore_errors=True)
+            if not self._is_valid(entry, digest):
+                raise
+        finally:
+            shutil.rmtree(aside, ignore_errors=True)
+
+    def entries(self):
+        """RETORNA: Lista de (ruta, bytes, último_uso, origen) de las entradas válidas"""
+        result = []
+        if not os.path.isdir(self.directory):
+            return result
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            meta_path = os.path.join(path, META_FILE)
+            if name.startswith(".") or not os.path.isfile(meta_path):
+                continue
+            try:
+                size = sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+                with open(meta_path, encoding="utf-8") as f:
+                    source = json.load(f).get("source")
+                result.append((path, size, os.path.getmtime(meta_path), source))
+            except (OSError, ValueError):
+                continue
+        return result
+
+    def _remove_stale(self, model_path, digest):
+        """Borra las entradas de versiones anteriores del mismo archivo"""
+        source = os.path.abspath(model_path)
+        for path, _, _, entry_source in self.entries():
+            if entry_source == source and os.path.basename(path) != digest:
+                shutil.rmtree(path, ignore_errors=True)
+                self.evictions += 1
+
+    def _evict(self):
+        """Borra las entradas menos usadas hasta quedar por debajo de max_bytes"""
+        entries = sorted(self.entries(), key=lambda e: e[2])
+        total = sum(size for _, size, _, _ in entries)
+        # La entrada recién escrita es la más reciente: se conserva aunque no quepa
+        for path, size, _, _ in entries[:-1]:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            self.evictions += 1
+
+    def clear(self):
+        """Borra todas las entradas"""
+        for path, _, _, _ in self.entries():
+            shutil.rmtree(path, ignore_errors=True)
+
+    def stats(self):
+        """RETORNA: Dict con contadores, entradas y bytes en disco"""
+        entries = self.entries()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _, _ in entries),
+        }
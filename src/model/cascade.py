@@ -0,0 +1,212 @@
+"""
+MÓDULO: cascade.py
+PROPÓSITO: Cascada de modelos: un clasificador lineal diminuto responde primero y la CNN
+          sólo se ejecuta con las entradas dudosas
+
+PRIMERA ETAPA:
+- Entrada: la imagen ya preprocesada (28x28) reducida por media en bloques de pool x pool
+  (14x14 = 196 valores con pool=2)
+- Modelo: regresión softmax (196 x 10 pesos + 10 bias), ~2 K multiplicaciones frente a
+  los ~2.6 M de la CNN
+- Entrenamiento por DESTILACIÓN: el objetivo son las probabilidades de la CNN (no las
+  etiquetas), así la etapa aprende a imitar al modelo que sustituye
+
+DECISIÓN:
+- margen = probabilidad top-1 - probabilidad top-2 de la primera etapa
+- Si margen >= threshold se devuelve su respuesta; si no, se ejecuta la CNN
+- El umbral se ajusta en una partición de ajuste: el MENOR umbral con el que la cascada
+  contradice a la CNN sola en como mucho max_disagreement de las entradas. Se ajusta
+  por fidelidad a la CNN y no por etiquetas: así la diferencia de precisión queda
+  acotada por ese porcentaje y el ajuste no premia a la etapa lineal por acertar
+  donde la CNN falla en datos sintéticos
+
+ARCHIVO .cascade.npz (junto al .keras, generado con src.cli.distill):
+- "spec": JSON con pool, umbral e informe (hash del .keras de origen, preprocesado, ...)
+- "weights" / "bias": float32
+"""
+
+import json
+
+import numpy as np
+
+from .artifact_cache import file_digest
+from .numpy_engine import softmax
+
+
+CASCADE_SUFFIX = ".cascade.npz"
+# Reducción de la entrada antes de la etapa lineal (28x28 -> 14x14)
+DEFAULT_POOL = 2
+# Fracción máxima de entradas en las que la cascada puede contradecir a la CNN sola
+DEFAULT_MAX_DISAGREEMENT = 0.01
+# Descenso de gradiente (lote completo con momento) de la destilación
+DISTILL_EPOCHS = 500
+LEARNING_RATE = 0.5
+MOMENTUM = 0.9
+L2_PENALTY = 1e-4
+# Umbrales de margen candidatos al ajustar
+THRESHOLD_GRID = np.linspace(0.0, 1.0, 101)
+
+
+def cascade_model_path(model_path):
+    """RETORNA: Ruta de la primera etapa junto al .keras (modelo.keras -> modelo.cascade.npz)"""
+    base = model_path[:-len(".keras")] if model_path.endswith(".keras") else model_path
+    return base + CASCADE_SUFFIX
+
+
+def pooled_features(batch, pool=DEFAULT_POOL):
+    """
+    RETORNA: Array float32 (N, (28 / pool)^2) con la media de cada bloque pool x pool
+
+    PARÁMETRO:
+    - batch: Array (N, 28, 28, 1) ya preprocesado
+    """
+    x = np.asarray(batch, dtype=np.float32)
+    n, h, w = x.shape[:3]
+    if pool == 1:
+        return x.reshape(n, h * w)
+    blocks = x[:, :h // pool * pool, :w // pool * pool, 0]
+    return blocks.reshape(n, h // pool, pool, w // pool, pool).mean(axis=(2, 4)).reshape(n, -1)
+
+
+def top1_margin(probabilities):
+    """RETORNA: Array (N,) con probabilidad top-1 menos top-2"""
+    top2 = np.partition(probabilities, -2, axis=1)[:, -2:]
+    return top2[:, 1] - top2[:, 0]
+
+
+def distill_weights(features, targets, epochs=DISTILL_EPOCHS, learning_rate=LEARNING_RATE,
+                    momentum=MOMENTUM, l2=L2_PENALTY):
+    """
+    Ajusta una regresión softmax a las probabilidades del modelo maestro
+
+    PARÁMETROS:
+    - features: Array (N, D)
+    - targets: Array (N, 10) con las probabilidades de la CNN
+
+    RETORNA: (weights (D, 10), bias (10,)) float32
+
+    NOTA: Entropía cruzada con objetivos suaves, descenso de gradiente de lote completo
+          con momento de Nesterov (el problema es convexo y pequeño)
+    """
+    features = np.asarray(features, dtype=np.float32)
+    targets = np.asarray(targets, dtype=np.float32)
+    n, d = features.shape
+    weights = np.zeros((d, targets.shape[1]), dtype=np.float32)
+    bias = np.zeros(targets.shape[1], dtype=np.float32)
+    velocity_w = np.zeros_like(weights)
+    velocity_b = np.zeros_like(bias)
+    for _ in range(epochs):
+        look_w = weights + momentum * velocity_w
+        look_b = bias + momentum * velocity_b
+        gradient = (softmax(features @ look_w + look_b) - targets) / n
+        velocity_w = momentum * velocity_w - learning_rate * (features.T @ gradient + l2 * look_w)
+        velocity_b = momentum * velocity_b - learning_rate * gradient.sum(axis=0)
+        weights += velocity_w
+        bias += velocity_b
+    return weights, bias
+
+
+def cascade_predictions(stage_probabilities, cnn_probabilities, threshold):
+    """RETORNA: (top-1 de la cascada (N,), máscara de aciertos de la primera etapa (N,))"""
+    hits = top1_margin(stage_probabilities) >= threshold
+    predicted = np.where(hits, stage_probabilities.argmax(axis=1), cnn_probabilities.argmax(axis=1))
+    return predicted, hits
+
+
+def tune_threshold(stage_probabilities, cnn_probabilities,
+                   max_disagreement=DEFAULT_MAX_DISAGREEMENT):
+    """
+    RETORNA: El menor umbral de margen con el que la cascada contradice a la CNN sola en
+             como mucho max_disagreement de las entradas (1.0 si ninguno lo cumple: la
+             primera etapa nunca responde)
+    """
+    expected = cnn_probabilities.argmax(axis=1)
+    for threshold in THRESHOLD_GRID:
+        predicted, _ = cascade_predictions(stage_probabilities, cnn_probabilities, threshold)
+        if (predicted != expected).mean() <= max_disagreement:
+            return float(threshold)
+    return 1.0
+
+
+class LinearStage:
+    """
+    Primera etapa de la cascada: regresión softmax sobre la imagen reducida
+
+    ATRIBUTOS:
+    - weights / bias: Parámetros float32
+    - pool: Reducción de la entrada (2 = 14x14)
+    - threshold: Margen top-1 - top-2 a partir del cual responde sin la CNN
+    - report: Informe de destilación (hash del .keras, preprocesado, precisiones, ...)
+    """
+
+    def __init__(self, weights, bias, pool=DEFAULT_POOL, threshold=1.0, report=None):
+        self.weights = np.asarray(weights, dtype=np.float32)
+        self.bias = np.asarray(bias, dtype=np.float32)
+        self.pool = pool
+        self.threshold = threshold
+        self.report = report or {}
+
+    @classmethod
+    def load(cls, path):
+        """Lee una etapa guardada con save() (sin pickle)"""
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["spec"]))
+            weights, bias = data["weights"], data["bias"]
+        return cls(weights, bias, meta["pool"], meta["threshold"], meta.get("report"))
+
+    def save(self, path):
+        """Guarda los pesos, el umbral y el informe en un .npz"""
+        meta = json.dumps({"pool": self.pool, "threshold": self.threshold, "report": self.report})
+        with open(path, "wb") as f:
+            np.savez(f, spec=np.array(meta), weights=self.weights, bias=self.bias)
+
+    def __call__(self, batch):
+        """
+        PARÁMETRO:
+        - batch: Array float32 (N, 28, 28, 1) ya preprocesado
+
+        RETORNA: Array float32 (N, 10) con probabilidades softmax
+        """
+        return softmax(pooled_features(batch, self.pool) @ self.weights + self.bias)
+
+
+def distill_stage(model_path, inputs, cnn_probabilities, labels, tune_fraction=0.2,
+                  pool=DEFAULT_POOL, max_disagreement=DEFAULT_MAX_DISAGREEMENT):
+    """
+    Destila la primera etapa a partir de las salidas de la CNN y ajusta su umbral
+
+    PARÁMETROS:
+    - model_path: Ruta al .keras (sólo para guardar su hash en el informe)
+    - inputs: Lote (N, 28, 28, 1) ya preprocesado
+    - cnn_probabilities: Salida de la CNN para esas entradas (N, 10)
+    - labels: Etiquetas (N,) (sólo para el informe de precisión)
+    - tune_fraction: Parte final del lote reservada para ajustar el umbral
+
+    RETORNA: LinearStage con el umbral ajustado y el informe en .report
+    """
+    labels = np.asarray(labels)
+    split = len(labels) - max(int(len(labels) * tune_fraction), 1)
+    features = pooled_features(inputs, pool)
+    weights, bias = distill_weights(features[:split], cnn_probabilities[:split])
+    stage = LinearStage(weights, bias, pool)
+
+    stage_probabilities = stage(inputs[split:])
+    cnn_tune = cnn_probabilities[split:]
+    tune_labels = labels[split:]
+    stage.threshold = tune_threshold(stage_probabilities, cnn_tune, max_disagreement)
+    predicted, hits = cascade_predictions(stage_probabilities, cnn_tune, stage.threshold)
+    cnn_accuracy = float((cnn_tune.argmax(axis=1) == tune_labels).mean())
+    cascade_accuracy = float((predicted == tune_labels).mean())
+    stage.report = {
+        "source_hash": file_digest(model_path),
+        "train_samples": int(split),
+        "tune_samples": int(len(tune_labels)),
+        "stage_accuracy": float((stage_probabilities.argmax(axis=1) == tune_labels).mean()),
+        "top1_agreement": float((stage_probabilities.argmax(axis=1) == cnn_tune.argmax(axis=1)).mean()),
+        "cnn_accuracy": cnn_accuracy,
+        "cascade_accuracy": cascade_accuracy,
+        "accuracy_drop": cnn_accuracy - cascade_accuracy,
+        "hit_rate": float(hits.mean()),
+        "disagreement": float((predicted != cnn_tune.argmax(axis=1)).mean()),
+    }
+    return stage
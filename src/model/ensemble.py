@@ -0,0 +1,296 @@
+"""
+MÓDULO: ensemble.py
+PROPÓSITO: Combina varios modelos (variantes reentrenadas de la CNN) ejecutándolos en
+          paralelo, cada uno con un presupuesto de latencia
+
+FUNCIÓN PRINCIPAL:
+- Cargar N miembros (un Predictor por archivo .keras, o un ProcessPredictor con
+  processes=True) en paralelo sobre un pool de hilos (un hilo por miembro)
+- En cada predicción, lanzar todos los miembros a la vez y esperar a cada uno como
+  mucho hasta su plazo (presupuesto en ms desde el inicio de la llamada)
+- Combinar las probabilidades softmax de los que llegaron a tiempo con una media
+  ponderada (pesos configurables, renormalizados sobre los presentes)
+- Si ningún miembro llega a tiempo, se espera al primero que termine: siempre se
+  devuelve la mejor combinación disponible
+
+PLAZOS (no velocidad):
+- Los hilos del pool sólo solapan las partes del forward pass que liberan el GIL; con
+  modelos tan pequeños como esta CNN el conjunto con hilos tarda lo mismo que ejecutar
+  los miembros en secuencia (bench_ensemble.py). Lo que aporta el pool es que cada
+  miembro tenga su propio plazo: un miembro lento no retrasa la respuesta
+- Un miembro que sigue ocupado con la llamada anterior (rezagado) no recibe trabajo
+  nuevo: se cuenta como "saltado" en lugar de acumular cola
+
+PESOS COMPARTIDOS (sólo backend "numpy"):
+- Con "numpy" los pesos son vistas de solo lectura de un np.memmap de la caché de
+  artefactos (artifact_cache.py): varios miembros (o procesos hijo con processes=True)
+  que mapean el mismo archivo comparten las mismas páginas de memoria
+- Con "int8" (np.load del .npz) y "tensorflow" (set_weights) cada miembro carga su
+  propia copia de los pesos; se avisa al cargar
+
+ESTADÍSTICAS (stats()):
+- Por miembro: llamadas, a tiempo, tarde, saltadas, fallidas, latencia p50/p95 y
+  acuerdo (fracción de sus respuestas a tiempo cuyo top-1 coincide con el del conjunto;
+  las respuestas tardías usadas como último recurso no cuentan)
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeout
+
+import numpy as np
+
+from .predictor import BACKEND_NUMPY, BACKEND_TENSORFLOW, Predictor
+from .process_predictor import ProcessPredictor
+from ..utils.metrics import METRICS, RollingHistogram
+
+
+# Presupuesto de latencia por miembro (ms desde el inicio de la llamada)
+DEFAULT_BUDGET_MS = 50.0
+# Muestras de latencia que guarda cada miembro
+STATS_WINDOW = 1024
+
+
+class MemberStats:
+    """Contadores y latencias de un miembro del conjunto"""
+
+    def __init__(self, name, weight, budget_ms):
+        self.name = name
+        self.weight = weight
+        self.budget_ms = budget_ms
+        self.latency = RollingHistogram(STATS_WINDOW)
+        self.calls = 0
+        self.on_time = 0
+        self.late = 0
+        self.skipped = 0
+        self.failed = 0
+        self.agreements = 0
+
+    def as_dict(self):
+        """RETORNA: Dict con los contadores, la latencia p50/p95 (ms) y el acuerdo"""
+        percentiles = self.latency.percentiles((50, 95))
+        return {
+            "weight": self.weight,
+            "budget_ms": self.budget_ms,
+            "calls": self.calls,
+            "on_time": self.on_time,
+            "late": self.late,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "agreement": self.agreements / self.on_time if self.on_time else None,
+            "p50_ms": percentiles[50] * 1000 if percentiles else None,
+            "p95_ms": percentiles[95] * 1000 if percentiles else None,
+        }
+
+
+class EnsemblePredictor:
+    """
+    Conjunto de modelos con la interfaz de Predictor para el modo en vivo
+
+    ATRIBUTOS:
+    - members: Predictor (o ProcessPredictor) de cada modelo cargado
+    - weights: Peso de cada miembro en la combinación
+    - budgets_ms: Plazo de cada miembro (ms desde el inicio de la llamada)
+    - member_stats: MemberStats de cada miembro
+    - is_loaded / error_message: Hay al menos un miembro cargado / motivo si no
+    - cache: Siempre None (cada miembro se crea sin caché de predicciones)
+    """
+
+    def __init__(self, model_paths, weights=None, budgets_ms=DEFAULT_BUDGET_MS, processes=False,
+                 member_kwargs=None, **predictor_kwargs):
+        """
+        Carga los miembros en paralelo
+
+        PARÁMETROS:
+        - model_paths: Lista de rutas .keras (una por miembro; se puede repetir una ruta
+          con otro backend o preprocesado en member_kwargs)
+        - weights: Peso de cada miembro (por defecto todos iguales)
+        - budgets_ms: Presupuesto de latencia, común o uno por miembro
+        - processes: Si es True, cada miembro corre en su propio proceso (ProcessPredictor)
+        - member_kwargs: Lista opcional de dicts con argumentos propios de cada miembro
+        - predictor_kwargs: Argumentos comunes del Predictor (backend, preprocessing, ...)
+        """
+        count = len(model_paths)
+        weights = [1.0] * count if weights is None else [float(w) for w in weights]
+        budgets = ([float(b) for b in budgets_ms] if np.ndim(budgets_ms)
+                   else [float(budgets_ms)] * count)
+        if len(weights) != count or len(budgets) != count:
+            raise ValueError("weights y budgets_ms necesitan un valor por modelo")
+        member_kwargs = member_kwargs or [{}] * count
+        self.processes = processes
+        self.cache = None
+        self.error_message = None
+
+        print(f"[ENSEMBLE] Cargando {count} modelos en paralelo...")
+        self._pool = ThreadPoolExecutor(max_workers=count, thread_name_prefix="EnsembleMember")
+        predictor_class = ProcessPredictor if processes else Predictor
+        loads = [
+            self._pool.submit(predictor_class, path, **{**predictor_kwargs, "cache_size": 0, **extra})
+            for path, extra in zip(model_paths, member_kwargs)
+        ]
+
+        self.members, self.weights, self.budgets_ms, self.member_stats = [], [], [], []
+        for index, (path, future) in enumerate(zip(model_paths, loads)):
+            member = future.result()
+            backend = member_kwargs[index].get("backend", predictor_kwargs.get("backend", BACKEND_TENSORFLOW))
+            name = f"{index}:{os.path.basename(path)}:{backend}"
+            if not member.is_loaded:
+                print(f"[ENSEMBLE] ⚠ Se descarta {name}: {member.error_message}")
+                continue
+            self.members.append(member)
+            self.weights.append(weights[index])
+            self.budgets_ms.append(budgets[index])
+            self.member_stats.append(MemberStats(name, weights[index], budgets[index]))
+            if backend != BACKEND_NUMPY:
+                print(f"[ENSEMBLE] ⚠ {name}: con el backend {backend!r} el miembro carga su "
+                      f"propia copia de los pesos (sólo \"numpy\" los comparte)")
+        self._running = [None] * len(self.members)  # futuro en curso de cada miembro
+        self._lock = threading.Lock()
+
+        self.is_loaded = bool(self.members)
+        if self.is_loaded:
+            print(f"[ENSEMBLE] ✓ {len(self.members)} de {count} miembros listos")
+        else:
+            self.error_message = "Ningún modelo del conjunto se pudo cargar"
+            print(f"[ENSEMBLE] ✗ {self.error_message}")
+
+    def _call_member(self, index, method, argument):
+        """Se ejecuta en el pool: llama al miembro y registra su latencia"""
+        start = time.perf_counter()
+        _, confidences = getattr(self.members[index], method)(argument)
+        self.member_stats[index].latency.observe(time.perf_counter() - start)
+        return confidences
+
+    def _gather(self, method, argument):
+        """
+        Lanza todos los miembros libres y recoge los que terminan dentro de su plazo
+
+        RETORNA:
+        - results: Lista de (índice del miembro, probabilidades) a combinar
+        - on_time: Índices de los miembros de results que llegaron dentro de su plazo
+          (vacío si results es el último recurso tardío)
+        """
+        futures = {}
+        with self._lock:
+            # _running sólo se lee y se escribe con el lock tomado
+            busy = [future for future in self._running if future is not None and not future.done()]
+            if busy and len(busy) == len(self._running):
+                # Todos siguen con la llamada anterior: esperar a que quede uno libre
+                wait(busy, return_when=FIRST_COMPLETED)
+            start = time.perf_counter()
+            for index, member_stats in enumerate(self.member_stats):
+                running = self._running[index]
+                if running is not None and not running.done():
+                    # Rezagado de la llamada anterior: no se le encola más trabajo
+                    member_stats.skipped += 1
+                    METRICS.inc("ensemble_skipped")
+                    continue
+                member_stats.calls += 1
+                futures[index] = self._running[index] = self._pool.submit(
+                    self._call_member, index, method, argument)
+
+        # Esperar a cada miembro como mucho hasta su plazo (por orden de plazo)
+        results, late = [], {}
+        for index in sorted(futures, key=lambda i: self.budgets_ms[i]):
+            remaining = start + self.budgets_ms[index] / 1000 - time.perf_counter()
+            try:
+                confidences = futures[index].result(timeout=max(remaining, 0.0))
+            except FutureTimeout:
+                self.member_stats[index].late += 1
+                METRICS.inc("ensemble_late")
+                late[futures[index]] = index
+                continue
+            if confidences is None:
+                self.member_stats[index].failed += 1
+                continue
+            self.member_stats[index].on_time += 1
+            results.append((index, confidences))
+        on_time = {index for index, _ in results}
+
+        # Ninguno a tiempo: la mejor combinación disponible es el primero de los tardíos
+        # que termine (incluidos los que ya acabaron después de su plazo)
+        if not results and late:
+            METRICS.inc("ensemble_fallbacks")
+        while not results and late:
+            done, _ = wait(late, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = late.pop(future)
+                confidences = future.result()
+                if confidences is None:
+                    self.member_stats[index].failed += 1
+                else:
+                    results.append((index, confidences))
+        return results, on_time
+
+    def _combine(self, results):
+        """RETORNA: Media de las probabilidades ponderada con los pesos de los presentes"""
+        weights = np.array([self.weights[index] for index, _ in results], dtype=np.float32)
+        stacked = np.stack([np.asarray(confidences, dtype=np.float32) for _, confidences in results])
+        return np.tensordot(weights / weights.sum(), stacked, axes=1)
+
+    def _record_agreement(self, results, on_time, combined):
+        """
+        Cuenta qué miembros a tiempo coinciden en el top-1 con la combinación
+
+        NOTA: Sólo los de on_time, el mismo denominador que MemberStats.as_dict; un
+              miembro tardío usado en solitario siempre coincidiría consigo mismo
+        """
+        expected = combined.argmax(axis=-1)
+        for index, confidences in results:
+            if index in on_time and np.array_equal(np.asarray(confidences).argmax(axis=-1), expected):
+                self.member_stats[index].agreements += 1
+
+    def predict(self, image_array):
+        """
+        Realiza predicción con el conjunto
+
+        PARÁMETRO:
+        - image_array: Array numpy 28x28 con valores 0-255 (fondo blanco, trazo negro)
+
+        RETORNA:
+        - predicted_digit, confidences (como Predictor.predict); (None, None) si ningún
+          miembro pudo responder
+        """
+        if not self.is_loaded:
+            print(f"[ENSEMBLE] ✗ No se puede predecir: {self.error_message}")
+            return None, None
+        results, on_time = self._gather("predict", image_array)
+        if not results:
+            return None, None
+        confidences = self._combine(results)
+        self._record_agreement(results, on_time, confidences)
+        return np.argmax(confidences), confidences
+
+    def predict_number(self, canvas):
+        """
+        Reconoce un número de varios dígitos con el conjunto (como Predictor.predict_number)
+
+        NOTA: Sólo con miembros en este proceso (el ProcessPredictor transporta 28x28)
+        """
+        if not self.is_loaded or self.processes:
+            print("[ENSEMBLE] ✗ predict_number necesita miembros en este proceso")
+            return None, None
+        results, on_time = self._gather("predict_number", canvas)
+        if not results:
+            return None, None
+        # La segmentación es la misma en todos los miembros; por si acaso, sólo se
+        # combinan los que encontraron tantos dígitos como el primero
+        shape = np.shape(results[0][1])
+        results = [(index, confidences) for index, confidences in results
+                   if np.shape(confidences) == shape]
+        confidences = self._combine(results)
+        self._record_agreement(results, on_time, confidences)
+        return "".join(str(digit) for digit in confidences.argmax(axis=1)), confidences
+
+    def stats(self):
+        """RETORNA: Dict nombre del miembro -> estadísticas (MemberStats.as_dict)"""
+        return {member_stats.name: member_stats.as_dict() for member_stats in self.member_stats}
+
+    def close(self):
+        """Detiene el pool y los procesos de los miembros (si los hay)"""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        for member in self.members:
+            if isinstance(member, ProcessPredictor):
+                member.close()
@@ -0,0 +1,169 @@
+"""
+MÓDULO: incremental.py
+PROPÓSITO: Inferencia incremental de la CNN para el modo en vivo (motor NumPy)
+
+IDEA:
+- Entre dos capturas consecutivas del dibujo sólo cambian unos pocos píxeles de 28x28
+- Se guardan las activaciones de la parte convolucional (conv1 / pool1 / conv2 / pool2)
+  de la captura anterior
+- Con la entrada nueva se calcula la caja envolvente de los píxeles que cambiaron y se
+  propaga capa a capa: sólo se recalculan las celdas cuyo campo receptivo toca esa caja
+  * Conv kxk 'valid': la salida (i, j) lee las filas i..i+k-1, así que una caja de
+    entrada [r0, r1) afecta a las salidas [r0-k+1, r1)
+  * MaxPool p: la salida (i, j) lee las filas i*p..i*p+p-1, así que afecta a
+    [r0 // p, ceil(r1 / p))
+- La cabeza densa (Flatten + Dense) se ejecuta entera sobre las activaciones al día
+
+EXACTITUD: Cada celda recalculada usa exactamente las mismas entradas que en un forward
+completo; el resultado coincide con él salvo el redondeo de float32 (el orden de suma de
+BLAS puede variar con la forma del bloque).
+
+CUÁNDO NO AYUDA:
+- Preprocesado "mnist": recorta y recentra el dígito, así que un trazo nuevo mueve toda
+  la imagen y la caja sucia cubre la entrada entera (se hace un forward completo)
+- Si la caja sucia supera full_pass_fraction de la entrada, también se hace completo
+"""
+
+import numpy as np
+
+from .numpy_engine import apply_op, conv2d, max_pool2d
+
+
+# Fracción de la entrada a partir de la cual compensa el forward completo
+DEFAULT_FULL_PASS_FRACTION = 0.5
+# Capas espaciales que se cachean (el resto forma la cabeza)
+SPATIAL_OPS = ("conv", "pool")
+
+
+class IncrementalCNN:
+    """
+    Envuelve un NumpyCNN y reutiliza las activaciones de la captura anterior
+
+    ATRIBUTOS:
+    - model: NumpyCNN envuelto
+    - full_pass_fraction: Umbral de área sucia para hacer un forward completo
+    - frames / full_passes / unchanged: Contadores de llamadas de una sola imagen
+    - conv_macs / conv_macs_full: Multiplicaciones-acumulaciones de las Conv2D hechas
+      realmente y las que habría hecho el forward completo
+    """
+
+    def __init__(self, model, full_pass_fraction=DEFAULT_FULL_PASS_FRACTION):
+        self.model = model
+        self.full_pass_fraction = full_pass_fraction
+        count = 0
+        while count < len(model.ops) and model.ops[count][0] in SPATIAL_OPS:
+            count += 1
+        self.spatial = model.ops[:count]
+        self.head = model.ops[count:]
+        self.reset_stats()
+        self.reset()
+
+    def reset(self):
+        """Olvida la captura anterior (la siguiente llamada hace un forward completo)"""
+        self._input = None
+        self._activations = []
+        self._output = None
+
+    def reset_stats(self):
+        self.frames = 0
+        self.full_passes = 0
+        self.unchanged = 0
+        self.conv_macs = 0
+        self.conv_macs_full = 0
+
+    @property
+    def saved_fraction(self):
+        """RETORNA: Fracción del trabajo de las Conv2D que se ahorró (0-1)"""
+        if not self.conv_macs_full:
+            return 0.0
+        return 1.0 - self.conv_macs / self.conv_macs_full
+
+    def __call__(self, batch):
+        """
+        Forward pass que reutiliza el trabajo de la llamada anterior
+
+        PARÁMETRO:
+        - batch: Array float32 (1, 28, 28, 1); con N > 1 se hace un forward normal
+          sin tocar la caché
+
+        RETORNA: Array float32 (1, 10) con probabilidades softmax
+        """
+        x = np.asarray(batch, dtype=np.float32)
+        if x.shape[0] != 1:
+            return self.model(x)
+
+        self.frames += 1
+        if self._input is None or self._input.shape != x.shape:
+            return self._full_pass(x)
+
+        changed = np.any(x[0] != self._input[0], axis=-1)
+        rows = np.flatnonzero(changed.any(axis=1))
+        if rows.size == 0:
+            self.unchanged += 1
+            self.conv_macs_full += self._full_macs
+            return self._output.copy()
+        cols = np.flatnonzero(changed.any(axis=0))
+        box = (rows[0], rows[-1] + 1, cols[0], cols[-1] + 1)
+        area = (box[1] - box[0]) * (box[3] - box[2])
+        if area > self.full_pass_fraction * changed.size:
+            return self._full_pass(x)
+        return self._partial_pass(x, box)
+
+    def _full_pass(self, x):
+        """Forward completo guardando las activaciones espaciales"""
+        self.full_passes += 1
+        self._input = x.copy()
+        self._activations = []
+        macs = 0
+        for op in self.spatial:
+            if op[0] == "conv":
+                macs += self._conv_macs(op, x.shape[1] - op[1].shape[0] + 1,
+                                        x.shape[2] - op[1].shape[1] + 1)
+            x = apply_op(op, x)
+            self._activations.append(x)
+        self._full_macs = macs
+        self.conv_macs += macs
+        self.conv_macs_full += macs
+        return self._run_head(x)
+
+    def _partial_pass(self, x, box):
+        """Recalcula sólo las celdas afectadas por la caja sucia (r0, r1, c0, c1)"""
+        self._input[...] = x
+        current = self._input
+        r0, r1, c0, c1 = box
+        for op, out in zip(self.spatial, self._activations):
+            height, width = out.shape[1:3]
+            if op[0] == "conv":
+                kh, kw = op[1].shape[:2]
+                r0, r1 = max(r0 - kh + 1, 0), min(r1, height)
+                c0, c1 = max(c0 - kw + 1, 0), min(c1, width)
+                if r0 < r1 and c0 < c1:
+                    patch = current[:, r0:r1 + kh - 1, c0:c1 + kw - 1, :]
+                    out[:, r0:r1, c0:c1, :] = op[3](conv2d(patch, op[1], op[2]))
+                    self.conv_macs += self._conv_macs(op, r1 - r0, c1 - c0)
+            else:
+                pool = op[1]
+                r0, r1 = r0 // pool, min(-(-r1 // pool), height)
+                c0, c1 = c0 // pool, min(-(-c1 // pool), width)
+                if r0 < r1 and c0 < c1:
+                    patch = current[:, r0 * pool:r1 * pool, c0 * pool:c1 * pool, :]
+                    out[:, r0:r1, c0:c1, :] = max_pool2d(patch, pool)
+            if r0 >= r1 or c0 >= c1:
+                # El cambio cae fuera de lo que usa la capa (p. ej. la fila que
+                # descarta el pooling): nada cambia aguas abajo
+                self.conv_macs_full += self._full_macs
+                return self._output.copy()
+            current = out
+        self.conv_macs_full += self._full_macs
+        return self._run_head(current)
+
+    def _run_head(self, x):
+        for op in self.head:
+            x = apply_op(op, x)
+        self._output = x
+        return x.copy()
+
+    @staticmethod
+    def _conv_macs(op, height, width):
+        kh, kw, channels, filters = op[1].shape
+        return height * width * kh * kw * channels * filters
@@ -0,0 +1,182 @@
+"""
+MÓDULO: numpy_engine.py
+PROPÓSITO: Ejecuta la CNN de MNIST con NumPy puro, sin TensorFlow en tiempo de ejecución
+
+FUNCIÓN PRINCIPAL:
+- Leer UNA vez los pesos y la arquitectura del archivo .keras (zip con config.json
+  y model.weights.h5)
+- Ejecutar el forward pass vectorizado:
+  * Conv2D: im2col con sliding_window_view (vista sin copia) + tensordot
+  * MaxPooling2D: reshape (N, H/2, 2, W/2, 2, C) y max sobre los ejes del bloque
+  * Dropout: identidad (modo inferencia)
+  * Dense: producto matricial
+
+NOTA: Importar TensorFlow cuesta segundos de arranque y cientos de MB de RSS;
+      este motor sólo necesita numpy y h5py.
+"""
+
+import io
+import json
+import zipfile
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+# Capas que no hacen nada en inferencia
+PASSTHROUGH_LAYERS = ("InputLayer", "Dropout")
+
+
+def relu(x):
+    """ReLU en el sitio (evita reservar otro array)"""
+    return np.maximum(x, 0, out=x)
+
+
+def softmax(x):
+    """Softmax numéricamente estable sobre el último eje"""
+    x = x - x.max(axis=-1, keepdims=True)
+    np.exp(x, out=x)
+    x /= x.sum(axis=-1, keepdims=True)
+    return x
+
+
+ACTIVATIONS = {
+    "linear": lambda x: x,
+    "relu": relu,
+    "softmax": softmax,
+}
+
+
+def conv2d(x, kernel, bias):
+    """
+    Convolución 2D 'valid' con stride 1 (channels_last)
+
+    PARÁMETROS:
+    - x: Array (N, H, W, C)
+    - kernel: Array (kh, kw, C, F)
+    - bias: Array (F,)
+
+    RETORNA: Array (N, H-kh+1, W-kw+1, F)
+    """
+    kh, kw = kernel.shape[:2]
+    # Vista (N, H', W', C, kh, kw) sin copiar datos
+    windows = sliding_window_view(x, (kh, kw), axis=(1, 2))
+    # Contraer (C, kh, kw) contra el kernel reordenado a (C, kh, kw, F)
+    out = np.tensordot(windows, kernel.transpose(2, 0, 1, 3), axes=3)
+    out += bias
+    return out
+
+
+def max_pool2d(x, pool=2):
+    """
+    MaxPooling 2D 'valid' con stride igual al tamaño del bloque
+
+    NOTA: Las filas/columnas sobrantes se descartan igual que en Keras (padding='valid')
+    """
+    n, h, w, c = x.shape
+    h2, w2 = h // pool, w // pool
+    x = x[:, :h2 * pool, :w2 * pool, :]
+    return x.reshape(n, h2, pool, w2, pool, c).max(axis=(2, 4))
+
+
+def apply_op(op, x):
+    """Aplica una operación de NumpyCNN.ops al tensor x"""
+    kind = op[0]
+    if kind == "conv":
+        return op[3](conv2d(x, op[1], op[2]))
+    if kind == "pool":
+        return max_pool2d(x, op[1])
+    if kind == "flatten":
+        return x.reshape(x.shape[0], -1)
+    return op[3](x @ op[1] + op[2])
+
+
+def read_keras_archive(model_path):
+    """
+    Lee la arquitectura y los pesos de un archivo .keras
+
+    RETORNA:
+    - layers: Lista de dicts {"class_name", "config"} en orden secuencial
+    - weights: Dict nombre_capa -> lista de arrays float32
+    """
+    import h5py
+
+    with zipfile.ZipFile(model_path) as archive:
+        config = json.loads(archive.read("config.json"))
+        weights_blob = archive.read("model.weights.h5")
+
+    layers = [
+        {"class_name": layer["class_name"], "config": layer["config"]}
+        for layer in config["config"]["layers"]
+    ]
+
+    weights = {}
+    with h5py.File(io.BytesIO(weights_blob), "r") as h5:
+        group = h5["layers"]
+        for layer in layers:
+            name = layer["config"]["name"]
+            if name not in group or "vars" not in group[name]:
+                continue
+            variables = group[name]["vars"]
+            weights[name] = [
+                np.asarray(variables[str(i)], dtype=np.float32)
+                for i in range(len(variables))
+            ]
+    return layers, weights
+
+
+class NumpyCNN:
+    """
+    Red secuencial Keras ejecutada con NumPy
+
+    ATRIBUTOS:
+    - ops: Lista de tuplas (tipo, parámetros) ya resueltas para el forward pass
+    """
+
+    def __init__(self, layers, weights):
+        """
+        Construye la lista de operaciones a partir de la arquitectura
+
+        PARÁMETROS:
+        - layers / weights: Salida de read_keras_archive()
+        """
+        self.ops = []
+        for layer in layers:
+            kind = layer["class_name"]
+            config = layer["config"]
+            if kind in PASSTHROUGH_LAYERS:
+                continue
+            if kind == "Conv2D":
+                if tuple(config["strides"]) != (1, 1) or config["padding"] != "valid":
+                    raise ValueError(f"Conv2D no soportada: {config['name']}")
+                kernel, bias = weights[config["name"]]
+                self.ops.append(("conv", kernel, bias, ACTIVATIONS[config["activation"]]))
+            elif kind == "MaxPooling2D":
+                pool = config["pool_size"][0]
+                self.ops.append(("pool", pool))
+            elif kind == "Flatten":
+                self.ops.append(("flatten",))
+            elif kind == "Dense":
+                kernel, bias = weights[config["name"]]
+                self.ops.append(("dense", kernel, bias, ACTIVATIONS[config["activation"]]))
+            else:
+                raise ValueError(f"Capa no soportada por el motor NumPy: {kind}")
+
+    @classmethod
+    def from_keras(cls, model_path):
+        """Crea el motor leyendo directamente el archivo .keras"""
+        return cls(*read_keras_archive(model_path))
+
+    def __call__(self, batch):
+        """
+        Forward pass en modo inferencia
+
+        PARÁMETRO:
+        - batch: Array float32 (N, 28, 28, 1)
+
+        RETORNA: Array float32 (N, 10) con probabilidades softmax
+        """
+        x = np.asarray(batch, dtype=np.float32)
+        for op in self.ops:
+            x = apply_op(op, x)
+        return x
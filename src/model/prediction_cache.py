@@ -0,0 +1,86 @@
+"""
+MÓDULO: prediction_cache.py
+PROPÓSITO: Caché LRU acotada delante de Predictor.predict
+
+FUNCIÓN PRINCIPAL:
+- Usar como clave un hash del contenido del array 28x28 (uint8)
+- Devolver la predicción guardada si el mismo dibujo ya se predijo
+- Expulsar la entrada menos usada recientemente cuando se llena
+- Exponer contadores de aciertos, fallos y expulsiones
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+class PredictionCache:
+    """
+    Caché LRU de predicciones indexada por el contenido de la imagen
+
+    ATRIBUTOS:
+    - max_entries: Número máximo de entradas
+    - hits / misses / evictions: Contadores
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(image_array):
+        """
+        RETORNA: Clave (bytes) derivada del contenido, la forma y el tipo del array
+        """
+        array = np.ascontiguousarray(image_array)
+        digest = hashlib.blake2b(array.data, digest_size=16)
+        digest.update(f"{array.dtype.str}{array.shape}".encode())
+        return digest.digest()
+
+    def get(self, key):
+        """RETORNA: (predicted_digit, confidences) guardado, o None si no está"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, predicted_digit, confidences):
+        """Guarda una predicción (las confianzas se guardan como solo-lectura)"""
+        confidences = np.array(confidences, copy=True)
+        confidences.setflags(write=False)
+        with self._lock:
+            self._entries[key] = (predicted_digit, confidences)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Vacía la caché (los contadores se mantienen)"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """RETORNA: Dict con tamaño y contadores de la caché"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
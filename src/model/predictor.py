@@ -4,10 +4,49 @@ PROPÓSITO: Carga el modelo CNN entrenado y realiza predicciones en las imágene
 
 FUNCIÓN PRINCIPAL:
 - Cargar el modelo guardado (modelo Keras .keras)
-- Preprocesar la imagen (normalización, reshape)
+- Preprocesar la imagen (normalización, reshape y, opcionalmente, el pipeline
+  estilo MNIST de utils/image_processing.py)
 - Hacer predicción con el modelo
 - Extraer las probabilidades usando softmax
 
+RUTA DE INFERENCIA COMPILADA:
+- model.predict() construye un data-adapter/iterador nuevo en CADA llamada, y para
+  una sola imagen de 28x28 ese coste es mucho mayor que el cómputo real de la CNN
+- Por eso el forward pass se traza UNA vez con tf.function para dos formas fijas:
+  (1, 28, 28, 1) para el modo en vivo y (batch_size, 28, 28, 1) para lotes
+  (más (K, 28, 28, 1) si la aumentación en inferencia usa K vistas)
+- Ambas trazas se calientan al cargar el modelo y se reutilizan en cada llamada
+- La latencia en frío (trazado) y en caliente queda en cold_latency_ms / warm_latency_ms
+
+CACHÉ DE ARTEFACTOS (artifact_cache.py):
+- La primera carga de un .keras guarda sus pesos en un blob plano mapeable en memoria
+  más la arquitectura compacta, indexados por el hash del archivo
+- Las siguientes cargas mapean los pesos y se saltan keras.models.load_model
+
+INFERENCIA INCREMENTAL (incremental.py, sólo backend "numpy"):
+- predict() reutiliza las activaciones convolucionales de la captura anterior y sólo
+  recalcula las celdas cuyo campo receptivo toca los píxeles que cambiaron
+
+CASCADA (cascade.py, cualquier backend):
+- Un clasificador lineal destilado de la CNN (src.cli.distill) responde primero; la
+  CNN sólo se ejecuta si su margen top-1 - top-2 no llega al umbral
+
+AUMENTACIÓN EN INFERENCIA (tta.py, cualquier backend):
+- predict() evalúa K variantes desplazadas/giradas/escaladas de la imagen en un único
+  lote (K, 28, 28, 1) y promedia sus probabilidades: una llamada al modelo, no K
+
+NÚMEROS DE VARIOS DÍGITOS (predict_number, utils/segmentation.py):
+- Segmenta el canvas ancho a resolución completa, normaliza cada dígito al formato
+  MNIST y clasifica todos los recortes en un único lote
+
+BACKENDS:
+- "tensorflow": Modelo Keras (por defecto)
+- "numpy": Motor NumPy puro (numpy_engine.py), sin importar TensorFlow
+- "int8": Modelo cuantizado a int8 (quantization.py, generado con src.cli.quantize);
+  se rechaza si su caída de precisión de calibración supera max_accuracy_drop o si se
+  calibró con otro preprocesado. Sólo reduce el tamaño del archivo: no es más rápido
+  ni usa menos memoria que "numpy"
+
 ARQUITECTURA DEL MODELO:
 - Conv2D(32, kernel_size=(3,3), activation='relu', input_shape=(28,28,1))
 - MaxPooling2D(pool_size=(2,2))
@@ -21,42 +60,155 @@ ARQUITECTURA DEL MODELO:
 - Dense(10, activation='softmax')  <- Output para 10 dígitos
 """
 
+import json
 import sys
+import time
 
 import numpy as np
 
+from .artifact_cache import DEFAULT_CACHE_DIR, ArtifactCache, file_digest
+from .cascade import LinearStage, cascade_model_path, top1_margin
+from .incremental import IncrementalCNN
+from .numpy_engine import NumpyCNN
+from .prediction_cache import PredictionCache
+from .quantization import (
+    DEFAULT_MAX_ACCURACY_DROP, QuantizedCNN, quantized_model_path
+)
+from .tta import TestTimeAugmentation
+from ..utils.image_processing import preprocess_image
+from ..utils.segmentation import segment_digits
+from ..utils.metrics import METRICS
+
+
+# Backends de inferencia disponibles
+BACKEND_TENSORFLOW = "tensorflow"
+BACKEND_NUMPY = "numpy"
+BACKEND_INT8 = "int8"
+BACKENDS = (BACKEND_TENSORFLOW, BACKEND_NUMPY, BACKEND_INT8)
+
+# Preprocesado de la imagen del canvas
+PREPROCESSING_BASIC = "basic"
+PREPROCESSING_MNIST = "mnist"
+PREPROCESSINGS = (PREPROCESSING_BASIC, PREPROCESSING_MNIST)
+
+# Forma de entrada de la CNN (alto, ancho, canales)
+INPUT_SHAPE = (28, 28, 1)
+# Tamaño fijo de la segunda traza (lotes)
+DEFAULT_BATCH_SIZE = 32
+# Llamadas usadas para medir la latencia en caliente
+WARMUP_RUNS = 20
+# Entradas de la caché de predicciones
+DEFAULT_CACHE_SIZE = 256
+
 
 class Predictor:
     """
     Clase que gestiona el modelo CNN y realiza predicciones
     
     ATRIBUTOS:
-    - model: El modelo CNN cargado (Keras Sequential)
+    - model: El modelo CNN cargado (Keras Sequential, NumpyCNN o QuantizedCNN)
+    - backend: Motor de inferencia ("tensorflow", "numpy" o "int8")
     - is_loaded: Flag indicando si el modelo está cargado correctamente
+    - compiled: Si se usa la ruta tf.function en lugar de model.predict
+    - cold_latency_ms / warm_latency_ms: Latencias medidas en el calentamiento
+    - cache: PredictionCache delante de predict() (None si está desactivada)
+    - artifact_cache: ArtifactCache con los pesos ya desempaquetados (None si está desactivada)
+    - incremental: IncrementalCNN usada por predict() (None si está desactivada)
+    - cascade: LinearStage de la primera etapa de la cascada (None si está desactivada)
+    - tta: TestTimeAugmentation usada por predict() (None si está desactivada)
     """
     
-    def __init__(self, model_path):
+    def __init__(self, model_path, compiled=True, batch_size=DEFAULT_BATCH_SIZE,
+                 backend=BACKEND_TENSORFLOW, cache_size=DEFAULT_CACHE_SIZE,
+                 preprocessing=PREPROCESSING_BASIC, max_accuracy_drop=DEFAULT_MAX_ACCURACY_DROP,
+                 artifact_cache_dir=DEFAULT_CACHE_DIR, incremental=False, cascade=False,
+                 cascade_threshold=None, tta=1):
         """
         Carga el modelo de Keras desde el archivo .keras
         
-        PARÁMETRO:
+        PARÁMETROS:
         - model_path: Ruta al archivo .keras del modelo (ej: "models/mnist_model.keras")
+        - compiled: Si es True, traza el forward pass con formas fijas (1 y batch_size)
+        - batch_size: Tamaño de la traza para lotes
+        - backend: "tensorflow" (Keras) o "numpy" (motor NumPy, sin importar TensorFlow)
+        - cache_size: Entradas de la caché LRU de predicciones (0 la desactiva)
+        - preprocessing: "basic" (invertir y normalizar) o "mnist" (pipeline de
+          image_processing.py: recorte, escala a 20 px y centrado por centro de masa)
+        - max_accuracy_drop: Caída máxima de precisión de calibración aceptada por el
+          backend "int8" (p. ej. 0.01 = un punto porcentual)
+        - artifact_cache_dir: Carpeta de la caché de artefactos del modelo (pesos mapeables
+          en memoria + arquitectura); None la desactiva y se lee siempre el .keras
+        - incremental: Si es True, predict() reutiliza el trabajo de la captura anterior
+          (sólo backend "numpy"; con otros backends se ignora)
+        - cascade: Si es True, carga <modelo>.cascade.npz y deja que la primera etapa
+          responda las entradas claras (si falta o no corresponde, se avisa y se usa
+          sólo la CNN)
+        - cascade_threshold: Margen mínimo para que responda la primera etapa (por
+          defecto, el ajustado por src.cli.distill)
+        - tta: Vistas de la aumentación en inferencia de predict() (1 la desactiva;
+          desactiva la inferencia incremental, que sólo sirve con una vista)
         """
         self.model_path = model_path
+        self.backend = backend
+        self.preprocessing = preprocessing
+        self.max_accuracy_drop = max_accuracy_drop
         self.model = None
         self.is_loaded = False
         self.error_message = None
+        self.compiled = compiled
+        self.batch_size = batch_size
+        self.cold_latency_ms = None
+        self.warm_latency_ms = None
+        self._tf = None
+        self._traces = {}  # tamaño de lote -> tf.function con forma fija
+        self.cache = PredictionCache(cache_size) if cache_size else None
+        self.artifact_cache = ArtifactCache(artifact_cache_dir) if artifact_cache_dir else None
+        self.incremental = None
+        self.cascade = None
+        self.tta = TestTimeAugmentation(tta) if tta > 1 else None
         
         print(f"[PREDICTOR] Inicializando predictor...")
         print(f"[PREDICTOR] Ruta del modelo: {model_path}")
+        print(f"[PREDICTOR] Backend: {backend}")
+        
+        if backend == BACKEND_NUMPY:
+            self._load_numpy()
+        elif backend == BACKEND_INT8:
+            self._load_int8()
+        elif backend == BACKEND_TENSORFLOW:
+            self._load_tensorflow()
+        else:
+            self.error_message = f"Backend desconocido: {backend}"
+            print(f"[PREDICTOR] ✗ {self.error_message}")
+        
+        if incremental and self.is_loaded:
+            if self.tta is not None:
+                print("[PREDICTOR] ⚠ La inferencia incremental no se combina con TTA; se ignora")
+            elif backend == BACKEND_NUMPY:
+                self.incremental = IncrementalCNN(self.model)
+                print("[PREDICTOR] ✓ Inferencia incremental activada")
+            else:
+                print(f"[PREDICTOR] ⚠ La inferencia incremental sólo existe para el backend "
+                      f"numpy; se ignora con {backend}")
+        
+        if cascade and self.is_loaded:
+            self._load_cascade(cascade_threshold)
+        
+        if self.tta is not None and self.is_loaded:
+            print(f"[PREDICTOR] ✓ Aumentación en inferencia activada ({self.tta.views} vistas)")
+    
+    def _load_tensorflow(self):
+        """Importa TensorFlow, carga el modelo Keras y (opcionalmente) lo compila"""
+        model_path = self.model_path
         
         # Importar Keras
         try:
-            import sys
             print("PYTHON EJECUTANDO:", sys.executable)
             print("VERSION:", sys.version)
             print("[PREDICTOR] Importando TensorFlow/Keras...")
+            import tensorflow as tf
             from tensorflow import keras
+            self._tf = tf
             print("[PREDICTOR] ✓ TensorFlow importado correctamente")
         except ImportError as e:
             self.error_message = f"Error al importar TensorFlow: {e}"
@@ -66,7 +218,16 @@ class Predictor:
         # Cargar el modelo
         try:
             print(f"[PREDICTOR] Cargando modelo desde: {model_path}")
-            self.model = keras.models.load_model(model_path)
+            if self.artifact_cache is None:
+                self.model = keras.models.load_model(model_path)
+            else:
+                # Reconstruir desde la arquitectura compacta y asignar los pesos mapeados
+                # (evita descomprimir el .keras, leer el HDF5 y restaurar el optimizador)
+                artifact = self.artifact_cache.load(model_path)
+                self.model = keras.models.model_from_json(json.dumps(artifact.keras_config))
+                self.model.set_weights(artifact.weight_list())
+                if artifact.from_cache:
+                    print("[PREDICTOR] ✓ Pesos leídos de la caché de artefactos")
             self.is_loaded = True
             print("[PREDICTOR] ✓ Modelo cargado exitosamente")
         except FileNotFoundError:
@@ -77,6 +238,222 @@ class Predictor:
             self.error_message = f"Error al cargar el modelo: {str(e)[:150]}"
             print(f"[PREDICTOR] ✗ {self.error_message}")
             self.is_loaded = False
+        
+        if self.is_loaded and self.compiled:
+            self._compile()
+    
+    def _load_numpy(self):
+        """Lee los pesos del archivo .keras y crea el motor NumPy (sin TensorFlow)"""
+        try:
+            print(f"[PREDICTOR] Leyendo pesos desde: {self.model_path}")
+            if self.artifact_cache is None:
+                self.model = NumpyCNN.from_keras(self.model_path)
+            else:
+                artifact = self.artifact_cache.load(self.model_path)
+                self.model = NumpyCNN(artifact.layers, artifact.weights)
+                if artifact.from_cache:
+                    print("[PREDICTOR] ✓ Pesos mapeados desde la caché de artefactos")
+            self.is_loaded = True
+            # El motor NumPy no necesita trazado
+            self.compiled = False
+            print("[PREDICTOR] ✓ Motor NumPy listo")
+        except FileNotFoundError:
+            self.error_message = f"Archivo no encontrado: {self.model_path}"
+            print(f"[PREDICTOR] ✗ {self.error_message}")
+        except Exception as e:
+            self.error_message = f"Error al cargar el modelo: {str(e)[:150]}"
+            print(f"[PREDICTOR] ✗ {self.error_message}")
+    
+    def _load_int8(self):
+        """Lee el modelo int8 generado por src.cli.quantize y valida su calibración"""
+        path = quantized_model_path(self.model_path)
+        try:
+            print(f"[PREDICTOR] Leyendo modelo int8 desde: {path}")
+            model = QuantizedCNN.load(path)
+        except FileNotFoundError:
+            self.error_message = (f"Modelo int8 no encontrado: {path} "
+                                  f"(genéralo con: python -m src.cli.quantize)")
+            print(f"[PREDICTOR] ✗ {self.error_message}")
+            return
+        except Exception as e:
+            self.error_message = f"Error al cargar el modelo int8: {str(e)[:150]}"
+            print(f"[PREDICTOR] ✗ {self.error_message}")
+            return
+        
+        report = model.report
+        if report.get("source_hash") != file_digest(self.model_path):
+            self.error_message = f"El modelo int8 no corresponde a {self.model_path}; vuelve a cuantizar"
+        elif report.get("preprocessing", self.preprocessing) != self.preprocessing:
+            self.error_message = (f"El modelo int8 se calibró con el preprocesado "
+                                  f"{report['preprocessing']!r}, no {self.preprocessing!r}; "
+                                  f"vuelve a cuantizar con --preprocessing {self.preprocessing}")
+        elif report.get("accuracy_drop", float("inf")) > self.max_accuracy_drop:
+            self.error_message = (f"El modelo int8 pierde {report.get('accuracy_drop', float('nan')):.2%} "
+                                  f"de precisión (máximo {self.max_accuracy_drop:.2%})")
+        if self.error_message:
+            print(f"[PREDICTOR] ✗ {self.error_message}")
+            return
+        
+        self.model = model
+        self.is_loaded = True
+        self.compiled = False
+        print(f"[PREDICTOR] ✓ Modelo int8 listo (precisión de calibración "
+              f"{report['int8_accuracy']:.2%}, float32 {report['float_accuracy']:.2%})")
+    
+    def _load_cascade(self, threshold):
+        """Lee la primera etapa generada por src.cli.distill y comprueba que corresponde"""
+        path = cascade_model_path(self.model_path)
+        try:
+            stage = LinearStage.load(path)
+        except FileNotFoundError:
+            print(f"[PREDICTOR] ⚠ Primera etapa no encontrada: {path} "
+                  f"(genérala con: python -m src.cli.distill); se usa sólo la CNN")
+            return
+        except Exception as e:
+            print(f"[PREDICTOR] ⚠ Error al cargar la primera etapa: {str(e)[:150]}; se usa sólo la CNN")
+            return
+        
+        report = stage.report
+        if report.get("source_hash") != file_digest(self.model_path):
+            print(f"[PREDICTOR] ⚠ La primera etapa no corresponde a {self.model_path} "
+                  f"(vuelve a destilar); se usa sólo la CNN")
+            return
+        if report.get("preprocessing", self.preprocessing) != self.preprocessing:
+            print(f"[PREDICTOR] ⚠ La primera etapa se destiló con el preprocesado "
+                  f"{report['preprocessing']!r}; se usa sólo la CNN")
+            return
+        if threshold is not None:
+            stage.threshold = threshold
+        self.cascade = stage
+        print(f"[PREDICTOR] ✓ Cascada activada (umbral de margen {stage.threshold:.2f})")
+    
+    def _run_cascade(self, batch, run):
+        """
+        Primera etapa sobre todo el lote; `run` (la CNN) sólo sobre las entradas dudosas
+        
+        RETORNA: Array (N, 10) con las probabilidades de la etapa que respondió
+        """
+        probabilities = self.cascade(batch)
+        fallback = top1_margin(probabilities) < self.cascade.threshold
+        misses = int(np.count_nonzero(fallback))
+        if misses:
+            probabilities[fallback] = run(batch[fallback])
+        METRICS.inc("cascade_hits", len(probabilities) - misses)
+        METRICS.inc("cascade_fallbacks", misses)
+        return probabilities
+    
+    def _forward(self, batch):
+        """Forward pass en modo inferencia (Dropout desactivado)"""
+        return self.model(batch, training=False)
+    
+    def _trace(self, size):
+        """
+        RETORNA: tf.function del forward pass para la forma fija (size, 28, 28, 1)
+        
+        NOTA: Cada tamaño se traza una sola vez y se guarda en self._traces
+        """
+        trace = self._traces.get(size)
+        if trace is None:
+            tf = self._tf
+            trace = tf.function(
+                self._forward,
+                input_signature=[tf.TensorSpec((size,) + INPUT_SHAPE, tf.float32)],
+            )
+            self._traces[size] = trace
+        return trace
+    
+    def _compile(self):
+        """
+        Traza el forward pass para las formas fijas y lo calienta
+        
+        NOTAS:
+        - La primera llamada a cada traza incluye el trazado del grafo (latencia en frío)
+        - Las siguientes llamadas reutilizan el grafo (latencia en caliente)
+        """
+        try:
+            single = np.zeros((1,) + INPUT_SHAPE, dtype=np.float32)
+            batch = np.zeros((self.batch_size,) + INPUT_SHAPE, dtype=np.float32)
+            
+            start = time.perf_counter()
+            self._trace(1)(single).numpy()
+            self.cold_latency_ms = (time.perf_counter() - start) * 1000
+            self._trace(self.batch_size)(batch).numpy()
+            if self.tta is not None:
+                views = np.zeros((self.tta.views,) + INPUT_SHAPE, dtype=np.float32)
+                self._trace(self.tta.views)(views).numpy()
+            
+            timings = []
+            for _ in range(WARMUP_RUNS):
+                start = time.perf_counter()
+                self._trace(1)(single).numpy()
+                timings.append(time.perf_counter() - start)
+            self.warm_latency_ms = float(np.median(timings)) * 1000
+            
+            print(f"[PREDICTOR] ✓ Inferencia compilada: frío {self.cold_latency_ms:.1f} ms, "
+                  f"caliente {self.warm_latency_ms:.2f} ms")
+        except Exception as e:
+            print(f"[PREDICTOR] ✗ No se pudo compilar, se usará model.predict: {e}")
+            self.compiled = False
+            self._traces = {}
+    
+    def run_model(self, batch, batch_size=None):
+        """
+        Ejecuta la CNN sobre un lote ya preprocesado
+        
+        PARÁMETROS:
+        - batch: Array float32 con forma (N, 28, 28, 1)
+        - batch_size: Tamaño de la traza para lotes (por defecto self.batch_size)
+        
+        RETORNA:
+        - Array (N, 10) con las probabilidades softmax
+        """
+        if self.backend in (BACKEND_NUMPY, BACKEND_INT8):
+            return self.model(batch)
+        
+        if not self.compiled:
+            return self.model.predict(batch, verbose=0)
+        
+        n = batch.shape[0]
+        if n == 1 or (self.tta is not None and n == self.tta.views):
+            return self._trace(n)(batch).numpy()
+        
+        # Trocear en bloques de batch_size; el último se rellena con ceros
+        # para reutilizar siempre la misma traza
+        batch_size = batch_size or self.batch_size
+        trace = self._trace(batch_size)
+        output = np.empty((n, 10), dtype=np.float32)
+        for start in range(0, n, batch_size):
+            chunk = batch[start:start + batch_size]
+            size = chunk.shape[0]
+            if size < batch_size:
+                padded = np.zeros((batch_size,) + INPUT_SHAPE, dtype=np.float32)
+                padded[:size] = chunk
+                chunk = padded
+            output[start:start + size] = trace(chunk).numpy()[:size]
+        return output
+    
+    def prepare_batch(self, images, invert=True):
+        """
+        Convierte imágenes del canvas en la entrada del modelo
+        
+        PARÁMETROS:
+        - images: Array (28, 28) o (N, 28, 28) con valores 0-255 (fondo blanco, trazo negro)
+        - invert: False si las imágenes ya tienen fondo negro (p. ej. el dataset MNIST)
+        
+        RETORNA: Array float32 (N, 28, 28, 1) con fondo negro y trazo en [0, 1]
+        
+        NOTAS:
+        - "basic": sólo invierte y normaliza (blanco=fondo -> negro=fondo)
+        - "mnist": recorte, escala a 20 px y centrado por centro de masa
+        """
+        if self.preprocessing == PREPROCESSING_MNIST:
+            batch = preprocess_image(images, invert=invert)
+        elif invert:
+            # Convertir de blanco=fondo a negro=fondo (invertir)
+            batch = (255.0 - np.asarray(images, dtype=np.float32)) / 255.0
+        else:
+            batch = np.asarray(images, dtype=np.float32) / 255.0
+        return batch.reshape((-1,) + INPUT_SHAPE).astype(np.float32, copy=False)
     
     def predict(self, image_array):
         """
@@ -96,16 +473,36 @@ class Predictor:
                 print("[PREDICTOR] ✗ Modelo no está cargado")
             return None, None
         
+        # Consultar la caché: el mismo dibujo no vuelve a pasar por la CNN
+        key = None
+        if self.cache is not None:
+            start = time.perf_counter()
+            key = self.cache.make_key(image_array)
+            cached = self.cache.get(key)
+            METRICS.observe("cache_lookup", time.perf_counter() - start)
+            if cached is not None:
+                METRICS.inc("cache_hits")
+                return cached
+            METRICS.inc("cache_misses")
+        
         try:
-            # Preprocesar: normalizar y agregar dimensiones
-            # Convertir de blanco=fondo a negro=fondo (invertir)
-            image = (255 - image_array) / 255.0
+            # Preprocesar y dar forma para el modelo: (1, 28, 28, 1)
+            start = time.perf_counter()
+            image = self.prepare_batch(image_array)
+            if self.tta is not None:
+                image = self.tta(image)  # (K, 28, 28, 1)
+            prepared = time.perf_counter()
             
-            # Reshape para el modelo: (1, 28, 28, 1)
-            image = image.reshape(1, 28, 28, 1).astype('float32')
-            
-            # Realizar predicción
-            predictions = self.model.predict(image, verbose=0)
+            # Realizar predicción (incremental: sólo lo que cambió desde la anterior)
+            run = self.incremental if self.incremental is not None else self.run_model
+            if self.cascade is not None:
+                predictions = self._run_cascade(image, run)
+            else:
+                predictions = run(image)
+            if self.tta is not None:
+                predictions = self.tta.average(predictions)
+            METRICS.observe("preprocessing", prepared - start)
+            METRICS.observe("inference", time.perf_counter() - prepared)
             
             # Obtener las probabilidades (ya vienen con softmax)
             confidences = predictions[0]
@@ -113,9 +510,117 @@ class Predictor:
             # Obtener el dígito predicho
             predicted_digit = np.argmax(confidences)
             
+            if key is not None:
+                self.cache.put(key, predicted_digit, confidences)
             
             return predicted_digit, confidences
             
         except Exception as e:
             print(f"[PREDICTOR] ✗ Error al predecir: {e}")
             return None, None
+    
+    def predict_number(self, canvas, invert=True):
+        """
+        Reconoce un número de varios dígitos escrito en el canvas
+        
+        PARÁMETROS:
+        - canvas: Array (H, W) uint8 a resolución completa (DrawingCanvas.get_full_array())
+        - invert: False si el canvas ya tiene fondo negro
+        
+        RETORNA:
+        - number: Texto con los dígitos de izquierda a derecha ("" si no hay tinta)
+        - confidences: Array (N, 10) con las probabilidades de cada dígito
+        
+        NOTA: Los recortes ya salen normalizados estilo MNIST, así que no pasan por
+              prepare_batch; la cascada (si está activa) se aplica igual que en predict_batch
+        """
+        if not self.is_loaded:
+            print(f"[PREDICTOR] ✗ No se puede predecir: {self.error_message or 'modelo no cargado'}")
+            return None, None
+        
+        try:
+            start = time.perf_counter()
+            digits, _ = segment_digits(canvas, invert=invert)
+            segmented = time.perf_counter()
+            batch = digits.reshape((-1,) + INPUT_SHAPE)
+            if batch.shape[0] == 0:
+                confidences = np.empty((0, 10), dtype=np.float32)
+            elif self.cascade is not None:
+                confidences = self._run_cascade(
+                    batch, lambda misses: self._run_cnn_chunk(misses, self.batch_size))
+            else:
+                confidences = self._run_cnn_chunk(batch, self.batch_size)
+            METRICS.observe("segmentation", segmented - start)
+            METRICS.observe("inference", time.perf_counter() - segmented)
+            
+            number = "".join(str(digit) for digit in confidences.argmax(axis=1))
+            return number, confidences
+        
+        except Exception as e:
+            print(f"[PREDICTOR] ✗ Error al reconocer el número: {e}")
+            return None, None
+    
+    def predict_batch(self, images, batch_size=None, total=None, invert=True):
+        """
+        Realiza predicciones sobre muchas imágenes, por bloques
+        
+        PARÁMETROS:
+        - images: Array (N, 28, 28) uint8/float con valores 0-255 (fondo blanco, trazo
+          negro), o un iterador de bloques con esa forma
+        - batch_size: Imágenes por llamada al modelo (por defecto self.batch_size)
+        - total: Número total de imágenes si `images` es un iterador (permite reservar
+          la salida de antemano)
+        - invert: False si las imágenes ya tienen fondo negro (p. ej. el dataset MNIST)
+        
+        RETORNA:
+        - labels: Array (N,) con el dígito predicho de cada imagen
+        - probabilities: Array (N, 10) float32 con las probabilidades softmax
+        """
+        if not self.is_loaded:
+            print(f"[PREDICTOR] ✗ No se puede predecir: {self.error_message or 'modelo no cargado'}")
+            return None, None
+        
+        batch_size = batch_size or self.batch_size
+        if isinstance(images, np.ndarray):
+            total = images.shape[0]
+            chunks = (images[start:start + batch_size] for start in range(0, total, batch_size))
+        else:
+            chunks = iter(images)
+        
+        try:
+            if total is not None:
+                # Salida reservada de antemano: cada bloque se escribe en su sitio
+                probabilities = np.empty((total, 10), dtype=np.float32)
+                filled = 0
+                for chunk in chunks:
+                    size = len(chunk)
+                    probabilities[filled:filled + size] = self._run_chunk(chunk, batch_size, invert)
+                    filled += size
+                probabilities = probabilities[:filled]
+            else:
+                parts = [self._run_chunk(chunk, batch_size, invert) for chunk in chunks]
+                probabilities = (np.concatenate(parts) if parts
+                                 else np.empty((0, 10), dtype=np.float32))
+            
+            labels = probabilities.argmax(axis=1)
+            return labels, probabilities
+        
+        except Exception as e:
+            print(f"[PREDICTOR] ✗ Error al predecir el lote: {e}")
+            return None, None
+    
+    def _run_chunk(self, chunk, batch_size, invert=True):
+        """Preprocesa un bloque y lo pasa por el modelo en lotes de batch_size"""
+        batch = self.prepare_batch(chunk, invert)
+        if self.cascade is not None:
+            return self._run_cascade(batch, lambda misses: self._run_cnn_chunk(misses, batch_size))
+        return self._run_cnn_chunk(batch, batch_size)
+    
+    def _run_cnn_chunk(self, batch, batch_size):
+        """Ejecuta la CNN sobre un lote ya preprocesado, en bloques de batch_size"""
+        if self.backend == BACKEND_NUMPY:
+            output = np.empty((batch.shape[0], 10), dtype=np.float32)
+            for start in range(0, batch.shape[0], batch_size):
+                output[start:start + batch_size] = self.model(batch[start:start + batch_size])
+            return output
+        return self.run_model(batch, batch_size)
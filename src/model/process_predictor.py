@@ -0,0 +1,220 @@
+"""
+MÓDULO: process_predictor.py
+PROPÓSITO: Ejecuta el Predictor en un PROCESO HIJO, separado del bucle de eventos de PyQt6
+
+MOTIVACIÓN:
+- TensorFlow y sus pools de hilos compiten con el renderizado de la interfaz (GIL)
+- Si TensorFlow se cae, con esto sólo se cae el proceso hijo, no la ventana
+
+FUNCIÓN PRINCIPAL:
+- Las imágenes 28x28 viajan por un anillo de ranuras en multiprocessing.shared_memory
+  (no se serializa ningún array con pickle)
+- Por la tubería (Pipe) sólo viajan mensajes de control pequeños: (seq, ranura) hacia el
+  hijo y (seq, dígito, 10 confianzas como bytes) de vuelta
+- Si el hijo muere, deja de responder o la tubería se rompe, se reinicia automáticamente
+- Si el hijo NO consigue cargar el modelo (o no responde al arrancar), el fallo es
+  permanente: is_loaded queda en False con su error_message y no se vuelve a lanzar,
+  para no bloquear cada predicción hasta startup_timeout reintentando la carga
+
+USO: ProcessPredictor tiene la misma interfaz que Predictor para el modo en vivo
+     (predict, is_loaded, error_message) y se cierra con close().
+"""
+
+import multiprocessing as mp
+import threading
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+IMAGE_SHAPE = (28, 28)
+IMAGE_BYTES = IMAGE_SHAPE[0] * IMAGE_SHAPE[1]
+DEFAULT_SLOTS = 8
+# Segundos máximos de espera por una predicción / por el arranque del hijo
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_STARTUP_TIMEOUT = 120.0
+
+
+def _child_main(conn, shm_name, slots, model_path, predictor_kwargs):
+    """
+    Bucle del proceso hijo: carga el Predictor y atiende peticiones hasta recibir "stop"
+
+    MENSAJES:
+    - Recibe ("predict", seq, slot) | ("stop",)
+    - Envía ("ready", is_loaded, error_message) al arrancar y
+      ("result", seq, digit, confidences_bytes) por cada predicción
+    """
+    from .predictor import Predictor
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    ring = np.ndarray((slots,) + IMAGE_SHAPE, dtype=np.uint8, buffer=shm.buf)
+    try:
+        predictor = Predictor(model_path, **predictor_kwargs)
+        conn.send(("ready", predictor.is_loaded, predictor.error_message))
+        if not predictor.is_loaded:
+            return
+
+        while True:
+            message = conn.recv()
+            if message[0] == "stop":
+                break
+            _, seq, slot = message
+            digit, confidences = predictor.predict(ring[slot])
+            if confidences is None:
+                conn.send(("result", seq, None, None))
+            else:
+                payload = np.asarray(confidences, dtype=np.float32).tobytes()
+                conn.send(("result", seq, int(digit), payload))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        del ring
+        shm.close()
+
+
+class ProcessPredictor:
+    """
+    Predictor que delega la inferencia en un proceso hijo
+
+    ATRIBUTOS:
+    - is_loaded / error_message: Estado del modelo en el hijo (False es definitivo)
+    - restarts: Número de reinicios automáticos del hijo
+    - cache: Siempre None (la caché, si la hay, vive en el hijo)
+    """
+
+    def __init__(self, model_path, slots=DEFAULT_SLOTS, timeout=DEFAULT_TIMEOUT,
+                 startup_timeout=DEFAULT_STARTUP_TIMEOUT, **predictor_kwargs):
+        """
+        PARÁMETROS:
+        - model_path: Ruta al modelo .keras
+        - slots: Ranuras del anillo de memoria compartida
+        - timeout: Segundos máximos por predicción antes de reiniciar el hijo
+        - predictor_kwargs: Argumentos del Predictor del hijo (backend, preprocessing, ...)
+        """
+        self.model_path = model_path
+        self.slots = slots
+        self.timeout = timeout
+        self.startup_timeout = startup_timeout
+        self.predictor_kwargs = predictor_kwargs
+        self.is_loaded = False
+        self.error_message = None
+        self.restarts = 0
+        self.cache = None
+
+        # spawn: el hijo no hereda los hilos de Qt/TensorFlow del padre (y funciona en Windows)
+        self._context = mp.get_context("spawn")
+        self._shm = shared_memory.SharedMemory(create=True, size=slots * IMAGE_BYTES)
+        self._ring = np.ndarray((slots,) + IMAGE_SHAPE, dtype=np.uint8, buffer=self._shm.buf)
+        self._next_slot = 0
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._process = None
+        self._conn = None
+
+        print(f"[PREDICTOR] Iniciando proceso de inferencia ({slots} ranuras compartidas)...")
+        self._start_child()
+
+    def _start_child(self):
+        """Lanza el proceso hijo y espera su mensaje "ready" """
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_child_main,
+            args=(child_conn, self._shm.name, self.slots, self.model_path, self.predictor_kwargs),
+            name="InferenceProcess",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        self._process, self._conn = process, parent_conn
+
+        if not parent_conn.poll(self.startup_timeout):
+            self.error_message = "El proceso de inferencia no respondió al arrancar"
+            self.is_loaded = False
+            self._kill_child()
+            print(f"[PREDICTOR] ✗ {self.error_message}")
+            return
+        try:
+            _, loaded, error = parent_conn.recv()
+        except EOFError:
+            loaded, error = False, "El proceso de inferencia terminó al arrancar"
+        self.is_loaded, self.error_message = loaded, error
+        if loaded:
+            print(f"[PREDICTOR] ✓ Proceso de inferencia listo (pid {process.pid})")
+        else:
+            # El hijo termina solo tras informar; fallo permanente (predict no reinicia)
+            self._kill_child()
+            print(f"[PREDICTOR] ✗ Proceso de inferencia sin modelo: {error}")
+
+    def _kill_child(self):
+        if self._process is not None and self._process.is_alive():
+            self._process.kill()
+        if self._process is not None:
+            self._process.join(timeout=5)
+        if self._conn is not None:
+            self._conn.close()
+        self._process, self._conn = None, None
+
+    def _restart(self, reason):
+        """Reinicia el hijo tras un fallo"""
+        self.restarts += 1
+        print(f"[PREDICTOR] ⚠ Reiniciando el proceso de inferencia ({reason})")
+        self._kill_child()
+        self._start_child()
+
+    def predict(self, image_array):
+        """
+        Realiza predicción sobre una imagen en el proceso hijo
+
+        PARÁMETRO:
+        - image_array: Array numpy 28x28 uint8 (fondo blanco, trazo negro)
+
+        RETORNA:
+        - predicted_digit, confidences (como Predictor.predict); (None, None) si falla
+        """
+        with self._lock:
+            if not self.is_loaded:
+                # La carga falló al arrancar: reintentarla no la arreglaría
+                return None, None
+            if self._process is None or not self._process.is_alive():
+                # Caída tras una carga correcta: se reinicia
+                self._restart("el proceso no está vivo")
+                if not self.is_loaded:
+                    return None, None
+
+            slot = self._next_slot
+            self._next_slot = (slot + 1) % self.slots
+            self._seq += 1
+            seq = self._seq
+            self._ring[slot] = image_array
+
+            try:
+                self._conn.send(("predict", seq, slot))
+                # Se descartan respuestas atrasadas de peticiones anteriores
+                while True:
+                    if not self._conn.poll(self.timeout):
+                        raise TimeoutError("sin respuesta")
+                    _, reply_seq, digit, payload = self._conn.recv()
+                    if reply_seq == seq:
+                        break
+            except (EOFError, OSError, TimeoutError) as e:
+                self._restart(str(e) or type(e).__name__)
+                return None, None
+
+            if payload is None:
+                return None, None
+            return np.intp(digit), np.frombuffer(payload, dtype=np.float32)
+
+    def close(self):
+        """Detiene el hijo y libera la memoria compartida"""
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    self._conn.send(("stop",))
+                except (OSError, EOFError):
+                    pass
+            if self._process is not None:
+                self._process.join(timeout=5)
+            self._kill_child()
+            del self._ring
+            self._shm.close()
+            self._shm.unlink()
@@ -0,0 +1,241 @@
+"""
+MÓDULO: quantization.py
+PROPÓSITO: Cuantización int8 post-entrenamiento de la CNN y su motor de inferencia NumPy
+
+ESQUEMA:
+- Pesos: int8 simétricos POR CANAL de salida (una escala float32 por filtro / neurona)
+- Activaciones: uint8 por tensor con punto cero 0 (la entrada está en [0, 1] y el resto
+  de entradas de capa salen de ReLU o MaxPooling, así que nunca son negativas)
+- Las escalas de activación se calibran con entradas de ejemplo ya preprocesadas
+  (máximo observado a la entrada de cada Conv2D / Dense)
+
+EJECUCIÓN (cuantización simulada):
+- Los kernels int8 se convierten a float32 UNA vez al cargar (los valores siguen
+  siendo enteros en [-127, 127]); en NumPy un producto matricial entero
+  (uint8 x int8 -> int32) no usa BLAS y es 30-60 veces más lento que el float32
+- Cada Conv2D / Dense cuantiza su entrada a enteros [0, 255], multiplica con BLAS y
+  reescala el acumulado:
+      salida = (acumulado + bias / escala) * (escala_entrada * escala_peso)
+- Los acumulados de las convoluciones son exactos en float32 (< 2**24); en la Dense de
+  1600 entradas el redondeo relativo es del orden de 1e-7, despreciable frente al de
+  la cuantización, así que el resultado es el de la aritmética entera
+
+ÚNICA VENTAJA: TAMAÑO DEL ARCHIVO (~12x menor que el .keras). No es un backend de
+velocidad ni de memoria: en ejecución los pesos ocupan lo mismo que en float32 y cada
+capa añade la cuantización de su entrada, así que es algo más lento que el motor NumPy
+float32. Sirve para distribuir un modelo más ligero y medir el efecto de la
+cuantización en la precisión.
+
+ARCHIVO .int8.npz:
+- "spec": JSON con la lista de operaciones y el informe de calibración (incluido el
+  preprocesado de las entradas de calibración; el Predictor rechaza el modelo si el
+  suyo es distinto)
+- "opN_kernel" (int8), "opN_scale" y "opN_bias" (float32) por cada capa con pesos
+"""
+
+import json
+
+import numpy as np
+
+from .artifact_cache import file_digest
+from .numpy_engine import ACTIVATIONS, NumpyCNN, apply_op, conv2d
+
+
+INT8_MAX = 127
+UINT8_MAX = 255
+QUANTIZED_SUFFIX = ".int8.npz"
+# Caída máxima de precisión de calibración (float32 - int8) aceptada al cargar
+DEFAULT_MAX_ACCURACY_DROP = 0.01
+
+
+def quantized_model_path(model_path):
+    """RETORNA: Ruta del modelo int8 junto al .keras (modelo.keras -> modelo.int8.npz)"""
+    base = model_path[:-len(".keras")] if model_path.endswith(".keras") else model_path
+    return base + QUANTIZED_SUFFIX
+
+
+def quantize_weights(kernel):
+    """
+    Cuantiza un kernel a int8 simétrico por canal de salida (último eje)
+
+    RETORNA: (kernel_int8, escalas float32 con forma (canales,))
+    """
+    kernel = np.asarray(kernel, dtype=np.float32)
+    max_abs = np.abs(kernel.reshape(-1, kernel.shape[-1])).max(axis=0)
+    scales = np.maximum(max_abs, 1e-12) / INT8_MAX
+    quantized = np.clip(np.rint(kernel / scales), -INT8_MAX, INT8_MAX).astype(np.int8)
+    return quantized, scales.astype(np.float32)
+
+
+def quantize_activations(x, scale):
+    """RETORNA: x cuantizado a enteros [0, 255] (en float32, listo para BLAS)"""
+    q = x * np.float32(1.0 / scale)
+    np.rint(q, out=q)
+    return np.clip(q, 0, UINT8_MAX, out=q)
+
+
+def calibrate(model, inputs):
+    """
+    Recorre la red float32 y mide el rango de la entrada de cada capa con pesos
+
+    PARÁMETROS:
+    - model: NumpyCNN en float32
+    - inputs: Lote (N, 28, 28, 1) ya preprocesado
+
+    RETORNA: Lista (una por op) con la escala de activación, None en las ops sin pesos
+    """
+    scales = []
+    x = np.asarray(inputs, dtype=np.float32)
+    for op in model.ops:
+        if op[0] in ("conv", "dense"):
+            scales.append(max(float(x.max()), 1e-6) / UINT8_MAX)
+        else:
+            scales.append(None)
+        x = apply_op(op, x)
+    return scales
+
+
+def _activation_name(function):
+    return next(name for name, fn in ACTIVATIONS.items() if fn is function)
+
+
+class QuantizedCNN:
+    """
+    Red secuencial con pesos int8 por canal y activaciones uint8
+
+    ATRIBUTOS:
+    - spec: Lista de dicts que describe cada operación (serializable en JSON)
+    - ops: Operaciones resueltas para el forward pass
+    - report: Informe de calibración (precisiones, muestras, hash del modelo de origen)
+    """
+
+    def __init__(self, spec, arrays, report=None):
+        """
+        PARÁMETROS:
+        - spec: Lista de dicts {"kind", ...} por operación
+        - arrays: Dict "opN_kernel" / "opN_scale" / "opN_bias" -> array
+        - report: Dict con el informe de calibración (opcional)
+        """
+        self.spec = spec
+        self.arrays = arrays
+        self.report = report or {}
+        self.ops = []
+        for i, entry in enumerate(spec):
+            kind = entry["kind"]
+            if kind in ("conv", "dense"):
+                # Conversión única a float32 para usar BLAS en cada llamada
+                kernel = arrays[f"op{i}_kernel"].astype(np.float32)
+                combined = (entry["input_scale"] * arrays[f"op{i}_scale"]).astype(np.float32)
+                # Bias en unidades del acumulado: así se suma antes de reescalar
+                bias = (arrays[f"op{i}_bias"] / combined).astype(np.float32)
+                self.ops.append((kind, kernel, bias, combined, entry["input_scale"],
+                                 ACTIVATIONS[entry["activation"]]))
+            elif kind == "pool":
+                self.ops.append(("pool", entry["size"]))
+            else:
+                self.ops.append(("flatten",))
+
+    @classmethod
+    def from_float(cls, model, calibration_inputs):
+        """
+        Cuantiza un NumpyCNN float32 calibrando con entradas de ejemplo
+
+        PARÁMETROS:
+        - model: NumpyCNN
+        - calibration_inputs: Lote (N, 28, 28, 1) ya preprocesado
+        """
+        spec, arrays = [], {}
+        for i, (op, input_scale) in enumerate(zip(model.ops, calibrate(model, calibration_inputs))):
+            kind = op[0]
+            if kind in ("conv", "dense"):
+                kernel, scales = quantize_weights(op[1])
+                arrays[f"op{i}_kernel"] = kernel
+                arrays[f"op{i}_scale"] = scales
+                arrays[f"op{i}_bias"] = np.asarray(op[2], dtype=np.float32)
+                spec.append({"kind": kind, "activation": _activation_name(op[3]),
+                             "input_scale": input_scale})
+            elif kind == "pool":
+                spec.append({"kind": "pool", "size": op[1]})
+            else:
+                spec.append({"kind": "flatten"})
+        return cls(spec, arrays)
+
+    @classmethod
+    def load(cls, path):
+        """Lee un modelo guardado con save() (sin pickle)"""
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["spec"]))
+            arrays = {name: data[name] for name in data.files if name != "spec"}
+        return cls(meta["ops"], arrays, meta.get("report"))
+
+    def save(self, path):
+        """Guarda el modelo y su informe en un .npz"""
+        meta = json.dumps({"ops": self.spec, "report": self.report})
+        with open(path, "wb") as f:
+            np.savez(f, spec=np.array(meta), **self.arrays)
+
+    @property
+    def weight_bytes(self):
+        """RETORNA: Bytes de los pesos int8, escalas y bias tal como se guardan en el archivo"""
+        return sum(array.nbytes for array in self.arrays.values())
+
+    def __call__(self, batch):
+        """
+        Forward pass cuantizado
+
+        PARÁMETRO:
+        - batch: Array float32 (N, 28, 28, 1) con valores en [0, 1]
+
+        RETORNA: Array float32 (N, 10) con probabilidades softmax
+        """
+        x = np.asarray(batch, dtype=np.float32)
+        for op in self.ops:
+            kind = op[0]
+            if kind in ("conv", "dense"):
+                _, kernel, bias, combined, input_scale, activation = op
+                q = quantize_activations(x, input_scale)
+                x = conv2d(q, kernel, bias) if kind == "conv" else q @ kernel + bias
+                x *= combined
+                x = activation(x)
+            elif kind == "pool":
+                x = apply_op(op, x)
+            else:
+                x = x.reshape(x.shape[0], -1)
+        return x
+
+
+def float_weight_bytes(model):
+    """RETORNA: Bytes de los pesos float32 de un NumpyCNN"""
+    return sum(array.nbytes for op in model.ops if op[0] in ("conv", "dense") for array in op[1:3])
+
+
+def quantize_model(model_path, inputs, labels):
+    """
+    Cuantiza el modelo .keras y mide la precisión de calibración
+
+    PARÁMETROS:
+    - model_path: Ruta al .keras
+    - inputs: Lote (N, 28, 28, 1) ya preprocesado (entradas de calibración)
+    - labels: Etiquetas (N,) de esas entradas
+
+    RETORNA: QuantizedCNN con el informe en .report
+    """
+    model = NumpyCNN.from_keras(model_path)
+    quantized = QuantizedCNN.from_float(model, inputs)
+
+    float_predicted = model(inputs).argmax(axis=1)
+    int8_predicted = quantized(inputs).argmax(axis=1)
+    labels = np.asarray(labels)
+    float_accuracy = float((float_predicted == labels).mean())
+    int8_accuracy = float((int8_predicted == labels).mean())
+    quantized.report = {
+        "source_hash": file_digest(model_path),
+        "calibration_samples": int(len(labels)),
+        "float_accuracy": float_accuracy,
+        "int8_accuracy": int8_accuracy,
+        "accuracy_drop": float_accuracy - int8_accuracy,
+        "top1_agreement": float((float_predicted == int8_predicted).mean()),
+        "float_weight_bytes": float_weight_bytes(model),
+        "int8_weight_bytes": quantized.weight_bytes,
+    }
+    return quantized
@@ -0,0 +1,123 @@
+"""
+MÓDULO: tta.py
+PROPÓSITO: Aumentación en tiempo de inferencia (TTA) en una sola llamada al modelo
+
+IDEA:
+- En lugar de predecir sólo la imagen, se predicen K variantes ligeramente desplazadas,
+  giradas o escaladas y se promedian sus probabilidades softmax
+- Un trazo algo descentrado o torcido deja de decidir él solo la respuesta, así que la
+  predicción es más estable entre capturas consecutivas del modo en vivo
+
+IMPLEMENTACIÓN:
+- Cada variante es una transformación afín fija alrededor del centro del marco 28x28.
+  Sus tablas de muestreo bilineal (4 índices y 4 pesos por píxel de salida) se calculan
+  UNA vez al crear el objeto
+- Generar las K variantes es entonces un único gather con NumPy sobre la imagen con un
+  borde de ceros (fuera del marco es fondo), sin bucles ni operaciones de imagen por
+  variante
+- Las K variantes se apilan en un lote (K, 28, 28, 1): una sola llamada al modelo
+
+NOTA: Se aplica sobre la entrada ya preprocesada (fondo negro = 0)
+"""
+
+import numpy as np
+
+from ..utils.image_processing import FRAME_SIZE
+
+
+# Variantes (desplazamiento y, desplazamiento x en píxeles, giro en grados, escala),
+# por orden de uso: con K vistas se usan las K primeras. La primera es la identidad
+TTA_VARIANTS = (
+    (0, 0, 0, 1.0),
+    (0, 0, -10, 1.0),
+    (0, 0, 10, 1.0),
+    (0, 0, 0, 0.9),
+    (0, 0, 0, 1.1),
+    (0, 1, 0, 1.0),
+    (0, -1, 0, 1.0),
+    (1, 0, 0, 1.0),
+    (-1, 0, 0, 1.0),
+)
+MAX_VIEWS = len(TTA_VARIANTS)
+
+
+def sampling_tables(variants, size=FRAME_SIZE):
+    """
+    Precalcula el muestreo bilineal inverso de cada transformación
+
+    PARÁMETROS:
+    - variants: Secuencia de (dy, dx, grados, escala)
+    - size: Lado del marco
+
+    RETORNA: (indices int (K, size*size, 4), weights float32 (K, size*size, 4))
+
+    NOTA: Los índices apuntan a la imagen con un borde de ceros de 1 píxel aplanada
+          ((size + 2)^2 valores); lo que cae fuera del marco lee ese borde
+    """
+    center = (size - 1) / 2
+    y, x = np.mgrid[0:size, 0:size].astype(np.float64) - center
+    padded = size + 2
+    indices = np.empty((len(variants), size * size, 4), dtype=np.intp)
+    weights = np.empty((len(variants), size * size, 4), dtype=np.float32)
+    for k, (dy, dx, degrees, scale) in enumerate(variants):
+        # Posición de origen de cada píxel de salida (transformación inversa)
+        angle = np.deg2rad(degrees)
+        cos, sin = np.cos(angle), np.sin(angle)
+        ty, tx = y - dy, x - dx
+        src_y = (cos * ty + sin * tx) / scale + center
+        src_x = (-sin * ty + cos * tx) / scale + center
+
+        y0, x0 = np.floor(src_y), np.floor(src_x)
+        fy, fx = src_y - y0, src_x - x0
+        corners = ((y0, x0, (1 - fy) * (1 - fx)), (y0, x0 + 1, (1 - fy) * fx),
+                   (y0 + 1, x0, fy * (1 - fx)), (y0 + 1, x0 + 1, fy * fx))
+        for c, (cy, cx, w) in enumerate(corners):
+            # +1 por el borde; fuera del marco se recorta al borde de ceros
+            row = np.clip(cy, -1, size).astype(np.intp) + 1
+            col = np.clip(cx, -1, size).astype(np.intp) + 1
+            indices[k, :, c] = (row * padded + col).ravel()
+            weights[k, :, c] = w.ravel()
+    return indices, weights
+
+
+class TestTimeAugmentation:
+    """
+    Genera las K vistas de un lote y promedia sus predicciones
+
+    ATRIBUTOS:
+    - views: Número de vistas K (incluida la identidad)
+    - variants: Transformaciones (dy, dx, grados, escala) usadas
+    """
+
+    def __init__(self, views, variants=TTA_VARIANTS):
+        if not 1 <= views <= len(variants):
+            raise ValueError(f"El número de vistas debe estar entre 1 y {len(variants)}")
+        self.views = views
+        self.variants = tuple(variants[:views])
+        self._indices, self._weights = sampling_tables(self.variants)
+
+    def __call__(self, batch):
+        """
+        PARÁMETRO:
+        - batch: Array float32 (N, 28, 28, 1) ya preprocesado
+
+        RETORNA: Array float32 (N * K, 28, 28, 1); las K vistas de cada imagen son
+                 consecutivas
+        """
+        x = np.asarray(batch, dtype=np.float32)
+        n, size = x.shape[0], x.shape[1]
+        padded = np.zeros((n, size + 2, size + 2), dtype=np.float32)
+        padded[:, 1:-1, 1:-1] = x[..., 0]
+        gathered = padded.reshape(n, -1)[:, self._indices]  # (N, K, size*size, 4)
+        views = np.einsum("nkpc,kpc->nkp", gathered, self._weights)
+        return views.reshape((n * self.views, size, size, 1))
+
+    def average(self, probabilities):
+        """
+        PARÁMETRO:
+        - probabilities: Array (N * K, 10) con la salida del modelo sobre __call__(batch)
+
+        RETORNA: Array (N, 10) con la media de las K vistas de cada imagen
+        """
+        probabilities = np.asarray(probabilities)
+        return probabilities.reshape(-1, self.views, probabilities.shape[-1]).mean(axis=1)
@@ -0,0 +1 @@
+# Servidor local de inferencia (comparte un único modelo entre varios clientes)
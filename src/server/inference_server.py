@@ -0,0 +1,331 @@
+"""
+MÓDULO: inference_server.py
+PROPÓSITO: Servidor HTTP local (asyncio) que comparte UN modelo cargado entre varios clientes
+
+USO:
+    python -m src.server.inference_server [--port 8765] [--max-batch 32] [--max-wait-ms 5]
+    python -m src.server.inference_server --unix /tmp/mnist.sock
+
+API:
+- POST /predict   cuerpo: 784 bytes (imagen 28x28 uint8, fondo blanco y trazo negro)
+                  respuesta: {"digit": 7, "confidences": [...10 valores...]}
+- GET  /stats     estado de la cola y de los micro-lotes
+- Peticiones mal formadas: 400; Content-Length mayor que una imagen: 413 (sin leer el
+  cuerpo); cabeceras de más de MAX_HEADER_BYTES: 431; en todos los casos se cierra la
+  conexión
+
+MICRO-BATCHING:
+- Las peticiones concurrentes se encolan y se agrupan en micro-lotes limitados por
+  tamaño máximo (max_batch) y por tiempo máximo de espera (max_wait_ms)
+- Cada micro-lote es UNA llamada a Predictor.predict_batch, ejecutada en un hilo aparte
+  para no bloquear el bucle de eventos; mientras corre, las nuevas peticiones se acumulan
+- Contrapresión: la cola tiene una profundidad máxima; si está llena se responde 503
+  inmediatamente en vez de acumular latencia sin límite
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from ..model.predictor import BACKENDS, BACKEND_NUMPY, PREPROCESSINGS, PREPROCESSING_BASIC, Predictor
+
+
+DEFAULT_MODEL = os.path.join("models", "mnist_cnn_model.keras")
+IMAGE_BYTES = 28 * 28
+# Tamaño máximo aceptado para las cabeceras HTTP
+MAX_HEADER_BYTES = 16 * 1024
+
+
+class QueueFullError(Exception):
+    """La cola de peticiones está llena (se responde 503)"""
+
+
+class BadRequestError(Exception):
+    """Petición HTTP mal formada (se responde con `status` y se cierra la conexión)"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class MicroBatcher:
+    """
+    Agrupa peticiones concurrentes en micro-lotes para una sola pasada del modelo
+
+    ATRIBUTOS:
+    - max_batch: Imágenes máximas por micro-lote
+    - max_wait: Segundos máximos que espera el primer elemento de un lote
+    - max_queue: Profundidad máxima de la cola
+    - batches / items / rejected: Contadores
+    """
+
+    def __init__(self, predictor, max_batch=32, max_wait_ms=5.0, max_queue=256):
+        self.predictor = predictor
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.max_queue = max_queue
+        self.batches = 0
+        self.items = 0
+        self.rejected = 0
+        self.busy_seconds = 0.0
+        self._queue = asyncio.Queue(maxsize=max_queue)
+        # Un único hilo: como mucho un micro-lote en el modelo a la vez
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inference")
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._executor.shutdown(wait=True)
+
+    async def predict(self, image):
+        """
+        Encola una imagen y espera su resultado
+
+        RETORNA: (digit, confidences)
+        LANZA: QueueFullError si la cola está llena
+        """
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((image, future))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise QueueFullError() from None
+        return await future
+
+    async def _collect(self):
+        """Espera el primer elemento y añade más hasta llenar el lote o agotar la espera"""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch:
+            # Primero se vacía lo que ya está en cola, sin esperar
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            images = np.stack([image for image, _ in batch])
+            started = time.perf_counter()
+            try:
+                labels, probabilities = await loop.run_in_executor(
+                    self._executor, self.predictor.predict_batch, images, self.max_batch)
+                error = None if labels is not None else RuntimeError("La predicción falló")
+            except Exception as e:
+                error = e
+            self.busy_seconds += time.perf_counter() - started
+            self.batches += 1
+            self.items += len(batch)
+
+            for index, (_, future) in enumerate(batch):
+                if future.done():
+                    continue  # el cliente ya se desconectó
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result((int(labels[index]), probabilities[index]))
+
+    def stats(self):
+        return {
+            "queue_depth": self._queue.qsize(),
+            "max_queue": self.max_queue,
+            "max_batch": self.max_batch,
+            "max_wait_ms": self.max_wait * 1000,
+            "batches": self.batches,
+            "items": self.items,
+            "rejected": self.rejected,
+            "mean_batch_size": self.items / self.batches if self.batches else 0.0,
+            "busy_seconds": self.busy_seconds,
+        }
+
+
+class InferenceServer:
+    """
+    Servidor HTTP/1.1 mínimo (con keep-alive) sobre asyncio
+
+    NOTA: Sólo implementa lo necesario para /predict y /stats; no depende de ningún
+          framework web
+    """
+
+    def __init__(self, batcher):
+        self.batcher = batcher
+        self.requests = 0
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except BadRequestError as e:
+                    self._write_response(writer, e.status, {"error": str(e)}, keep_alive=False)
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                method, path, body, keep_alive = request
+                status, payload = await self._dispatch(method, path, body)
+                self._write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader):
+        """
+        RETORNA: (método, ruta, cuerpo, keep_alive) o None si el cliente cerró
+
+        LANZA: BadRequestError si la línea de petición o las cabeceras no son válidas
+               (400), si las cabeceras superan MAX_HEADER_BYTES (431) o si
+               Content-Length supera IMAGE_BYTES (413); el cuerpo no se lee
+        """
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError:
+            return None
+        except asyncio.LimitOverrunError:
+            raise BadRequestError(431, f"Cabeceras de más de {MAX_HEADER_BYTES} bytes") from None
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, path, version = lines[0].split(" ", 2)
+            headers = {}
+            for line in lines[1:]:
+                if ":" in line:
+                    name, value = line.split(":", 1)
+                    headers[name.strip().lower()] = value.strip()
+            length = int(headers.get("content-length", "0"))
+        except ValueError:
+            raise BadRequestError(400, "Petición mal formada") from None
+        if length < 0:
+            raise BadRequestError(400, "Content-Length negativo")
+        if length > IMAGE_BYTES:
+            raise BadRequestError(413, f"Cuerpo de más de {IMAGE_BYTES} bytes")
+        body = await reader.readexactly(length) if length else b""
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+        return method, path, body, keep_alive
+
+    async def _dispatch(self, method, path, body):
+        self.requests += 1
+        if path == "/predict" and method == "POST":
+            if len(body) != IMAGE_BYTES:
+                return 400, {"error": f"Se esperaban {IMAGE_BYTES} bytes (28x28 uint8)"}
+            image = np.frombuffer(body, dtype=np.uint8).reshape(28, 28)
+            try:
+                digit, confidences = await self.batcher.predict(image)
+            except QueueFullError:
+                return 503, {"error": "Cola llena, reintenta más tarde"}
+            except Exception as e:
+                return 500, {"error": str(e)}
+            return 200, {"digit": digit, "confidences": [round(float(c), 6) for c in confidences]}
+        if path == "/stats" and method == "GET":
+            return 200, dict(self.batcher.stats(), requests=self.requests)
+        return 404, {"error": "Ruta no encontrada"}
+
+    @staticmethod
+    def _write_response(writer, status, payload, keep_alive):
+        reasons = {200: "OK", 400: "Bad Request", 404: "Not Found", 413: "Payload Too Large",
+                   431: "Request Header Fields Too Large",
+                   500: "Internal Server Error", 503: "Service Unavailable"}
+        body = json.dumps(payload).encode()
+        head = (
+            f"HTTP/1.1 {status} {reasons.get(status, 'OK')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+
+
+async def serve(predictor, host="127.0.0.1", port=8765, unix_path=None, max_batch=32,
+                max_wait_ms=5.0, max_queue=256, ready=None):
+    """
+    Arranca el servidor y atiende hasta que se cancela
+
+    PARÁMETROS:
+    - ready: asyncio.Event opcional que se activa cuando el socket ya escucha
+    """
+    batcher = MicroBatcher(predictor, max_batch=max_batch, max_wait_ms=max_wait_ms,
+                           max_queue=max_queue)
+    batcher.start()
+    server = InferenceServer(batcher)
+    if unix_path:
+        listener = await asyncio.start_unix_server(server.handle_connection, path=unix_path,
+                                                   limit=MAX_HEADER_BYTES)
+        where = unix_path
+    else:
+        listener = await asyncio.start_server(server.handle_connection, host, port,
+                                              limit=MAX_HEADER_BYTES)
+        where = f"http://{host}:{port}"
+    print(f"[SERVER] ✓ Escuchando en {where} (lote máx. {max_batch}, espera máx. "
+          f"{max_wait_ms} ms, cola máx. {max_queue})", flush=True)
+    if ready is not None:
+        ready.set()
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        await batcher.stop()
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Servidor local de inferencia con micro-batching")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="Escuchar en un socket Unix en lugar de TCP")
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--backend", choices=BACKENDS, default=BACKEND_NUMPY)
+    parser.add_argument("--preprocessing", choices=PREPROCESSINGS, default=PREPROCESSING_BASIC)
+    parser.add_argument("--max-batch", type=int, default=32, help="Imágenes máximas por micro-lote")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0,
+                        help="Espera máxima para completar un micro-lote")
+    parser.add_argument("--max-queue", type=int, default=256,
+                        help="Peticiones en cola antes de responder 503")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    predictor = Predictor(args.model, backend=args.backend, preprocessing=args.preprocessing,
+                          batch_size=args.max_batch, cache_size=0)
+    if not predictor.is_loaded:
+        print(f"[SERVER] ✗ {predictor.error_message}")
+        return 1
+    try:
+        asyncio.run(serve(predictor, args.host, args.port, args.unix, args.max_batch,
+                          args.max_wait_ms, args.max_queue))
+    except KeyboardInterrupt:
+        print("[SERVER] Detenido")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
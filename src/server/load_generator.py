@@ -0,0 +1,172 @@
+"""
+MÓDULO: load_generator.py
+PROPÓSITO: Generador de carga para el servidor de inferencia
+
+USO:
+    python -m src.server.load_generator [--port 8765] [--concurrency 1 4 16 64] [--requests 2000]
+    python -m src.server.load_generator --unix /tmp/mnist.sock
+    python -m src.server.load_generator --check-malformed   # sólo peticiones mal formadas
+
+MIDE (para cada nivel de concurrencia):
+- Latencia p50 / p95 / p99 por petición
+- Throughput (peticiones/s) y respuestas 503 por contrapresión
+
+Cada cliente concurrente mantiene una conexión keep-alive y envía peticiones seguidas.
+
+--check-malformed envía peticiones mal formadas (línea de petición rota, Content-Length
+no numérico, negativo o enorme, cabeceras gigantes) y comprueba que el servidor responde
+400/413/431 en vez de cortar la conexión sin respuesta; termina con código 1 si alguna
+falla.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+
+import numpy as np
+
+from ..utils.synthetic_digits import render_digits
+
+
+async def open_connection(host, port, unix_path):
+    if unix_path:
+        return await asyncio.open_unix_connection(unix_path)
+    return await asyncio.open_connection(host, port)
+
+
+async def post_image(reader, writer, body):
+    """Envía un POST /predict y devuelve el código de estado"""
+    writer.write(
+        b"POST /predict HTTP/1.1\r\nHost: localhost\r\n"
+        b"Content-Type: application/octet-stream\r\n"
+        + f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ")[1])
+    length = next(int(line.split(":", 1)[1]) for line in lines
+                  if line.lower().startswith("content-length"))
+    await reader.readexactly(length)
+    return status
+
+
+# (descripción, petición en bruto, código esperado)
+MALFORMED_REQUESTS = [
+    ("línea de petición sin ruta", b"GARBAGE\r\n\r\n", 400),
+    ("Content-Length no numérico",
+     b"POST /predict HTTP/1.1\r\nContent-Length: abc\r\n\r\n", 400),
+    ("Content-Length negativo",
+     b"POST /predict HTTP/1.1\r\nContent-Length: -5\r\n\r\n", 400),
+    ("Content-Length enorme",
+     b"POST /predict HTTP/1.1\r\nContent-Length: 1000000000\r\n\r\n", 413),
+    ("cabeceras demasiado grandes",
+     b"GET /stats HTTP/1.1\r\nX-Relleno: " + b"a" * (64 * 1024) + b"\r\n\r\n", 431),
+]
+
+
+async def read_status(reader):
+    """RETORNA: Código de estado de la respuesta, o None si el servidor cerró sin responder"""
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return None
+    return int(head.decode("latin-1").split(" ", 2)[1])
+
+
+async def check_malformed(host, port, unix_path):
+    """RETORNA: True si todas las peticiones mal formadas reciben el código esperado"""
+    passed = True
+    for name, request, expected in MALFORMED_REQUESTS:
+        reader, writer = await open_connection(host, port, unix_path)
+        try:
+            writer.write(request)
+            await writer.drain()
+            status = await asyncio.wait_for(read_status(reader), timeout=5)
+        finally:
+            writer.close()
+        ok = status == expected
+        passed &= ok
+        print(f"[CHECK] {'✓' if ok else '✗'} {name}: {status} (esperado {expected})")
+    return passed
+
+
+async def client(host, port, unix_path, payloads, count, latencies, statuses):
+    """Un cliente: `count` peticiones seguidas sobre una conexión persistente"""
+    reader, writer = await open_connection(host, port, unix_path)
+    try:
+        for i in range(count):
+            body = payloads[i % len(payloads)]
+            start = time.perf_counter()
+            status = await post_image(reader, writer, body)
+            latencies.append(time.perf_counter() - start)
+            statuses.append(status)
+    finally:
+        writer.close()
+
+
+async def run_level(host, port, unix_path, payloads, concurrency, requests):
+    """RETORNA: Dict con percentiles de latencia (ms), throughput y rechazos"""
+    latencies, statuses = [], []
+    # Los primeros `requests % concurrency` clientes envían una petición más, para que
+    # todos los niveles envíen exactamente `requests` peticiones
+    per_client, extra = divmod(max(requests, concurrency), concurrency)
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        client(host, port, unix_path, payloads, per_client + (i < extra), latencies, statuses)
+        for i in range(concurrency)
+    ])
+    elapsed = time.perf_counter() - start
+    latencies = np.asarray(latencies) * 1000
+    statuses = np.asarray(statuses)
+    return {
+        "concurrency": concurrency,
+        "requests": len(statuses),
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+        "throughput": len(statuses) / elapsed,
+        "rejected": int((statuses == 503).sum()),
+        "errors": int(((statuses != 200) & (statuses != 503)).sum()),
+    }
+
+
+async def run(host, port, unix_path, levels, requests):
+    images, _ = render_digits(64, seed=5)
+    payloads = [image.tobytes() for image in images]
+    print(f"{'concurrencia':>12}{'peticiones':>12}{'p50 (ms)':>10}{'p95 (ms)':>10}"
+          f"{'p99 (ms)':>10}{'pet./s':>10}{'503':>7}{'errores':>9}")
+    results = []
+    for concurrency in levels:
+        result = await run_level(host, port, unix_path, payloads, concurrency, requests)
+        results.append(result)
+        print(f"{result['concurrency']:>12}{result['requests']:>12}{result['p50_ms']:>10.2f}"
+              f"{result['p95_ms']:>10.2f}{result['p99_ms']:>10.2f}{result['throughput']:>10.0f}"
+              f"{result['rejected']:>7}{result['errors']:>9}", flush=True)
+    return results
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Generador de carga para el servidor de inferencia")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="Conectar a un socket Unix en lugar de TCP")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--requests", type=int, default=2000,
+                        help="Peticiones por nivel de concurrencia")
+    parser.add_argument("--check-malformed", action="store_true",
+                        help="Sólo comprobar las respuestas a peticiones mal formadas")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    if args.check_malformed:
+        return 0 if asyncio.run(check_malformed(args.host, args.port, args.unix)) else 1
+    asyncio.run(run(args.host, args.port, args.unix, args.concurrency, args.requests))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
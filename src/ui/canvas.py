@@ -6,35 +6,95 @@ FUNCIÓN PRINCIPAL:
 - Proporciona un widget QGraphicsView donde el usuario puede dibujar con el ratón
 - Captura los movimientos del ratón y dibuja líneas en tiempo real
 - Almacena la imagen dibujada para procesarla posteriormente
+
+IMAGEN DE FONDO:
+- El dibujo se guarda en un QImage en escala de grises (Format_Grayscale8): 1 byte por
+  píxel, directamente el valor 0-255 que necesita el modelo
+- get_image_array() lee ese buffer SIN copiarlo (vista numpy) y reduce 560x560 -> 28x28
+  con un único reshape + suma entera por bloques de 20x20
+
+REDUCCIÓN INCREMENTAL:
+- El canvas mantiene un buffer 28x28 persistente con la imagen ya reducida
+- Cada segmento dibujado marca como "sucias" las celdas de 20x20 que toca (caja
+  envolvente de la línea ampliada por el grosor del lápiz)
+- get_image_array() sólo recalcula las celdas sucias; el resultado es idéntico bit a
+  bit a reducir la imagen completa
+
+MODO VARIOS DÍGITOS:
+- Con columns > 28 el canvas es más ancho que alto (p. ej. 28x112 celdas a escala 10:
+  280x1120 píxeles) para escribir números; la segmentación trabaja sobre
+  get_full_array() (utils/segmentation.py)
+
+RENDERIZADO RETENIDO:
+- La escena contiene UN único item persistente (CanvasImageItem) que pinta el QImage
+  directamente; nunca se vacía la escena ni se vuelve a subir el pixmap completo
+- Durante un trazo se usa un QPainter de larga duración (se abre al presionar y se
+  cierra al soltar el botón)
+- Tras cada segmento sólo se invalida su rectángulo sucio
 """
 
-from PyQt6.QtWidgets import QGraphicsView, QGraphicsScene
-from PyQt6.QtGui import QPixmap, QPen, QColor, QImage
-from PyQt6.QtCore import Qt, QPoint, pyqtSignal
+from PyQt6.QtWidgets import QGraphicsView, QGraphicsScene, QGraphicsItem
+from PyQt6.QtGui import QPen, QColor, QImage, QPainter
+from PyQt6.QtCore import Qt, QPoint, QRectF, pyqtSignal
+import math
 import numpy as np
 
 
+class CanvasImageItem(QGraphicsItem):
+    """
+    Item de escena que muestra un QImage sin convertirlo a QPixmap
+    
+    NOTA: Con ItemUsesExtendedStyleOption, option.exposedRect indica la zona que Qt
+          necesita repintar, así que sólo se copia esa parte de la imagen
+    """
+    
+    def __init__(self, image):
+        super().__init__()
+        self.image = image
+        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemUsesExtendedStyleOption)
+    
+    def boundingRect(self):
+        return QRectF(self.image.rect())
+    
+    def paint(self, painter, option, widget=None):
+        exposed = option.exposedRect
+        painter.drawImage(exposed, self.image, exposed)
+
+
 class DrawingCanvas(QGraphicsView):
     """
     Widget personalizado que permite dibujar en una cuadrícula de 28x28
     
     ATRIBUTOS:
-    - pixmap: La imagen actual dibujada en el canvas
+    - image: La imagen actual dibujada en el canvas (QImage Grayscale8, 560x560)
     - drawing: Flag que indica si el usuario está dibujando en este momento
     - last_point: Última posición del ratón (para dibujar líneas conectadas)
+    - generation: Contador que aumenta cada vez que cambia el dibujo; si no ha cambiado
+      desde la última captura, no hace falta volver a reducir ni predecir
+    - scaled: Buffer 28 x columns persistente con la imagen reducida
+    - dirty_tiles: Máscara 28 x columns de celdas pendientes de recalcular
     """
     
     # Señal que se emite cuando el usuario dibuja algo
     canvas_updated = pyqtSignal()
+    # Señal que se emite al soltar el botón (fin de un trazo)
+    stroke_finished = pyqtSignal()
     
-    def __init__(self):
-        """Inicializa el canvas con tamaño 28x28 y lo configura para dibujar"""
+    def __init__(self, columns=28, scale_factor=20):
+        """
+        Inicializa el canvas con 28 filas de celdas y lo configura para dibujar
+        
+        PARÁMETROS:
+        - columns: Columnas de celdas (28 = un dígito; más para números de varios dígitos)
+        - scale_factor: Píxeles de pantalla por celda (20: 28x28 -> 560x560)
+        """
         super().__init__()
         
-        # Tamaño en píxeles del canvas (28x28 para MNIST)
+        # Tamaño en celdas del canvas (28x28 para MNIST)
         self.canvas_size = 28
+        self.columns = columns
         # Escala visual para que se vea más grande en pantalla (28*20 = 560 píxeles)
-        self.scale_factor = 20
+        self.scale_factor = scale_factor
         
         # Crea la escena donde se dibuja
         self.scene = QGraphicsScene()
@@ -45,22 +105,62 @@ class DrawingCanvas(QGraphicsView):
         self.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
         
         # Configura el tamaño del widget
-        display_size = self.canvas_size * self.scale_factor
-        self.setFixedSize(display_size, display_size)
+        display_height = self.canvas_size * self.scale_factor
+        display_width = self.columns * self.scale_factor
+        self.setFixedSize(display_width, display_height)
         
         # Crea imagen en blanco (fondo blanco es 255)
-        self.pixmap = QPixmap(display_size, display_size)
-        self.pixmap.fill(Qt.GlobalColor.white)
-        self.scene.addPixmap(self.pixmap)
+        self.image = QImage(display_width, display_height, QImage.Format.Format_Grayscale8)
+        self.image.fill(Qt.GlobalColor.white)
+        self.scene.setSceneRect(QRectF(self.image.rect()))
+        self.image_item = CanvasImageItem(self.image)
+        self.scene.addItem(self.image_item)
+        self.painter = None  # QPainter activo durante un trazo
         
         # Variables de estado
         self.drawing = False  # Flag: ¿está el usuario dibujando?
         self.last_point = QPoint()  # Última posición del ratón
+        self.generation = 0  # Versión del dibujo (cambia con cada trazo o reset)
         
         # Configura el pen (lápiz) para dibujar
         self.pen = QPen()
         self.pen.setColor(QColor(0, 0, 0))  # Color negro
-        self.pen.setWidth(30)  # Grosor del trazo
+        self.pen.setWidth(round(1.5 * self.scale_factor))  # Grosor del trazo (30 a escala 20)
+        
+        # Buffer reducido 28 x columns (todo blanco) y celdas pendientes de recalcular
+        self.scaled = np.full((self.canvas_size, self.columns), 255, dtype=np.uint8)
+        self.dirty_tiles = np.zeros((self.canvas_size, self.columns), dtype=bool)
+        # Margen alrededor de un segmento: con extremo cuadrado el trazo se extiende
+        # hasta (grosor / 2) * sqrt(2) en diagonal, +1 píxel de rasterizado
+        self.stroke_margin = math.ceil(self.pen.widthF() / 2 * math.sqrt(2)) + 1
+    
+    def segment_bounds(self, p1, p2):
+        """
+        RETORNA: (x0, y0, x1, y1) píxeles que puede tocar la línea p1 -> p2 con el lápiz actual
+        """
+        margin = self.stroke_margin
+        x0 = min(p1.x(), p2.x()) - margin
+        x1 = max(p1.x(), p2.x()) + margin
+        y0 = min(p1.y(), p2.y()) - margin
+        y1 = max(p1.y(), p2.y()) + margin
+        return x0, y0, x1, y1
+    
+    def mark_dirty(self, p1, p2):
+        """
+        Marca como sucias las celdas 20x20 que puede tocar la línea p1 -> p2
+        y solicita el repintado de ese rectángulo
+        
+        PARÁMETROS:
+        - p1, p2: QPoint extremos del segmento (coordenadas de la imagen 560x560)
+        """
+        x0, y0, x1, y1 = self.segment_bounds(p1, p2)
+        self.image_item.update(QRectF(x0, y0, x1 - x0 + 1, y1 - y0 + 1))
+        
+        f = self.scale_factor
+        col0, col1 = max(x0 // f, 0), min(x1 // f, self.columns - 1)
+        row0, row1 = max(y0 // f, 0), min(y1 // f, self.canvas_size - 1)
+        if col0 <= col1 and row0 <= row1:
+            self.dirty_tiles[row0:row1 + 1, col0:col1 + 1] = True
     
     def mousePressEvent(self, event):
         """
@@ -71,6 +171,20 @@ class DrawingCanvas(QGraphicsView):
             self.drawing = True  # Comenzar a dibujar
             # Guardar el punto inicial
             self.last_point = event.pos()
+            # Pintor de larga duración para todo el trazo
+            self.begin_stroke()
+    
+    def begin_stroke(self):
+        """Abre el QPainter que se reutiliza en todos los segmentos del trazo"""
+        if self.painter is None:
+            self.painter = QPainter(self.image)
+            self.painter.setPen(self.pen)
+    
+    def end_stroke(self):
+        """Cierra el QPainter del trazo actual (si hay uno abierto)"""
+        if self.painter is not None:
+            self.painter.end()
+            self.painter = None
     
     def mouseMoveEvent(self, event):
         """
@@ -78,21 +192,17 @@ class DrawingCanvas(QGraphicsView):
         PARÁMETRO: event - Evento del ratón
         """
         if event.buttons() & Qt.MouseButton.LeftButton and self.drawing:
-            # Crear un "pintor" para dibujar en el pixmap
-            from PyQt6.QtGui import QPainter
-            painter = QPainter(self.pixmap)
-            painter.setPen(self.pen)
+            self.begin_stroke()
             
             # Dibujar línea conectada desde último punto hasta punto actual
-            painter.drawLine(self.last_point, event.pos())
-            painter.end()
+            point = event.pos()
+            self.painter.drawLine(self.last_point, point)
+            # Marcar celdas sucias y repintar sólo el rectángulo del segmento
+            self.mark_dirty(self.last_point, point)
             
             # Actualizar el punto actual
-            self.last_point = event.pos()
-            
-            # Refrescar la escena visual
-            self.scene.clear()
-            self.scene.addPixmap(self.pixmap)
+            self.last_point = point
+            self.generation += 1
             
             # Emitir señal indicando que el canvas se actualizó
             self.canvas_updated.emit()
@@ -104,6 +214,8 @@ class DrawingCanvas(QGraphicsView):
         """
         if event.button() == Qt.MouseButton.LeftButton:
             self.drawing = False  # Dejar de dibujar
+            self.end_stroke()
+            self.stroke_finished.emit()
     
     def reset(self):
         """
@@ -111,50 +223,65 @@ class DrawingCanvas(QGraphicsView):
         Se usa cuando el usuario presiona el botón RESET
         """
         # Crear imagen en blanco nuevamente
-        self.pixmap.fill(Qt.GlobalColor.white)
+        self.end_stroke()
+        self.image.fill(Qt.GlobalColor.white)
+        self.generation += 1
+        
+        # El buffer reducido vuelve a blanco sin recorrer la imagen grande
+        self.scaled.fill(255)
+        self.dirty_tiles.fill(False)
         
-        # Refrescar la escena
-        self.scene.clear()
-        self.scene.addPixmap(self.pixmap)
+        # Refrescar el item completo (una sola vez)
+        self.image_item.update()
         
         # Emitir señal indicando que el canvas cambió
         self.canvas_updated.emit()
     
     def get_image_array(self):
         """
-        RETORNA: Array numpy de 28x28 con los valores de píxeles (0-255)
+        RETORNA: Array numpy de 28 x columns (28x28 en modo un dígito) con los valores
+                 de píxeles (0-255)
         
         USO: Esta imagen se preprocesa y se envía al modelo CNN para predicción
         NOTAS:
-        - Convierte el QPixmap en un array numpy
-        - Escala de 280x280 a 28x28 (dividiendo por 10)
-        - La imagen es en escala de grises (valores 0-255)
-        """
-        # Convertir QPixmap a QImage
-        image = self.pixmap.toImage()
-        
-        # Convertir QImage a array numpy
-        width = image.width()
-        height = image.height()
-        
-        # Extrae los datos de píxeles
-        ptr = image.bits()
-        ptr.setsize(image.sizeInBytes())
-        arr = np.array(ptr).reshape(height, width, 4)  # RGBA
-        
-        # Convertir a escala de grises (usar canal rojo, ya que es blanco/negro)
-        gray = arr[:, :, 0]
-        
-        # Escalar de 280x280 a 28x28
-        # Cada píxel de 28x28 corresponde a un bloque de 10x10 en la imagen visual
-        scaled = np.zeros((self.canvas_size, self.canvas_size), dtype=np.uint8)
-        
-        for i in range(self.canvas_size):
-            for j in range(self.canvas_size):
-                # Extraer el bloque 10x10
-                block = gray[i*self.scale_factor:(i+1)*self.scale_factor,
-                            j*self.scale_factor:(j+1)*self.scale_factor]
-                # Usar el valor promedio del bloque
-                scaled[i, j] = int(np.mean(block))
-        
-        return scaled
+        - Sólo se recalculan las celdas marcadas como sucias desde la última llamada
+        - Cada celda es el promedio (truncado a entero) de su bloque de 20x20
+        - Devuelve una copia: el buffer interno sigue actualizándose
+        """
+        rows, cols = np.nonzero(self.dirty_tiles)
+        if rows.size:
+            n, m, f = self.canvas_size, self.columns, self.scale_factor
+            # Vista (28, 20, 28, 20) sin copia; se extraen sólo los bloques sucios
+            blocks = self.get_full_array().reshape(n, f, m, f)[rows, :, cols, :]
+            sums = blocks.sum(axis=(1, 2), dtype=np.uint32)
+            self.scaled[rows, cols] = sums // (f * f)
+            self.dirty_tiles[rows, cols] = False
+        return self.scaled.copy()
+    
+    def compute_full_image_array(self):
+        """
+        RETORNA: Reducción 28 x columns de la imagen completa (sin usar el buffer incremental)
+        
+        USO: Referencia para verificar la reducción incremental
+        """
+        n, m, f = self.canvas_size, self.columns, self.scale_factor
+        sums = self.get_full_array().reshape(n, f, m, f).sum(axis=(1, 3), dtype=np.uint32)
+        return (sums // (f * f)).astype(np.uint8)
+    
+    def get_full_array(self):
+        """
+        RETORNA: Vista numpy (560, 560) uint8 del buffer del QImage (sin copia);
+                 (28 * scale_factor, columns * scale_factor) en general
+        
+        NOTA: La vista es de solo lectura y sólo es válida mientras no se vuelva a
+              dibujar en el canvas; cópiala si necesitas conservarla
+        """
+        width = self.image.width()
+        height = self.image.height()
+        
+        # constBits() no fuerza una copia (detach) del QImage
+        ptr = self.image.constBits()
+        ptr.setsize(self.image.sizeInBytes())
+        # Cada fila puede tener relleno hasta bytesPerLine
+        rows = np.frombuffer(ptr, dtype=np.uint8).reshape(height, self.image.bytesPerLine())
+        return rows[:, :width]
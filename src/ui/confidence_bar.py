@@ -6,113 +6,242 @@ PROPÓSITO: Crea widgets visuales para mostrar el porcentaje de confianza (proba
 FUNCIÓN PRINCIPAL:
 - Mostrar un indicador visual para cada una de las 10 clases de dígitos
 - Cada barra representa el porcentaje de confianza (salida softmax de la CNN)
+
+DIBUJO LIGERO:
+- Un ÚNICO widget pinta las 10 filas en su paintEvent (sin QProgressBar ni QLabel por
+  fila, sin hojas de estilo que recalcular)
+- Fuentes, pinceles, los textos "0%" ... "100%" (QStaticText) y el marco redondeado de
+  la barra (QPixmap) se crean una sola vez
+- update_confidences() sólo invalida las filas cuyo porcentaje entero cambió; si no
+  cambió ninguno, no hay repintado
+- La animación usa UN QTimer del propio widget que, en cada fotograma, invalida sólo el
+  rectángulo de las barras que siguen moviéndose; se para cuando todas llegan
 """
 
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QProgressBar
-from PyQt6.QtCore import Qt
+import time
+
+from PyQt6.QtWidgets import QWidget
+from PyQt6.QtGui import QBrush, QColor, QFont, QPainter, QPainterPath, QPen, QPixmap, QStaticText
+from PyQt6.QtCore import QPointF, QRect, QRectF, QSize, Qt, QTimer
+
+
+# Geometría (igual que el diseño anterior con QProgressBar + QLabel)
+MARGIN = 11
+ROW_HEIGHT = 24
+ROW_SPACING = 10
+COLUMN_SPACING = 10
+DIGIT_WIDTH = 30
+BAR_WIDTH = 97
+PERCENT_WIDTH = 40
+BAR_RADIUS = 4
+
+# Colores de la barra
+BORDER_COLOR = "#cfcfcf"
+CHUNK_COLOR = "#4CAF50"
+
+# Duración de la transición de una barra a su nuevo valor
+ANIMATION_MS = 120
+FRAME_MS = 16
 
 
 class ConfidenceBar(QWidget):
     """
     Widget que muestra las 10 barras de confianza (una por cada dígito 0-9)
-    
-    ESTRUCTURA:
+
+    ESTRUCTURA (por fila):
     [Dígito] [████████░░] [Porcentaje%]
-    
+
     ATRIBUTOS:
-    - confidence_bars: Lista de 10 QProgressBar (uno por cada dígito)
-    - confidence_labels: Lista de 10 QLabel (para mostrar porcentaje)
+    - percentages: Lista de 10 enteros (0-100) con el porcentaje mostrado de cada dígito
+    - animated: Si es True, las barras se desplazan suavemente hasta el nuevo valor
+    - repaints: Número de filas invalidadas (para benchmarks)
     """
-    
-    def __init__(self):
+
+    def __init__(self, animated=True):
         """Inicializa el widget con 10 barras de confianza (una por cada dígito)"""
         super().__init__()
+        self.animated = animated
+        self.percentages = [0] * 10
+        self.repaints = 0
+
+        # Estado de la animación por fila: valor dibujado, origen y momento de inicio
+        self._shown = [0.0] * 10
+        self._from = [0.0] * 10
+        self._started = [0.0] * 10
+        self._moving = set()
+        self._timer = QTimer(self)
+        self._timer.setInterval(FRAME_MS)
+        self._timer.timeout.connect(self._advance_animation)
+
         self.initUI()
-    
+
     def initUI(self):
-        """Configura la interfaz gráfica"""
-        # Layout principal (vertical) que contendrá las 10 barras
-        main_layout = QVBoxLayout()
-        main_layout.setSpacing(10)  # Espacio entre barras
-        
-        # Listas para almacenar referencias a las barras y etiquetas
-        self.confidence_bars = []
-        self.confidence_labels = []
-        
-        # Crear 10 barras (una por cada dígito 0-9)
+        """Prepara los recursos de dibujo (se crean una sola vez)"""
+        self._font = QFont(self.font())
+        self._text_pen = QPen(self.palette().windowText().color())
+        self._chunk_brush = QBrush(QColor(CHUNK_COLOR))
+        self._base_brush = self.palette().base()
+        # Textos con el trazado de glifos ya resuelto
+        self._percent_texts = [self._static_text(f"{p}%") for p in range(101)]
+        self._digit_texts = [self._static_text(f"{digit}:") for digit in range(10)]
+        # Marco de la barra pre-renderizado (se regenera si cambia el ancho)
+        self._frame = None
+        self._frame_size = None
+
+        width = MARGIN * 2 + DIGIT_WIDTH + BAR_WIDTH + PERCENT_WIDTH + COLUMN_SPACING * 2
+        height = MARGIN * 2 + ROW_HEIGHT * 10 + ROW_SPACING * 9
+        self._size_hint = QSize(width, height)
+        self.setMinimumSize(self._size_hint)
+        self._update_geometry()
+
+    def _static_text(self, text):
+        static = QStaticText(text)
+        static.prepare(font=self._font)
+        return static
+
+    def _frame_pixmap(self, size):
+        """
+        RETORNA: QPixmap con el marco redondeado de una barra vacía
+
+        NOTA: El borde con antialiasing es lo más caro de pintar una fila; se dibuja una
+              vez y después sólo se copia. Las esquinas exteriores llevan el color de
+              fondo para tapar las esquinas rectas del relleno verde
+        """
+        if self._frame is not None and self._frame_size == size:
+            return self._frame
+        ratio = self.devicePixelRatioF()
+        pixmap = QPixmap(int(size.width() * ratio), int(size.height() * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        outline = QRectF(0.5, 0.5, size.width() - 1, size.height() - 1)
+        rounded = QPainterPath()
+        rounded.addRoundedRect(outline, BAR_RADIUS, BAR_RADIUS)
+        corners = QPainterPath()
+        corners.addRect(QRectF(0, 0, size.width(), size.height()))
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.fillPath(corners.subtracted(rounded), self.palette().window())
+        painter.setPen(QPen(QColor(BORDER_COLOR), 1))
+        painter.drawPath(rounded)
+        painter.end()
+        self._frame = pixmap
+        self._frame_size = size
+        return pixmap
+
+    def sizeHint(self):
+        return self._size_hint
+
+    def resizeEvent(self, event):
+        """Recalcula una sola vez los rectángulos de las filas para el nuevo tamaño"""
+        super().resizeEvent(event)
+        self._update_geometry()
+
+    def _update_geometry(self):
+        left = MARGIN + DIGIT_WIDTH + COLUMN_SPACING
+        bar_width = max(self.width() - left - COLUMN_SPACING - PERCENT_WIDTH - MARGIN, 1)
+        self._rows = []
+        self._bars = []
         for digit in range(10):
-            # Layout horizontal para una fila (dígito + barra + porcentaje)
-            row_layout = QHBoxLayout()
-            
-            # Etiqueta del dígito (0, 1, 2, ..., 9)
-            digit_label = QLabel(f"{digit}:")
-            digit_label.setFixedWidth(30)  # Ancho fijo para alineación
-            
-            # Barra de progreso
-            progress_bar = QProgressBar()
-            progress_bar.setValue(0)  # Valor inicial 0%
-            progress_bar.setMaximum(100)  # Máximo 100%
-            progress_bar.setStyleSheet("""
-                QProgressBar {
-                    border: 1px solid #cfcfcf;
-                    border-radius: 4px;
-                    text-align: center;
-                }
-                QProgressBar::chunk {
-                    background-color: #4CAF50;
-                }
-            """)
-            
-            # Etiqueta de porcentaje
-            percent_label = QLabel("0%")
-            percent_label.setFixedWidth(40)  # Ancho fijo para "100%"
-            
-            # Añadir elementos a la fila
-            row_layout.addWidget(digit_label)
-            row_layout.addWidget(progress_bar)
-            row_layout.addWidget(percent_label)
-            
-            # Guardar referencias
-            self.confidence_bars.append(progress_bar)
-            self.confidence_labels.append(percent_label)
-            
-            # Añadir fila al layout principal
-            main_layout.addLayout(row_layout)
-        
-        # Establecer el layout
-        self.setLayout(main_layout)
-    
+            top = MARGIN + digit * (ROW_HEIGHT + ROW_SPACING)
+            self._rows.append(QRect(0, top, self.width(), ROW_HEIGHT))
+            self._bars.append(QRect(left, top, bar_width, ROW_HEIGHT))
+
     def update_confidences(self, confidences):
         """
         Actualiza las barras con nuevos valores de confianza
-        
+
         PARÁMETRO:
         - confidences: Array/lista con 10 valores entre 0 y 1
                       (salida softmax del modelo CNN)
-        
+
         EJEMPLO:
         confidences = [0.01, 0.85, 0.05, 0.02, 0.01, 0.02, 0.01, 0.01, 0.01, 0.01]
         # El 1 tiene 85% de confianza
+
+        NOTA: Las filas cuyo porcentaje entero no cambia no se tocan
         """
-        # Recorrer cada dígito (0-9)
+        now = time.perf_counter()
+        # Escalares de Python: operar con escalares numpy uno a uno es mucho más lento
+        values = confidences.tolist() if hasattr(confidences, "tolist") else confidences
         for digit in range(10):
-            # Obtener el valor de confianza (entre 0 y 1)
-            confidence = confidences[digit]
-            
-            # Convertir a porcentaje (0-100)
-            percentage = int(confidence * 100)
-            
-            # Actualizar la barra de progreso
-            self.confidence_bars[digit].setValue(percentage)
-            
-            # Actualizar la etiqueta de porcentaje
-            self.confidence_labels[digit].setText(f"{percentage}%")
-    
+            # Convertir a porcentaje entero (0-100), igual que el valor que se muestra
+            percentage = min(max(int(values[digit] * 100), 0), 100)
+            if percentage == self.percentages[digit]:
+                continue
+            self.percentages[digit] = percentage
+            self._set_target(digit, now)
+
     def reset(self):
         """
         Reinicia todas las barras a 0%
         Se usa cuando el usuario presiona RESET o dibuja algo nuevo
         """
-        for i in range(10):
-            self.confidence_bars[i].setValue(0)
-            self.confidence_labels[i].setText("0%")
+        self._timer.stop()
+        self._moving.clear()
+        for digit in range(10):
+            if self.percentages[digit] or self._shown[digit]:
+                self.percentages[digit] = 0
+                self._shown[digit] = 0.0
+                self.repaints += 1
+                self.update(self._rows[digit])
+
+    def _set_target(self, digit, now):
+        """Lleva la fila a su nuevo porcentaje (animado o de inmediato)"""
+        self.repaints += 1
+        self.update(self._rows[digit])  # El texto cambia ya
+        if not self.animated or not self.isVisible():
+            self._shown[digit] = float(self.percentages[digit])
+            self._moving.discard(digit)
+            return
+        self._from[digit] = self._shown[digit]
+        self._started[digit] = now
+        self._moving.add(digit)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _advance_animation(self):
+        """Un fotograma: avanza las barras en movimiento e invalida sólo sus barras"""
+        now = time.perf_counter()
+        for digit in list(self._moving):
+            progress = (now - self._started[digit]) * 1000 / ANIMATION_MS
+            target = self.percentages[digit]
+            if progress >= 1.0:
+                self._shown[digit] = float(target)
+                self._moving.discard(digit)
+            else:
+                eased = 1.0 - (1.0 - progress) ** 3  # Ease-out cúbico
+                self._shown[digit] = self._from[digit] + (target - self._from[digit]) * eased
+            self.update(self._bars[digit])
+        if not self._moving:
+            self._timer.stop()
+
+    def paintEvent(self, event):
+        """Dibuja sólo las filas que cortan la zona a repintar"""
+        exposed = event.region()
+        painter = QPainter(self)
+        painter.setPen(self._text_pen)
+        painter.setFont(self._font)
+        frame = None
+        for digit, row in enumerate(self._rows):
+            if not exposed.intersects(row):
+                continue
+            bar = self._bars[digit]
+            if frame is None:
+                frame = self._frame_pixmap(bar.size())
+
+            # Fondo y relleno proporcional al valor dibujado; el marco se copia encima
+            inside = bar.adjusted(1, 1, -1, -1)
+            painter.fillRect(inside, self._base_brush)
+            fill_width = inside.width() * self._shown[digit] / 100
+            if fill_width > 0:
+                chunk = QRectF(inside.left(), inside.top(), fill_width, inside.height())
+                painter.fillRect(chunk, self._chunk_brush)
+            painter.drawPixmap(bar.topLeft(), frame)
+
+            text = self._percent_texts[self.percentages[digit]]
+            size = text.size()
+            middle = row.top() + (ROW_HEIGHT - size.height()) / 2
+            painter.drawStaticText(QPointF(bar.left() + (bar.width() - size.width()) / 2, middle), text)
+            painter.drawStaticText(QPointF(bar.right() + 1 + COLUMN_SPACING, middle), text)
+            painter.drawStaticText(QPointF(MARGIN, middle), self._digit_texts[digit])
+        painter.end()
@@ -0,0 +1,108 @@
+"""
+MÓDULO: inference_worker.py
+PROPÓSITO: Ejecuta las predicciones en un hilo dedicado, fuera del hilo de la GUI
+
+FUNCIÓN PRINCIPAL:
+- Mantener como máximo UNA predicción en curso
+- Coalescer peticiones "la última gana": si llega una captura nueva del canvas mientras
+  hay otra esperando, la nueva reemplaza a la antigua (la antigua se descarta)
+- Devolver los resultados a la GUI con una señal en cola etiquetada con el número de
+  secuencia, para que la ventana descarte resultados desordenados u obsoletos
+"""
+
+import threading
+import time
+
+from PyQt6.QtCore import QObject, QThread, Qt, pyqtSignal
+
+from ..utils.metrics import METRICS
+
+
+class InferenceWorker(QObject):
+    """
+    Trabajador de inferencia que vive en su propio QThread
+
+    SEÑALES:
+    - result_ready(seq, predicted_digit, confidences): Resultado de una petición (en modo
+      varios dígitos: el número como texto y las probabilidades (N, 10))
+
+    ATRIBUTOS:
+    - predictor: Predictor ya cargado
+    - delay_ms: Retardo artificial por predicción (para probar la fluidez del dibujo)
+    - multi_digit: Si es True, cada captura es el canvas completo y se usa predict_number
+    - submitted / completed / dropped: Contadores de peticiones
+    """
+
+    result_ready = pyqtSignal(int, object, object)
+    # Señal interna: despierta al trabajador dentro de su propio hilo
+    _wake = pyqtSignal()
+
+    def __init__(self, predictor, delay_ms=0, multi_digit=False):
+        super().__init__()
+        self.predictor = predictor
+        self.delay_ms = delay_ms
+        self.multi_digit = multi_digit
+        self._predict = predictor.predict_number if multi_digit else predictor.predict
+        self.submitted = 0
+        self.completed = 0
+        self.dropped = 0
+
+        self._lock = threading.Lock()
+        self._pending = None  # (seq, image, instante de envío) esperando; como mucho una
+        self._busy = False  # True mientras el hilo está drenando peticiones
+
+        self._thread = QThread()
+        self._thread.setObjectName("InferenceWorker")
+        self.moveToThread(self._thread)
+        self._wake.connect(self._drain, Qt.ConnectionType.QueuedConnection)
+
+    def start(self):
+        """Arranca el hilo de inferencia"""
+        self._thread.start()
+
+    def stop(self):
+        """Detiene el hilo (espera a que termine la predicción en curso)"""
+        self._thread.quit()
+        self._thread.wait()
+
+    def submit(self, image_array, seq):
+        """
+        Encola una captura del canvas (se llama desde el hilo de la GUI, no bloquea)
+
+        PARÁMETROS:
+        - image_array: Array numpy 28x28 (uint8), o el canvas completo en modo varios dígitos
+        - seq: Número de secuencia asignado por la ventana
+        """
+        with self._lock:
+            self.submitted += 1
+            if self._pending is not None:
+                # La última gana: la captura anterior ya no interesa
+                self.dropped += 1
+                METRICS.inc("frames_dropped")
+            self._pending = (seq, image_array, time.perf_counter())
+            if self._busy:
+                return
+            self._busy = True
+        self._wake.emit()
+
+    def _drain(self):
+        """Se ejecuta en el hilo de inferencia: procesa peticiones hasta vaciar la cola"""
+        while True:
+            with self._lock:
+                job = self._pending
+                self._pending = None
+                if job is None:
+                    self._busy = False
+                    return
+            seq, image_array, submitted_at = job
+            start = time.perf_counter()
+            METRICS.observe("queue_wait", start - submitted_at)
+
+            if self.delay_ms:
+                time.sleep(self.delay_ms / 1000)
+            predicted_digit, confidences = self._predict(image_array)
+            METRICS.observe("prediction", time.perf_counter() - start)
+            self.completed += 1
+            METRICS.inc("predictions")
+            if confidences is not None:
+                self.result_ready.emit(seq, predicted_digit, confidences)
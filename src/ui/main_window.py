@@ -8,6 +8,12 @@ ESTRUCTURA:
 - Botones: PREDICT (predicción), RESET (limpiar)
 - 10 indicadores de confianza (softmax)
 
+MODO VARIOS DÍGITOS (multi_digit=True):
+- Canvas ancho (28 x 112 celdas a escala 10: 280x1120 píxeles) sobre los controles
+- Cada captura es el canvas a resolución completa; el predictor lo segmenta y devuelve
+  las probabilidades de cada dígito, que se muestran como el número y la confianza
+  top-1 de cada dígito en lugar de las 10 barras
+
 FUNCIÓN PRINCIPAL:
 - Orquestar la interfaz gráfica
 - Conectar eventos de botones con funciones de predicción
@@ -18,11 +24,20 @@ from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QHBoxLayout, QVBoxLayout, 
     QPushButton, QLabel, QFrame
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QTimer
+from PyQt6.QtCore import Qt, pyqtSignal
 from .canvas import DrawingCanvas
 from .confidence_bar import ConfidenceBar
+from .prediction_scheduler import PredictionScheduler
 from PyQt6.QtGui import QIcon
 import numpy as np
+import time
+
+from ..utils.metrics import METRICS
+
+
+# Canvas del modo varios dígitos: columnas de celdas y píxeles por celda
+MULTI_DIGIT_COLUMNS = 112
+MULTI_DIGIT_SCALE = 10
 
 
 class MainWindow(QMainWindow):
@@ -31,26 +46,49 @@ class MainWindow(QMainWindow):
     
     COMPONENTES:
     - drawing_canvas: Canvas de 28x28 para que el usuario dibuje
-    - confidence_display: Widget que muestra las 10 barras de confianza
+    - confidence_display: Widget que muestra las 10 barras de confianza (modo un dígito)
+    - number_label / digits_label: Número reconocido y confianza de cada dígito
+      (modo varios dígitos)
     - predict_btn: Botón para predecir
     - reset_btn: Botón para limpiar
     
     SEÑALES:
-    - predict_signal: Se emite cuando el usuario presiona PREDICT
+    - predict_signal: Se emite con cada captura del canvas a predecir
+    
+    SECUENCIAS:
+    - Cada captura emitida lleva un número de secuencia creciente; los resultados que
+      llegan con una secuencia más antigua que el último mostrado (o anterior a un
+      RESET) se descartan
+    
+    ESTADO DEL MODELO:
+    - model_ready: False mientras el modelo se carga en segundo plano; hasta entonces
+      los dibujos no generan predicciones (se descartan) y, al quedar listo, se
+      predice una vez el contenido actual del canvas
     """
     
     # Señal que se emite cuando el usuario quiere hacer una predicción
-    predict_signal = pyqtSignal(object)  # Emite la imagen como numpy array
+    # Emite la imagen como numpy array y su número de secuencia
+    predict_signal = pyqtSignal(object, int)
     
-    def __init__(self):
-        """Inicializa la ventana principal"""
+    def __init__(self, multi_digit=False):
+        """
+        Inicializa la ventana principal
+        
+        PARÁMETRO:
+        - multi_digit: Canvas ancho para números de varios dígitos
+        """
         super().__init__()
+        self.multi_digit = multi_digit
         self.live_mode = True
         self.awaiting_first_draw = True
         self.resetting = False
-        self.prediction_timer = QTimer(self)
-        self.prediction_timer.setInterval(150)
-        self.prediction_timer.timeout.connect(self.emit_live_prediction)
+        self.model_ready = False
+        self.prediction_seq = 0  # Última secuencia emitida
+        self.shown_seq = 0  # Secuencia del último resultado mostrado
+        self.predicted_generation = -1  # Versión del canvas enviada por última vez
+        self.emitted_at = {}  # seq -> instante de la captura (latencia de extremo a extremo)
+        # Decide cuándo predecir (ritmo adaptado a la latencia, fin de trazo, inactividad)
+        self.scheduler = PredictionScheduler(self.emit_live_prediction, self)
         self.initUI()
     
     def initUI(self):
@@ -68,23 +106,28 @@ class MainWindow(QMainWindow):
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
         
-        # Layout principal (horizontal: izquierda canvas, derecha controles)
-        main_layout = QHBoxLayout()
+        # Layout principal (horizontal: izquierda canvas, derecha controles;
+        # vertical con el canvas ancho del modo varios dígitos)
+        main_layout = QVBoxLayout() if self.multi_digit else QHBoxLayout()
         
         # ============ LADO IZQUIERDO: CANVAS DE DIBUJO ============
         left_layout = QVBoxLayout()
         left_layout.addStretch()
         
         # Etiqueta "Draw Digit"
-        draw_label = QLabel("Draw Digit (28x28)")
+        draw_label = QLabel("Draw a Number" if self.multi_digit else "Draw Digit (28x28)")
         draw_label.setStyleSheet("font-weight: bold; font-size: 14px;")
         draw_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         left_layout.addWidget(draw_label)
         
         # Canvas de dibujo
-        self.drawing_canvas = DrawingCanvas()
+        if self.multi_digit:
+            self.drawing_canvas = DrawingCanvas(MULTI_DIGIT_COLUMNS, MULTI_DIGIT_SCALE)
+        else:
+            self.drawing_canvas = DrawingCanvas()
         self.drawing_canvas.setEnabled(True)
         self.drawing_canvas.canvas_updated.connect(self.on_canvas_updated)
+        self.drawing_canvas.stroke_finished.connect(self.on_stroke_finished)
         left_layout.addWidget(self.drawing_canvas, alignment=Qt.AlignmentFlag.AlignCenter)
         
         left_layout.addStretch()
@@ -128,15 +171,32 @@ class MainWindow(QMainWindow):
         # Agregar espacio flexible antes del panel de probabilidades
         right_layout.addStretch()
         
-        # Etiqueta de "Probabilities"
-        prob_label = QLabel("Digit Probabilities:")
-        prob_label.setStyleSheet("font-weight: bold; font-size: 12px; margin-top: 10px;")
-        prob_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        right_layout.addWidget(prob_label)
+        # Estado del modelo (cargando / listo / error)
+        self.status_label = QLabel("Loading model...")
+        self.status_label.setStyleSheet("font-size: 12px; color: #777777;")
+        self.status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        right_layout.addWidget(self.status_label)
         
-        # Widget con las barras de confianza
-        self.confidence_display = ConfidenceBar()
-        right_layout.addWidget(self.confidence_display, alignment=Qt.AlignmentFlag.AlignCenter)
+        if self.multi_digit:
+            # Número reconocido y confianza de cada dígito
+            self.number_label = QLabel("")
+            self.number_label.setStyleSheet("font-weight: bold; font-size: 28px;")
+            self.number_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            right_layout.addWidget(self.number_label)
+            self.digits_label = QLabel("")
+            self.digits_label.setStyleSheet("font-size: 12px; color: #555555;")
+            self.digits_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            right_layout.addWidget(self.digits_label)
+        else:
+            # Etiqueta de "Probabilities"
+            prob_label = QLabel("Digit Probabilities:")
+            prob_label.setStyleSheet("font-weight: bold; font-size: 12px; margin-top: 10px;")
+            prob_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            right_layout.addWidget(prob_label)
+            
+            # Widget con las barras de confianza
+            self.confidence_display = ConfidenceBar()
+            right_layout.addWidget(self.confidence_display, alignment=Qt.AlignmentFlag.AlignCenter)
         
         # Añadir espacio flexible al final
         right_layout.addStretch()
@@ -157,47 +217,134 @@ class MainWindow(QMainWindow):
         """
         self.resetting = True
         self.stop_live_prediction()
+        # Cualquier resultado que aún esté en camino pertenece al dibujo borrado
+        self.shown_seq = self.prediction_seq
+        self.emitted_at.clear()
 
         # Limpiar canvas
         self.drawing_canvas.reset()
         
-        # Limpiar barras de confianza
-        self.confidence_display.reset()
+        # Limpiar barras de confianza (o el número reconocido)
+        if self.multi_digit:
+            self.show_number(np.empty((0, 10)))
+        else:
+            self.confidence_display.reset()
 
         self.drawing_canvas.setEnabled(True)
         self.live_mode = True
         self.awaiting_first_draw = True
         self.resetting = False
     
-    def update_prediction_results(self, confidences):
+    def update_prediction_results(self, confidences, seq=None):
         """
         Actualiza el display con los resultados de la predicción
         
-        PARÁMETRO:
+        PARÁMETROS:
         - confidences: Array con 10 valores (0-1) de la salida softmax del modelo
+          (en modo varios dígitos, Array (N, 10) con una fila por dígito)
+        - seq: Número de secuencia de la captura predicha (opcional)
+        
+        RETORNA: True si el resultado se mostró, False si se descartó por obsoleto
         
         USO:
         - Se llama desde main.py después de que el modelo hace la predicción
         - Actualiza las barras de confianza con los nuevos valores
         """
-        self.confidence_display.update_confidences(confidences)
+        if seq is not None:
+            # El backend quedó libre (aunque el resultado sea obsoleto)
+            self.scheduler.result_received(seq)
+            if seq <= self.shown_seq:
+                METRICS.inc("results_stale")
+                return False
+            self.shown_seq = seq
+        start = time.perf_counter()
+        if self.multi_digit:
+            self.show_number(confidences)
+        else:
+            self.confidence_display.update_confidences(confidences)
+        done = time.perf_counter()
+        METRICS.observe("ui_update", done - start)
+        if seq is not None:
+            emitted = self.emitted_at.pop(seq, None)
+            if emitted is not None:
+                METRICS.observe("end_to_end", done - emitted)
+            # Las capturas anteriores ya no se mostrarán
+            for old in [old for old in self.emitted_at if old < seq]:
+                del self.emitted_at[old]
+        return True
+
+    def show_number(self, confidences):
+        """
+        Muestra el número reconocido y la confianza top-1 de cada dígito
+        
+        PARÁMETRO:
+        - confidences: Array (N, 10), un dígito por fila de izquierda a derecha
+        """
+        digits = confidences.argmax(axis=1).tolist()
+        top = confidences.max(axis=1).tolist()
+        self.number_label.setText("".join(str(digit) for digit in digits))
+        self.digits_label.setText("  ".join(f"{digit}: {p:.0%}" for digit, p in zip(digits, top)))
+
+    def set_model_ready(self, ready, message=None):
+        """
+        Cambia la interfaz entre el estado "cargando modelo" y el modo en vivo
+        
+        PARÁMETROS:
+        - ready: True si el modelo se cargó correctamente
+        - message: Texto opcional para la etiqueta de estado
+        """
+        self.model_ready = ready
+        if ready:
+            self.status_label.setText(message or "Live mode")
+            # Si el usuario ya dibujó mientras se cargaba, predecir ahora
+            if not self.awaiting_first_draw:
+                self.scheduler.flush()
+        else:
+            self.status_label.setText(message or "Model not available")
 
     def on_canvas_updated(self):
-        if self.resetting or not self.live_mode or not self.awaiting_first_draw:
+        if self.resetting or not self.live_mode:
             return
 
-        image = self.drawing_canvas.get_image_array()
-        if np.any(image < 255):
+        if self.awaiting_first_draw:
+            image = self.drawing_canvas.get_image_array()
+            if not np.any(image < 255):
+                return
             self.awaiting_first_draw = False
-            self.prediction_timer.start()
+        if self.model_ready:
+            self.scheduler.activity()
+
+    def on_stroke_finished(self):
+        """Al soltar el botón se predice el trazo completo sin esperar al intervalo"""
+        if self.live_mode and self.model_ready and not self.awaiting_first_draw:
+            self.scheduler.flush()
 
     def emit_live_prediction(self):
-        if not self.live_mode:
-            return
+        """
+        Captura el canvas y lo envía a predecir (lo llama el PredictionScheduler)
+
+        RETORNA: Número de secuencia emitido, o None si no había nada nuevo que predecir
+        """
+        if not self.live_mode or not self.model_ready:
+            return None
+
+        # Canvas sin cambios desde la última captura: no reducir ni predecir
+        generation = self.drawing_canvas.generation
+        if generation == self.predicted_generation:
+            return None
+        self.predicted_generation = generation
 
-        image = self.drawing_canvas.get_image_array()
-        self.predict_signal.emit(image)
+        start = time.perf_counter()
+        if self.multi_digit:
+            # Canvas completo: la segmentación necesita la resolución original
+            image = self.drawing_canvas.get_full_array().copy()
+        else:
+            image = self.drawing_canvas.get_image_array()
+        METRICS.observe("snapshot", time.perf_counter() - start)
+        self.prediction_seq += 1
+        self.emitted_at[self.prediction_seq] = start
+        self.predict_signal.emit(image, self.prediction_seq)
+        return self.prediction_seq
 
     def stop_live_prediction(self):
-        if self.prediction_timer.isActive():
-            self.prediction_timer.stop()
+        self.scheduler.stop()
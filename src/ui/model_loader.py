@@ -0,0 +1,39 @@
+"""
+MÓDULO: model_loader.py
+PROPÓSITO: Carga el modelo en un hilo de trabajo para que la ventana aparezca al instante
+
+FUNCIÓN PRINCIPAL:
+- Crear el Predictor (que importa TensorFlow de forma perezosa) fuera del hilo de la GUI
+- Avisar a la interfaz con una señal cuando el modelo está listo
+"""
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+
+class ModelLoader(QThread):
+    """
+    Hilo que construye el Predictor en segundo plano
+
+    SEÑALES:
+    - model_loaded: Se emite con el Predictor ya creado (cargado o con error)
+    """
+
+    model_loaded = pyqtSignal(object)
+
+    def __init__(self, predictor_factory, parent=None):
+        """
+        PARÁMETROS:
+        - predictor_factory: Función sin argumentos que devuelve un Predictor
+        - parent: QObject padre (opcional)
+        """
+        super().__init__(parent)
+        self.predictor_factory = predictor_factory
+        # Último Predictor creado (para liberarlo al salir aunque la señal no llegue)
+        self.predictor = None
+
+    def run(self):
+        """Se ejecuta en el hilo de trabajo"""
+        predictor = self.predictor_factory()
+        self.predictor = predictor
+        # La señal cruza al hilo de la GUI mediante una conexión en cola
+        self.model_loaded.emit(predictor)
@@ -0,0 +1,136 @@
+"""
+MÓDULO: prediction_scheduler.py
+PROPÓSITO: Decide CUÁNDO pedir una predicción en vivo a partir de la actividad y la latencia
+
+REGLAS:
+- Mientras el lápiz se mueve se predice cada `interval` ms, donde el intervalo se adapta
+  a la latencia medida de la inferencia (media móvil exponencial):
+      interval = clamp(LATENCY_FACTOR * latencia, MIN_INTERVAL_MS, MAX_INTERVAL_MS)
+  Con un backend rápido las barras siguen al trazo a ~30 Hz; con uno lento se espacian
+- Al soltar el botón se fuerza una predicción inmediata del trazo completo
+- Sin cambios en el canvas el temporizador queda parado (ventana inactiva = 0 % CPU)
+- Nunca hay más de UNA petición en vuelo: si toca predecir mientras el backend aún no
+  ha devuelto la anterior, la petición se aplaza hasta que llegue el resultado. Así el
+  ritmo nunca supera lo que el backend puede drenar
+- Si un resultado no llega nunca (p. ej. falló la predicción), tras STALL_TIMEOUT_MS se
+  considera perdido y se vuelve a pedir
+"""
+
+import time
+
+from PyQt6.QtCore import QObject, QTimer
+
+
+# Límites del intervalo entre predicciones mientras se dibuja
+MIN_INTERVAL_MS = 33
+MAX_INTERVAL_MS = 250
+# El intervalo es este múltiplo de la latencia medida (deja CPU libre para la GUI)
+LATENCY_FACTOR = 2.0
+# Peso de cada muestra nueva en la media móvil de latencia
+LATENCY_SMOOTHING = 0.3
+# Latencia supuesta antes de la primera medida
+INITIAL_LATENCY_MS = 20.0
+# Tiempo máximo esperando un resultado antes de darlo por perdido
+STALL_TIMEOUT_MS = 2000
+
+
+class PredictionScheduler(QObject):
+    """
+    Planificador de predicciones en vivo
+
+    ATRIBUTOS:
+    - request: Función sin argumentos que captura y envía el canvas; devuelve el número
+      de secuencia enviado (None si el canvas no cambió)
+    - latency_ms: Media móvil de la latencia petición -> resultado
+    - requested / deferred / forced: Contadores (para informes)
+    """
+
+    def __init__(self, request, parent=None):
+        super().__init__(parent)
+        self.request = request
+        self.latency_ms = INITIAL_LATENCY_MS
+        self.requested = 0
+        self.deferred = 0
+        self.forced = 0
+
+        self._in_flight_seq = None  # Secuencia de la petición en vuelo
+        self._in_flight_since = 0.0
+        self._pending = False  # Hay cambios sin predecir esperando al backend
+        self._urgent = False  # La petición pendiente es forzada (fin de trazo)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._on_timeout)
+
+    @property
+    def interval_ms(self):
+        """RETORNA: Intervalo actual entre predicciones mientras se dibuja"""
+        interval = LATENCY_FACTOR * self.latency_ms
+        return int(min(max(interval, MIN_INTERVAL_MS), MAX_INTERVAL_MS))
+
+    @property
+    def in_flight(self):
+        return self._in_flight_seq is not None
+
+    def is_active(self):
+        """RETORNA: True si hay una predicción programada o esperando al backend"""
+        return self._timer.isActive() or self._pending
+
+    def activity(self):
+        """El canvas cambió: programar una predicción si no hay ninguna pendiente"""
+        self._pending = True
+        if not self._timer.isActive():
+            self._timer.start(self.interval_ms)
+
+    def flush(self):
+        """Fin de trazo (o modelo recién listo): predecir el estado actual cuanto antes"""
+        self.forced += 1
+        self._pending = True
+        self._urgent = True
+        self._timer.stop()
+        self._try_request()
+
+    def stop(self):
+        """Olvida lo pendiente y detiene el temporizador (p. ej. tras RESET)"""
+        self._timer.stop()
+        self._pending = False
+        self._urgent = False
+
+    def result_received(self, seq):
+        """
+        Llegó el resultado (mostrado o descartado) de la petición `seq`
+
+        Actualiza la latencia medida y, si hubo cambios mientras tanto, pide la siguiente
+        predicción respetando el intervalo
+        """
+        if self._in_flight_seq is None or seq < self._in_flight_seq:
+            return
+        latency = (time.perf_counter() - self._in_flight_since) * 1000
+        self.latency_ms += LATENCY_SMOOTHING * (latency - self.latency_ms)
+        self._in_flight_seq = None
+        if self._pending:
+            # El intervalo cuenta desde la petición anterior: no esperar de más
+            # (start() también sustituye la espera por bloqueo si estaba aplazada)
+            remaining = 0 if self._urgent else self.interval_ms - latency
+            self._timer.start(max(int(remaining), 0))
+
+    def _on_timeout(self):
+        self._try_request()
+
+    def _try_request(self):
+        if self.in_flight:
+            waited = (time.perf_counter() - self._in_flight_since) * 1000
+            if waited < STALL_TIMEOUT_MS:
+                # Aplazar: result_received() reprogramará la petición
+                self.deferred += 1
+                self._timer.start(int(STALL_TIMEOUT_MS - waited))
+                return
+            self._in_flight_seq = None
+        if not self._pending:
+            return
+        self._pending = False
+        self._urgent = False
+        seq = self.request()
+        if seq:
+            self.requested += 1
+            self._in_flight_seq = seq
+            self._in_flight_since = time.perf_counter()
@@ -0,0 +1,101 @@
+"""
+MÓDULO: idx_dataset.py
+PROPÓSITO: Lee los archivos IDX del dataset MNIST original (carpeta archive/) sin cargarlos
+
+FORMATO IDX:
+- 2 bytes a cero, 1 byte con el tipo de dato (0x08 = uint8), 1 byte con el número de
+  dimensiones, y luego cada dimensión como entero big-endian de 4 bytes
+- A continuación, los datos en orden C
+
+FUNCIÓN PRINCIPAL:
+- open_idx: Devuelve un np.memmap de solo lectura sobre los datos (no se lee nada a memoria;
+  los cortes [a:b] son vistas sin copia)
+- find_mnist_files: Localiza las imágenes y etiquetas de train/test en una carpeta
+"""
+
+import os
+import struct
+
+import numpy as np
+
+
+# Código de tipo IDX -> dtype de NumPy (los datos multibyte son big-endian)
+IDX_DTYPES = {
+    0x08: np.dtype(np.uint8),
+    0x09: np.dtype(np.int8),
+    0x0B: np.dtype(">i2"),
+    0x0C: np.dtype(">i4"),
+    0x0D: np.dtype(">f4"),
+    0x0E: np.dtype(">f8"),
+}
+
+# Prefijos de los archivos de cada partición del MNIST original
+SPLIT_PREFIXES = {"train": "train", "test": "t10k"}
+
+
+def read_idx_header(path):
+    """
+    RETORNA: (dtype, shape, offset_en_bytes_de_los_datos)
+
+    LANZA: ValueError si el archivo no es IDX (p. ej. si sigue comprimido en .gz)
+    """
+    with open(path, "rb") as f:
+        magic = f.read(4)
+        if len(magic) != 4 or magic[0] != 0 or magic[1] != 0:
+            raise ValueError(f"{path} no es un archivo IDX (¿sigue comprimido?)")
+        type_code, ndim = magic[2], magic[3]
+        if type_code not in IDX_DTYPES:
+            raise ValueError(f"{path}: tipo IDX desconocido 0x{type_code:02x}")
+        shape = struct.unpack(f">{ndim}I", f.read(4 * ndim))
+    return IDX_DTYPES[type_code], shape, 4 + 4 * ndim
+
+
+def open_idx(path):
+    """
+    Mapea un archivo IDX en memoria
+
+    RETORNA: np.memmap de solo lectura con la forma del archivo
+             (imágenes: (N, 28, 28), etiquetas: (N,))
+    """
+    dtype, shape, offset = read_idx_header(path)
+    expected = offset + int(np.prod(shape)) * dtype.itemsize
+    if os.path.getsize(path) < expected:
+        raise ValueError(f"{path} está truncado ({os.path.getsize(path)} < {expected} bytes)")
+    return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape)
+
+
+def write_idx(path, array):
+    """Escribe un array uint8 en formato IDX (útil para exportar subconjuntos)"""
+    array = np.ascontiguousarray(array, dtype=np.uint8)
+    with open(path, "wb") as f:
+        f.write(bytes([0, 0, 0x08, array.ndim]))
+        f.write(struct.pack(f">{array.ndim}I", *array.shape))
+        f.write(array.tobytes())
+
+
+def find_mnist_files(directory, split="test"):
+    """
+    Busca las imágenes y etiquetas de una partición dentro de `directory` (recursivo)
+
+    Acepta los nombres habituales: "t10k-images-idx3-ubyte", "t10k-images.idx3-ubyte", ...
+
+    RETORNA: (ruta_imágenes, ruta_etiquetas)
+    LANZA: FileNotFoundError si falta alguno
+    """
+    prefix = SPLIT_PREFIXES[split]
+    images = labels = None
+    for folder, _, files in os.walk(directory):
+        for name in sorted(files):
+            lower = name.lower()
+            if not lower.startswith(prefix) or lower.endswith(".gz"):
+                continue
+            normalized = lower.replace(".", "-").replace("_", "-")
+            path = os.path.join(folder, name)
+            if "images-idx3-ubyte" in normalized and images is None:
+                images = path
+            elif "labels-idx1-ubyte" in normalized and labels is None:
+                labels = path
+    if images is None or labels is None:
+        raise FileNotFoundError(
+            f"No se encontraron las imágenes/etiquetas '{prefix}' de MNIST en {directory}")
+    return images, labels
@@ -2,31 +2,210 @@
 MÓDULO: image_processing.py
 PROPÓSITO: Funciones de procesamiento de imagen (normalización, redimensionamiento, etc.)
 
-NOTA: Por ahora este módulo está vacío. Se completará después cuando necesites preprocesar las imágenes.
+PIPELINE ESTILO MNIST (preprocess_image):
+1. Invertir y normalizar: canvas (fondo blanco=255, trazo negro) -> tinta en [0, 1]
+2. Recortar la caja envolvente de la tinta
+3. Redimensionar conservando la proporción para que el lado mayor mida 20 píxeles
+4. Desplazar para que el centro de masa quede en el centro del marco 28x28
+
+IMPLEMENTACIÓN:
+- Todo está vectorizado con NumPy sobre lotes (N, 28, 28), sin bucles por píxel
+- Los pasos 2-4 son una transformación afín separable (escala + traslación por eje),
+  así que se aplican juntos con dos matrices de interpolación por imagen:
+      salida = Wy @ imagen @ Wx.T
+  Un único remuestreo evita el desenfoque de encadenar varios
+- Al reducir se ensancha el núcleo de interpolación (filtro de área) para no perder
+  trazos finos; al ampliar es interpolación bilineal
 """
 
 import numpy as np
 
 
-def preprocess_image(image_array):
+# Tamaño del marco de salida y del lado mayor del dígito (convención MNIST)
+FRAME_SIZE = 28
+DIGIT_SIZE = 20
+# Tinta mínima para considerar que un píxel pertenece al dígito
+INK_THRESHOLD = 0.05
+
+
+def _as_batch(images):
+    """
+    RETORNA: (lote (N, H, W) float32, era_una_sola_imagen)
+    """
+    images = np.asarray(images)
+    single = images.ndim == 2
+    if single:
+        images = images[None]
+    return images.astype(np.float32, copy=False), single
+
+
+def to_ink(images, invert=True):
+    """
+    Normaliza a tinta en [0, 1] (fondo 0, trazo 1)
+
+    PARÁMETROS:
+    - images: Array (H, W) o (N, H, W) con valores 0-255
+    - invert: True si la imagen viene del canvas (fondo blanco, trazo negro)
+    """
+    images, single = _as_batch(images)
+    ink = (255.0 - images) / 255.0 if invert else images / 255.0
+    return ink[0] if single else ink
+
+
+def bounding_boxes(ink, threshold=INK_THRESHOLD):
+    """
+    Calcula la caja envolvente de la tinta de cada imagen
+
+    PARÁMETRO:
+    - ink: Lote (N, H, W) de tinta en [0, 1]
+
+    RETORNA:
+    - boxes: Array (N, 4) int con (fila0, fila1, col0, col1), ambos extremos incluidos
+    - empty: Array (N,) bool, True si la imagen no tiene tinta
+    """
+    mask = ink > threshold
+    rows = mask.any(axis=2)
+    cols = mask.any(axis=1)
+    empty = ~rows.any(axis=1)
+    height, width = ink.shape[1:]
+    row0 = rows.argmax(axis=1)
+    row1 = height - 1 - rows[:, ::-1].argmax(axis=1)
+    col0 = cols.argmax(axis=1)
+    col1 = width - 1 - cols[:, ::-1].argmax(axis=1)
+    return np.stack([row0, row1, col0, col1], axis=1), empty
+
+
+def centers_of_mass(ink):
+    """
+    RETORNA: Array (N, 2) con el centro de masa (fila, columna) de cada imagen,
+             en coordenadas de índice de píxel
+
+    NOTA: Para imágenes sin tinta el resultado es (0, 0); quien llama las trata aparte
+    """
+    height, width = ink.shape[1:]
+    row_profile = ink.sum(axis=2)
+    col_profile = ink.sum(axis=1)
+    total = np.maximum(row_profile.sum(axis=1), 1e-12)
+    cy = row_profile @ np.arange(height, dtype=np.float32) / total
+    cx = col_profile @ np.arange(width, dtype=np.float32) / total
+    return np.stack([cy, cx], axis=1)
+
+
+def interpolation_matrices(scale, offset, in_size, out_size=FRAME_SIZE):
     """
-    NOTA: Esta función está vacía por ahora.
-    Se implementará cuando necesites preprocesar imágenes antes de predicción.
+    Construye las matrices de interpolación 1D de una transformación afín por imagen
+
+    La coordenada continua de salida Y se corresponde con la de entrada
+    src = (Y - offset) / scale (los píxeles i cubren [i, i+1)).
+
+    PARÁMETROS:
+    - scale: Array (N,) factor de escala (salida / entrada)
+    - offset: Array (N,) posición en la salida de la coordenada 0 de la entrada
+    - in_size / out_size: Longitud del eje de entrada y de salida
+
+    RETORNA: Array (N, out_size, in_size) float32
+    """
+    scale = np.asarray(scale, dtype=np.float32)[:, None, None]
+    offset = np.asarray(offset, dtype=np.float32)[:, None, None]
+    out_centers = np.arange(out_size, dtype=np.float32)[None, :, None] + 0.5
+    in_centers = np.arange(in_size, dtype=np.float32)[None, None, :] + 0.5
+    # Distancia (en píxeles de entrada) entre cada muestra y cada píxel de entrada
+    distance = np.abs((out_centers - offset) / scale - in_centers)
+    # Núcleo triangular; al reducir (scale < 1) se ensancha a 1/scale
+    shrink = np.minimum(scale, 1.0)
+    weights = np.maximum(0.0, 1.0 - distance * shrink) * shrink
+    return weights.astype(np.float32, copy=False)
+
+
+def resample(ink, scale_y, offset_y, scale_x, offset_x, out_size=FRAME_SIZE):
     """
-    pass
+    Aplica a cada imagen del lote una escala + traslación independientes por eje
+
+    RETORNA: Lote (N, out_size, out_size) float32
+    """
+    n, height, width = ink.shape
+    if height == width:
+        # Las matrices de ambos ejes se construyen en una sola llamada
+        weights = interpolation_matrices(np.concatenate([scale_y, scale_x]),
+                                         np.concatenate([offset_y, offset_x]), height, out_size)
+        wy, wx = weights[:n], weights[n:]
+    else:
+        wy = interpolation_matrices(scale_y, offset_y, height, out_size)
+        wx = interpolation_matrices(scale_x, offset_x, width, out_size)
+    return wy @ ink @ wx.transpose(0, 2, 1)
+
+
+def preprocess_image(image_array, invert=True):
+    """
+    Preprocesa una imagen o un lote al formato MNIST
+
+    PARÁMETROS:
+    - image_array: Array (28, 28) o (N, 28, 28) con valores 0-255
+    - invert: True si viene del canvas (fondo blanco, trazo negro)
+
+    RETORNA: Array float32 con la misma forma de lote, valores en [0, 1]
+             (fondo negro = 0, trazo = 1), dígito de 20 px centrado por centro de masa
+
+    NOTA: Las imágenes sin tinta se devuelven como un marco vacío (todo ceros)
+    """
+    ink, single = _as_batch(to_ink(image_array, invert))
+    boxes, empty = bounding_boxes(ink)
+    row0, row1, col0, col1 = boxes.T
+    box_h = (row1 - row0 + 1).astype(np.float32)
+    box_w = (col1 - col0 + 1).astype(np.float32)
+
+    # Escala común a ambos ejes: el lado mayor de la caja pasa a medir 20 px
+    scale = DIGIT_SIZE / np.maximum(box_h, box_w)
+
+    # Centro de masa de la tinta (coordenada continua = índice + 0.5)
+    # NOTA: Fuera de la caja sólo hay tinta por debajo del umbral, su peso es despreciable
+    com = centers_of_mass(ink) + 0.5
+
+    # Traslación para que el centro de masa caiga en el centro del marco (14, 14)
+    center = FRAME_SIZE / 2
+    offset_y = center - com[:, 0] * scale
+    offset_x = center - com[:, 1] * scale
+
+    out = resample(ink, scale, offset_y, scale, offset_x)
+    np.clip(out, 0.0, 1.0, out=out)
+    out[empty] = 0.0
+    return out[0] if single else out
 
 
 def center_digit(image):
     """
-    NOTA: Esta función está vacía por ahora.
-    Se implementará cuando necesites centrar el dígito en la imagen.
+    Desplaza el dígito (sin escalarlo) para que su centro de masa quede en el centro
+
+    PARÁMETRO:
+    - image: Tinta (28, 28) o (N, 28, 28) en [0, 1] (fondo 0)
+
+    RETORNA: Array float32 con la misma forma
     """
-    pass
+    ink, single = _as_batch(image)
+    height, width = ink.shape[1:]
+    com = centers_of_mass(ink) + 0.5
+    ones = np.ones(ink.shape[0], dtype=np.float32)
+    out = resample(ink, ones, height / 2 - com[:, 0], ones, width / 2 - com[:, 1], out_size=height)
+    return out[0] if single else out
 
 
 def get_statistics(image):
     """
     OPCIONAL: Obtiene estadísticas de la imagen para debug
-    NOTA: Esta función está vacía por ahora.
+
+    PARÁMETRO:
+    - image: Tinta (28, 28) en [0, 1] (fondo 0), p. ej. la salida de preprocess_image
+
+    RETORNA: Dict con min, max, media, píxeles con tinta, caja envolvente y centro de masa
     """
-    pass
+    ink, _ = _as_batch(image)
+    boxes, empty = bounding_boxes(ink)
+    com = centers_of_mass(ink)[0] if not empty[0] else ((ink.shape[1] - 1) / 2, (ink.shape[2] - 1) / 2)
+    return {
+        "min": float(ink.min()),
+        "max": float(ink.max()),
+        "mean": float(ink.mean()),
+        "ink_pixels": int((ink > INK_THRESHOLD).sum()),
+        "bounding_box": None if empty[0] else tuple(int(v) for v in boxes[0]),
+        "center_of_mass": (float(com[0]), float(com[1])),
+    }
@@ -0,0 +1,297 @@
+"""
+MÓDULO: metrics.py
+PROPÓSITO: Instrumentación del camino caliente (tiempos y contadores) y su exportación
+
+FUNCIÓN PRINCIPAL:
+- Histogramas móviles de latencia por etapa (últimas N muestras): p50 / p95 / p99
+- Contadores (predicciones, capturas descartadas, aciertos de caché, ...)
+- Predicciones por segundo en una ventana deslizante
+- Exportación en formato de texto de Prometheus:
+  * PrometheusFileExporter: escribe el archivo periódicamente (colector "textfile")
+  * StatsServer: endpoint HTTP local con /metrics (Prometheus) y /stats (JSON)
+
+COSTE:
+- observe() e inc() sólo guardan un número bajo un lock (del orden de 1 µs)
+- Los percentiles se calculan al exportar, nunca en el camino caliente
+
+USO:
+    from src.utils.metrics import METRICS
+    start = time.perf_counter()
+    ...
+    METRICS.observe("inference", time.perf_counter() - start)
+    METRICS.inc("predictions")
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+
+# Muestras que guarda cada histograma móvil
+DEFAULT_WINDOW = 1024
+# Segundos de la ventana usada para las tasas (eventos por segundo)
+RATE_WINDOW_S = 10.0
+PERCENTILES = (50, 95, 99)
+METRIC_PREFIX = "digit"
+
+
+class RollingHistogram:
+    """
+    Guarda las últimas `window` duraciones en un buffer circular
+
+    ATRIBUTOS:
+    - count / total: Número y suma de TODAS las observaciones (no sólo la ventana)
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        self._values = np.zeros(window, dtype=np.float64)
+        self._next = 0
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds):
+        self._values[self._next] = seconds
+        self._next = (self._next + 1) % len(self._values)
+        self.count += 1
+        self.total += seconds
+
+    def percentiles(self, percentiles=PERCENTILES):
+        """RETORNA: Dict percentil -> segundos (vacío si no hay muestras)"""
+        filled = self._values[:min(self.count, len(self._values))]
+        if len(filled) == 0:
+            return {}
+        return dict(zip(percentiles, np.percentile(filled, percentiles).tolist()))
+
+
+class RateMeter:
+    """Eventos por segundo en los últimos `window_s` segundos"""
+
+    def __init__(self, window_s=RATE_WINDOW_S):
+        self.window_s = window_s
+        self._times = deque()
+
+    def mark(self, now):
+        self._times.append(now)
+        self._trim(now)
+
+    def _trim(self, now):
+        while self._times and now - self._times[0] > self.window_s:
+            self._times.popleft()
+
+    def rate(self, now):
+        self._trim(now)
+        return len(self._times) / self.window_s
+
+
+class Metrics:
+    """
+    Registro de métricas compartido por la aplicación
+
+    ATRIBUTOS:
+    - enabled: Si es False, observe()/inc() no hacen nada
+    - started: Momento de creación (para el uptime)
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW, enabled=True):
+        self.window = window
+        self.enabled = enabled
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._counters = {}
+        self._rates = {}
+
+    def observe(self, stage, seconds):
+        """Registra la duración (segundos) de una etapa"""
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = RollingHistogram(self.window)
+            histogram.observe(seconds)
+
+    def inc(self, name, amount=1):
+        """Incrementa un contador; los contadores con tasa también cuentan por segundo"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+            rate = self._rates.get(name)
+            if rate is not None:
+                rate.mark(time.perf_counter())
+
+    def track_rate(self, name, window_s=RATE_WINDOW_S):
+        """Activa la tasa (eventos/s) del contador `name`"""
+        with self._lock:
+            self._rates.setdefault(name, RateMeter(window_s))
+
+    def reset(self):
+        """Borra todas las observaciones (mantiene las tasas activadas)"""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            for name, rate in self._rates.items():
+                self._rates[name] = RateMeter(rate.window_s)
+
+    def snapshot(self):
+        """
+        RETORNA: Dict serializable con:
+        - stages: etapa -> {"count", "sum_s", "p50_ms", "p95_ms", "p99_ms"}
+        - counters: nombre -> valor
+        - rates: nombre -> eventos por segundo
+        - uptime_s
+        """
+        now = time.perf_counter()
+        with self._lock:
+            stages = {}
+            for stage, histogram in self._histograms.items():
+                entry = {"count": histogram.count, "sum_s": histogram.total}
+                for p, seconds in histogram.percentiles().items():
+                    entry[f"p{p}_ms"] = seconds * 1000
+                stages[stage] = entry
+            counters = dict(self._counters)
+            rates = {name: rate.rate(now) for name, rate in self._rates.items()}
+        return {"stages": stages, "counters": counters, "rates": rates,
+                "uptime_s": time.time() - self.started}
+
+    def to_prometheus(self):
+        """RETORNA: Las métricas en formato de texto de Prometheus"""
+        snapshot = self.snapshot()
+        name = f"{METRIC_PREFIX}_stage_latency_seconds"
+        lines = [f"# HELP {name} Latencia por etapa (ventana de las últimas {self.window} muestras)",
+                 f"# TYPE {name} summary"]
+        for stage, entry in sorted(snapshot["stages"].items()):
+            for p in PERCENTILES:
+                if f"p{p}_ms" in entry:
+                    lines.append(f'{name}{{stage="{stage}",quantile="{p / 100:g}"}} '
+                                 f'{entry[f"p{p}_ms"] / 1000:.9f}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {entry["sum_s"]:.9f}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {entry["count"]}')
+        for counter, value in sorted(snapshot["counters"].items()):
+            metric = f"{METRIC_PREFIX}_{counter}_total"
+            lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+        for counter, value in sorted(snapshot["rates"].items()):
+            metric = f"{METRIC_PREFIX}_{counter}_per_second"
+            lines += [f"# TYPE {metric} gauge", f"{metric} {value:.6f}"]
+        metric = f"{METRIC_PREFIX}_uptime_seconds"
+        lines += [f"# TYPE {metric} gauge", f"{metric} {snapshot['uptime_s']:.3f}"]
+        return "\n".join(lines) + "\n"
+
+    def summary(self):
+        """RETORNA: Texto breve con las latencias por etapa (para imprimir al salir)"""
+        snapshot = self.snapshot()
+        lines = ["[METRICS] Latencias por etapa (p50 / p95 / p99 ms, n):"]
+        for stage, entry in sorted(snapshot["stages"].items()):
+            if "p50_ms" in entry:
+                lines.append(f"[METRICS]   {stage:<16} {entry['p50_ms']:8.3f} {entry['p95_ms']:8.3f} "
+                             f"{entry['p99_ms']:8.3f}  {entry['count']}")
+        if snapshot["counters"]:
+            counters = ", ".join(f"{k}={v}" for k, v in sorted(snapshot["counters"].items()))
+            lines.append(f"[METRICS] Contadores: {counters}")
+        return "\n".join(lines)
+
+
+# Registro global de la aplicación
+METRICS = Metrics()
+METRICS.track_rate("predictions")
+
+
+class PrometheusFileExporter:
+    """
+    Escribe periódicamente las métricas en un archivo de texto de Prometheus
+
+    NOTA: Se escribe en un archivo temporal y se renombra, así el colector nunca lee
+          un archivo a medio escribir
+    """
+
+    def __init__(self, path, metrics=METRICS, interval_s=10.0):
+        self.path = path
+        self.metrics = metrics
+        self.interval_s = interval_s
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="MetricsExporter", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        print(f"[METRICS] Exportando a {self.path} cada {self.interval_s:g} s")
+
+    def stop(self):
+        """Detiene el hilo y escribe una última vez"""
+        self._stop.set()
+        self._thread.join()
+
+    def write(self):
+        temp = f"{self.path}.tmp"
+        with open(temp, "w", encoding="utf-8") as f:
+            f.write(self.metrics.to_prometheus())
+        os.replace(temp, self.path)
+
+    def _run(self):
+        while True:
+            stopping = self._stop.wait(self.interval_s)
+            try:
+                self.write()
+            except OSError as e:
+                print(f"[METRICS] ✗ No se pudo escribir {self.path}: {e}")
+            if stopping:
+                return
+
+
+class StatsServer:
+    """
+    Endpoint HTTP local (sólo 127.0.0.1 por defecto) en un hilo de fondo
+
+    RUTAS:
+    - GET /metrics: Texto de Prometheus
+    - GET /stats: JSON de Metrics.snapshot()
+    """
+
+    def __init__(self, port, metrics=METRICS, host="127.0.0.1"):
+        handler = self._make_handler(metrics)
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+        self._thread = threading.Thread(target=self.server.serve_forever, name="StatsServer",
+                                        daemon=True)
+
+    @property
+    def address(self):
+        return self.server.server_address[:2]
+
+    @staticmethod
+    def _make_handler(metrics):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/metrics":
+                    body = metrics.to_prometheus().encode()
+                    content_type = "text/plain; version=0.0.4"
+                elif self.path == "/stats":
+                    body = json.dumps(metrics.snapshot()).encode()
+                    content_type = "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # Sin una línea en consola por cada consulta
+                pass
+        return Handler
+
+    def start(self):
+        self._thread.start()
+        host, port = self.address
+        print(f"[METRICS] Estadísticas en http://{host}:{port}/metrics y /stats")
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,222 @@
+"""
+MÓDULO: segmentation.py
+PROPÓSITO: Separa un número escrito en el canvas ancho en sus dígitos y los normaliza
+           al formato MNIST (28x28), listos para clasificarlos en un único lote
+
+PIPELINE (segment_digits):
+1. Reducir el canvas a resolución completa por media en bloques de factor x factor y
+   marcar la tinta (el trazo sigue midiendo varias celdas de grosor)
+2. Etiquetar componentes conexas (8-vecindad) con union-find VECTORIZADO sobre tramos
+   horizontales de tinta:
+   - Cada fila se describe por sus tramos [inicio, fin) (np.diff sobre la máscara)
+   - Los tramos de filas consecutivas que se tocan se emparejan con searchsorted
+   - Las etiquetas se unen en rondas de "enganche" (np.minimum.at hacia la raíz menor)
+     + salto de punteros (parent = parent[parent]), todo con NumPy sobre arrays
+3. Fusionar componentes que comparten columnas (proyección vertical): un dígito de
+   varios trazos (el 5 con la barra suelta, el 4 abierto) queda como un solo dígito
+4. Descartar motas (grupos con muy poca tinta frente al mayor)
+5. Recortar cada grupo (sólo su tinta, sin la de los vecinos) con un único gather y
+   normalizar todos los recortes juntos con preprocess_image (recorte, 20 px, centro
+   de masa)
+
+NOTA: Dígitos que se tocan entre sí forman una sola componente y no se separan
+"""
+
+import numpy as np
+
+from .image_processing import FRAME_SIZE, INK_THRESHOLD, preprocess_image
+
+
+# Reducción del canvas antes de etiquetar (280x1120 -> 70x280 con factor 4)
+SEGMENTATION_FACTOR = 4
+# Solapamiento de columnas (fracción del grupo más estrecho) a partir del cual dos
+# componentes se consideran el mismo dígito
+MERGE_OVERLAP = 0.5
+# Tinta mínima de un grupo, como fracción de la del grupo con más tinta
+MIN_INK_FRACTION = 0.05
+
+
+def block_reduce(canvas, factor=SEGMENTATION_FACTOR, invert=True):
+    """
+    RETORNA: Tinta float32 (H // factor, W // factor) en [0, 1], media de cada bloque
+
+    PARÁMETRO:
+    - canvas: Array (H, W) con valores 0-255 (fondo blanco si invert)
+
+    NOTA: Suma entera primero por filas (memoria contigua) y después por columnas con
+          cortes de paso `factor`; es varias veces más rápido que reducir sobre los
+          dos ejes de un reshape (h, factor, w, factor)
+    """
+    canvas = np.asarray(canvas)
+    h, w = canvas.shape[0] // factor, canvas.shape[1] // factor
+    rows = canvas[:h * factor, :w * factor].reshape(h, factor, w * factor).sum(axis=1, dtype=np.uint16)
+    sums = sum(rows[:, k::factor] for k in range(factor))
+    mean = sums.astype(np.float32) / (255.0 * factor * factor)
+    return 1.0 - mean if invert else mean
+
+
+def row_runs(mask):
+    """
+    Describe la máscara por sus tramos horizontales
+
+    RETORNA: (fila, inicio, fin) arrays int (R,), fin exclusivo, ordenados por fila y columna
+    """
+    padded = np.zeros((mask.shape[0], mask.shape[1] + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask
+    edges = np.diff(padded, axis=1)
+    rows, starts = np.nonzero(edges == 1)
+    _, ends = np.nonzero(edges == -1)
+    return rows, starts, ends
+
+
+def run_adjacency(rows, starts, ends, width):
+    """
+    Empareja los tramos de filas consecutivas que se tocan (8-vecindad)
+
+    RETORNA: (a, b) arrays int con los índices de cada par de tramos conectados
+
+    NOTA: Los tramos de la fila anterior que tocan a [sb, eb) son los que cumplen
+          fin >= sb e inicio <= eb; como están ordenados, forman un rango contiguo
+          que se localiza con dos searchsorted sobre claves fila * (width + 2) + columna
+    """
+    stride = width + 2
+    start_keys = rows * stride + starts
+    end_keys = rows * stride + ends
+    previous = (rows - 1) * stride
+    low = np.searchsorted(end_keys, previous + starts, side="left")
+    high = np.searchsorted(start_keys, previous + ends, side="right")
+    counts = np.maximum(high - low, 0)
+    b = np.repeat(np.arange(len(rows)), counts)
+    first = np.cumsum(counts) - counts
+    a = np.repeat(low, counts) + np.arange(counts.sum()) - np.repeat(first, counts)
+    return a, b
+
+
+def connected_labels(count, a, b):
+    """
+    Union-find vectorizado: une los nodos de cada par (a[i], b[i])
+
+    RETORNA: Array int (count,) con la raíz (el índice menor) de la componente de cada nodo
+    """
+    parent = np.arange(count)
+    while True:
+        root_a, root_b = parent[a], parent[b]
+        pending = root_a != root_b
+        if not pending.any():
+            return parent
+        # Enganchar cada raíz mayor a la menor con la que está conectada
+        np.minimum.at(parent, np.maximum(root_a[pending], root_b[pending]),
+                      np.minimum(root_a[pending], root_b[pending]))
+        # Salto de punteros hasta que todos apunten a su raíz
+        while True:
+            jumped = parent[parent]
+            if np.array_equal(jumped, parent):
+                break
+            parent = jumped
+
+
+def enclosing_boxes(index, count, row0, row1, col0, col1):
+    """
+    RETORNA: Array int (count, 4) con la caja (fila0, fila1, col0, col1) que envuelve a
+             todos los elementos con el mismo índice
+    """
+    boxes = np.empty((count, 4), dtype=np.intp)
+    boxes[:, 0::2] = np.iinfo(np.intp).max
+    boxes[:, 1::2] = -1
+    np.minimum.at(boxes[:, 0], index, row0)
+    np.maximum.at(boxes[:, 1], index, row1)
+    np.minimum.at(boxes[:, 2], index, col0)
+    np.maximum.at(boxes[:, 3], index, col1)
+    return boxes
+
+
+def merge_columns(boxes, overlap=MERGE_OVERLAP):
+    """
+    Agrupa componentes cuyas columnas se solapan
+
+    PARÁMETRO:
+    - boxes: Array (C, 4) int (fila0, fila1, col0, col1) ordenado por col0
+
+    RETORNA: Array int (C,) con el grupo (0, 1, ...) de cada componente, de izquierda a derecha
+    """
+    groups = np.empty(len(boxes), dtype=np.intp)
+    group = -1
+    right = None
+    for index, (_, _, col0, col1) in enumerate(boxes):
+        if right is not None:
+            shared = min(col1, right[1]) - max(col0, right[0]) + 1
+            narrower = min(col1 - col0, right[1] - right[0]) + 1
+            if shared >= overlap * narrower:
+                groups[index] = group
+                right = (min(col0, right[0]), max(col1, right[1]))
+                continue
+        group += 1
+        groups[index] = group
+        right = (col0, col1)
+    return groups
+
+
+def segment_digits(canvas, invert=True, factor=SEGMENTATION_FACTOR):
+    """
+    Separa y normaliza los dígitos de un canvas a resolución completa
+
+    PARÁMETROS:
+    - canvas: Array (H, W) uint8 (p. ej. DrawingCanvas.get_full_array())
+    - invert: True si viene del canvas (fondo blanco, trazo negro)
+    - factor: Reducción antes de etiquetar
+
+    RETORNA:
+    - digits: Array float32 (N, 28, 28) estilo MNIST (fondo 0, trazo 1), de izquierda
+      a derecha
+    - boxes: Array int (N, 4) con (fila0, fila1, col0, col1) de cada dígito en el canvas
+      (ambos extremos incluidos)
+    """
+    ink = block_reduce(canvas, factor, invert)
+    height, width = ink.shape
+    rows, starts, ends = row_runs(ink > INK_THRESHOLD)
+    if rows.size == 0:
+        return (np.zeros((0, FRAME_SIZE, FRAME_SIZE), dtype=np.float32),
+                np.zeros((0, 4), dtype=np.intp))
+
+    # Componentes conexas sobre los tramos, numeradas 0..C-1
+    roots = connected_labels(len(rows), *run_adjacency(rows, starts, ends, width))
+    _, component = np.unique(roots, return_inverse=True)
+    count = component.max() + 1
+    boxes = enclosing_boxes(component, count, rows, rows, starts, ends - 1)
+    lengths = ends - starts
+    amount = np.bincount(component, weights=lengths, minlength=count)
+
+    # Componentes -> dígitos (solapamiento de columnas), descartando motas
+    order = np.argsort(boxes[:, 2], kind="stable")
+    group_of = np.empty(count, dtype=np.intp)
+    group_of[order] = merge_columns(boxes[order])
+    groups = group_of.max() + 1
+    group_ink = np.bincount(group_of, weights=amount, minlength=groups)
+    keep = np.flatnonzero(group_ink >= MIN_INK_FRACTION * group_ink.max())
+    group_boxes = enclosing_boxes(group_of, groups, *boxes.T)[keep]
+
+    # Imagen de grupos: cada celda de tinta con el grupo de su tramo (-1 = fondo)
+    labels = np.full(height * width, -1, dtype=np.intp)
+    first = np.cumsum(lengths) - lengths
+    cells = (np.repeat(rows * width + starts, lengths)
+             + np.arange(lengths.sum()) - np.repeat(first, lengths))
+    labels[cells] = np.repeat(group_of[component], lengths)
+    labels = labels.reshape(height, width)
+
+    # Recortes de todos los grupos con un único gather (relleno para no salirse)
+    crop_h = int((group_boxes[:, 1] - group_boxes[:, 0]).max()) + 1
+    crop_w = int((group_boxes[:, 3] - group_boxes[:, 2]).max()) + 1
+    padded_ink = np.zeros((height + crop_h, width + crop_w), dtype=np.float32)
+    padded_ink[:height, :width] = ink
+    padded_labels = np.full(padded_ink.shape, -1, dtype=np.intp)
+    padded_labels[:height, :width] = labels
+    yy = group_boxes[:, 0, None, None] + np.arange(crop_h)[None, :, None]
+    xx = group_boxes[:, 2, None, None] + np.arange(crop_w)[None, None, :]
+    own = padded_labels[yy, xx] == keep[:, None, None]
+    crops = np.where(own, padded_ink[yy, xx], 0.0)
+
+    digits = preprocess_image(crops * 255.0, invert=False)
+    full_boxes = group_boxes * factor
+    full_boxes[:, 1] += factor - 1
+    full_boxes[:, 3] += factor - 1
+    return digits, full_boxes
@@ -0,0 +1,39 @@
+"""
+MÓDULO: startup_report.py
+PROPÓSITO: Mide los hitos del arranque para detectar regresiones
+
+HITOS:
+- window_shown: La ventana principal es visible
+- model_ready: El modelo terminó de cargarse en segundo plano
+- first_prediction: Se mostraron las primeras probabilidades en pantalla
+"""
+
+import time
+
+
+class StartupReport:
+    """
+    Registra el tiempo (desde el inicio del proceso) de cada hito del arranque
+
+    ATRIBUTOS:
+    - start: Marca de tiempo de referencia (perf_counter)
+    - marks: Dict hito -> segundos desde start
+    """
+
+    def __init__(self, start=None):
+        self.start = time.perf_counter() if start is None else start
+        self.marks = {}
+
+    def mark(self, name):
+        """Registra el hito `name` la primera vez que ocurre y devuelve los segundos transcurridos"""
+        if name not in self.marks:
+            self.marks[name] = time.perf_counter() - self.start
+            print(f"[STARTUP] {name}: {self.marks[name] * 1000:.0f} ms")
+        return self.marks[name]
+
+    def summary(self):
+        """RETORNA: Texto con todos los hitos registrados, en orden"""
+        lines = ["[STARTUP] Resumen de arranque:"]
+        for name, seconds in sorted(self.marks.items(), key=lambda item: item[1]):
+            lines.append(f"[STARTUP]   {name:<18} {seconds * 1000:8.0f} ms")
+        return "\n".join(lines)
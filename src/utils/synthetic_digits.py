@@ -0,0 +1,189 @@
+"""
+MÓDULO: synthetic_digits.py
+PROPÓSITO: Genera trazos de dígitos sintéticos y deterministas
+
+USO:
+- Reproducir "trazos grabados" en el canvas para benchmarks (sin usuario real)
+- Obtener imágenes 28x28 tipo canvas cuando no está disponible el dataset MNIST
+
+NOTAS:
+- Cada dígito se describe con una o más polilíneas en coordenadas normalizadas (0-1)
+- Se aplica una deformación aleatoria (escala, desplazamiento, inclinación, ruido)
+- Los puntos se remuestrean a la distancia típica entre eventos de ratón
+"""
+
+import numpy as np
+
+
+# Plantillas de trazos por dígito: lista de polilíneas [(x, y), ...] en 0-1
+DIGIT_TEMPLATES = {
+    0: [[(0.5, 0.1), (0.25, 0.2), (0.2, 0.5), (0.25, 0.8), (0.5, 0.9),
+         (0.75, 0.8), (0.8, 0.5), (0.75, 0.2), (0.5, 0.1)]],
+    1: [[(0.35, 0.25), (0.55, 0.1), (0.55, 0.9)]],
+    2: [[(0.25, 0.25), (0.45, 0.1), (0.7, 0.15), (0.75, 0.35), (0.25, 0.9), (0.8, 0.9)]],
+    3: [[(0.25, 0.15), (0.7, 0.15), (0.45, 0.45), (0.75, 0.6), (0.7, 0.85), (0.25, 0.88)]],
+    4: [[(0.6, 0.9), (0.6, 0.1), (0.2, 0.65), (0.8, 0.65)]],
+    5: [[(0.75, 0.1), (0.3, 0.1), (0.28, 0.45), (0.65, 0.45), (0.75, 0.7),
+         (0.6, 0.9), (0.25, 0.85)]],
+    6: [[(0.7, 0.1), (0.35, 0.35), (0.25, 0.7), (0.45, 0.9), (0.7, 0.8),
+         (0.7, 0.55), (0.4, 0.5), (0.28, 0.65)]],
+    7: [[(0.2, 0.12), (0.8, 0.12), (0.45, 0.9)]],
+    8: [[(0.5, 0.5), (0.28, 0.3), (0.5, 0.1), (0.72, 0.3), (0.5, 0.5),
+         (0.25, 0.7), (0.5, 0.9), (0.75, 0.7), (0.5, 0.5)]],
+    9: [[(0.72, 0.35), (0.5, 0.1), (0.28, 0.3), (0.5, 0.5), (0.72, 0.35), (0.65, 0.9)]],
+}
+
+# Distancia (píxeles del canvas) entre eventos de movimiento del ratón
+MOUSE_STEP = 6.0
+# Canvas de la aplicación: lado en píxeles, grosor del lápiz y factor de reducción
+CANVAS_PIXELS = 560
+PEN_WIDTH = 30
+# Submuestreo por píxel de salida al rasterizar con NumPy
+SUPERSAMPLING = 4
+# Celda por dígito de los números sintéticos (alto del canvas de varios dígitos)
+NUMBER_CELL = 280
+
+
+def resample_polyline(points, step):
+    """
+    Remuestrea una polilínea con puntos equiespaciados cada `step` unidades
+
+    RETORNA: Array (K, 2) float
+    """
+    points = np.asarray(points, dtype=np.float64)
+    segment_lengths = np.hypot(*np.diff(points, axis=0).T)
+    cumulative = np.concatenate([[0.0], np.cumsum(segment_lengths)])
+    samples = np.arange(0.0, cumulative[-1], step)
+    samples = np.append(samples, cumulative[-1])
+    x = np.interp(samples, cumulative, points[:, 0])
+    y = np.interp(samples, cumulative, points[:, 1])
+    return np.stack([x, y], axis=1)
+
+
+def digit_strokes(digit, rng, size=560, step=MOUSE_STEP, offset=(0.0, 0.0)):
+    """
+    Genera los trazos de un dígito con deformación aleatoria
+
+    PARÁMETROS:
+    - digit: Dígito 0-9
+    - rng: np.random.Generator
+    - size: Lado (píxeles) de la celda donde se dibuja el dígito
+    - step: Distancia entre puntos consecutivos
+    - offset: Desplazamiento (x, y) en píxeles de la celda
+
+    RETORNA: Lista de arrays (K, 2) con coordenadas de ratón
+    """
+    scale = rng.uniform(0.6, 0.95)
+    shear = rng.uniform(-0.2, 0.2)
+    shift = rng.uniform(-0.08, 0.08, size=2)
+    strokes = []
+    for polyline in DIGIT_TEMPLATES[digit]:
+        points = np.asarray(polyline, dtype=np.float64) - 0.5
+        points[:, 0] += shear * points[:, 1]
+        points = points * scale + 0.5 + shift
+        points += rng.normal(0.0, 0.012, size=points.shape)
+        points = np.clip(points, 0.02, 0.98) * size + np.asarray(offset)
+        strokes.append(resample_polyline(points, step))
+    return strokes
+
+
+def random_strokes(count, seed=0, size=560):
+    """
+    RETORNA: Lista de (digit, strokes) deterministas para un número dado de dígitos
+    """
+    rng = np.random.default_rng(seed)
+    digits = rng.integers(0, 10, size=count)
+    return [(int(d), digit_strokes(int(d), rng, size=size)) for d in digits]
+
+
+def rasterize(strokes, size=28, canvas_pixels=CANVAS_PIXELS, pen_width=PEN_WIDTH,
+              supersampling=SUPERSAMPLING, columns=None):
+    """
+    Rasteriza trazos con NumPy (sin Qt) imitando get_image_array() del canvas
+
+    PARÁMETROS:
+    - strokes: Lista de arrays (K, 2) en coordenadas del canvas
+    - size: Lado de la imagen de salida (28); filas si se indica columns
+    - canvas_pixels: Alto del canvas en píxeles (560)
+    - columns: Ancho de la salida para canvas rectangulares (por defecto size)
+
+    RETORNA: Array uint8 (size, columns) con fondo blanco (255) y trazo negro (0)
+    """
+    columns = columns or size
+    grid = size * supersampling
+    grid_x = columns * supersampling
+    pitch = canvas_pixels / grid  # píxeles del canvas por subpíxel
+    radius = pen_width / 2
+    ink = np.zeros((grid, grid_x), dtype=bool)
+
+    for points in strokes:
+        points = np.asarray(points, dtype=np.float64)
+        if len(points) == 1:
+            points = np.vstack([points, points])
+        for a, b in zip(points[:-1], points[1:]):
+            # Sólo se evalúan los subpíxeles de la caja envolvente del segmento
+            low = np.floor((np.minimum(a, b) - radius) / pitch).astype(int)
+            high = np.ceil((np.maximum(a, b) + radius) / pitch).astype(int)
+            x0, y0 = np.maximum(low, 0)
+            x1, y1 = np.minimum(high, (grid_x, grid))
+            if x0 >= x1 or y0 >= y1:
+                continue
+            px = ((np.arange(x0, x1) + 0.5) * pitch)[None, :]
+            py = ((np.arange(y0, y1) + 0.5) * pitch)[:, None]
+            ab = b - a
+            length2 = max(float(ab @ ab), 1e-9)
+            t = np.clip(((px - a[0]) * ab[0] + (py - a[1]) * ab[1]) / length2, 0.0, 1.0)
+            distance2 = (px - a[0] - t * ab[0]) ** 2 + (py - a[1] - t * ab[1]) ** 2
+            ink[y0:y1, x0:x1] |= distance2 <= radius ** 2
+
+    coverage = ink.reshape(size, supersampling, columns, supersampling).mean(axis=(1, 3))
+    return (255 * (1.0 - coverage)).astype(np.uint8)
+
+
+def render_digits(count, seed=0, size=28):
+    """
+    Genera un lote etiquetado de dígitos sintéticos tipo canvas
+
+    RETORNA:
+    - images: Array uint8 (count, size, size), fondo blanco y trazo negro
+    - labels: Array int (count,)
+    """
+    samples = random_strokes(count, seed=seed)
+    images = np.stack([rasterize(strokes, size=size) for _, strokes in samples])
+    labels = np.array([digit for digit, _ in samples])
+    return images, labels
+
+
+def number_strokes(count, seed=0, cell=NUMBER_CELL):
+    """
+    Genera los trazos de un número de `count` dígitos escritos de izquierda a derecha
+
+    PARÁMETROS:
+    - cell: Lado (píxeles) de la celda de cada dígito; el canvas mide cell x (count * cell)
+
+    RETORNA: (dígitos (count,), lista de arrays (K, 2) con los trazos de todo el número)
+    """
+    rng = np.random.default_rng(seed)
+    digits = rng.integers(0, 10, size=count)
+    strokes = []
+    for index, digit in enumerate(digits):
+        strokes.extend(digit_strokes(int(digit), rng, size=cell, offset=(index * cell, 0.0)))
+    return digits, strokes
+
+
+def render_number(count, seed=0, cell=NUMBER_CELL, columns=None):
+    """
+    Rasteriza un número sintético a resolución completa (como get_full_array())
+
+    PARÁMETROS:
+    - columns: Ancho del canvas en píxeles (por defecto count * cell); el número
+      ocupa siempre las primeras count celdas
+
+    RETORNA:
+    - canvas: Array uint8 (cell, columns), fondo blanco y trazo negro
+    - digits: Array int (count,) con los dígitos escritos
+    """
+    digits, strokes = number_strokes(count, seed=seed, cell=cell)
+    canvas = rasterize(strokes, size=cell, canvas_pixels=cell, pen_width=cell * PEN_WIDTH / CANVAS_PIXELS,
+                       supersampling=1, columns=columns or count * cell)
+    return canvas, digits